@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+'''Micro-benchmark to measure schema get()/set() throughput.
+
+$ ./examples/benchmark/schema_access.py [-n N]
+Reads and writes every parameter of a chip with a loaded target N times and
+reports the number of operations per second.
+'''
+
+import argparse
+import time
+
+import siliconcompiler
+
+
+def get_keypaths(chip):
+    keypaths = []
+    for keypath in chip.allkeys():
+        if keypath[0] in ('history', 'library') or 'default' in keypath:
+            continue
+        if chip.get(*keypath, field='pernode') == 'required':
+            continue
+        keypaths.append(tuple(keypath))
+    return keypaths
+
+
+def measure(name, func, keypaths, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for keypath in keypaths:
+            func(keypath)
+    elapsed = time.perf_counter() - start
+
+    ops = len(keypaths) * repeat
+    print(f'{name:<22} {ops:>8} ops {elapsed:>8.3f} s {ops / elapsed:>12.0f} ops/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=20, help='number of passes over the schema')
+    args = parser.parse_args()
+
+    chip = siliconcompiler.Chip('benchmark')
+    chip.load_target('freepdk45_demo')
+    keypaths = get_keypaths(chip)
+
+    values = {keypath: chip.get(*keypath) for keypath in keypaths}
+    locked = {keypath for keypath in keypaths if chip.get(*keypath, field='lock')}
+    writable = [keypath for keypath in keypaths if keypath not in locked]
+
+    schema = chip.schema
+    measure('Schema.get', lambda keypath: schema.get(*keypath), keypaths, args.n)
+    measure('Schema.set', lambda keypath: schema.set(*keypath, values[keypath]),
+            writable, args.n)
+    measure('Chip.get', lambda keypath: chip.get(*keypath), keypaths, args.n)
+    measure('Chip.set', lambda keypath: chip.set(*keypath, values[keypath]),
+            writable, args.n)
+
+    # Parameters under 'default' templates that have not been instantiated yet
+    step_keypaths = [('tool', 'yosys', 'task', f'task{n}', 'threads') for n in range(100)]
+    measure('Schema.get (default)', lambda keypath: schema.get(*keypath, step='syn', index='0'),
+            step_keypaths, args.n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Copyright 2024 Silicon Compiler Authors. All Rights Reserved.
+import os
+import sys
+
+import siliconcompiler
+from siliconcompiler.schema import Schema
+
+
+def main():
+    progname = "sc-manifest"
+    description = """
+-----------------------------------------------------------
+SC app to convert a manifest to a different file format.
+
+The file formats are determined by the filename suffixes,
+see write_manifest() for the supported formats.
+
+To convert a json manifest to msgpack:
+    sc-manifest -input <design>.pkg.json -output <design>.pkg.msgpack
+
+To convert a msgpack manifest back to json:
+    sc-manifest -input <design>.pkg.msgpack -output <design>.pkg.json
+-----------------------------------------------------------
+"""
+
+    chip = siliconcompiler.Chip(progname)
+
+    manifest_arguments = {
+        "-input": {'type': str,
+                   'required': True,
+                   'help': 'path to the manifest to read',
+                   'metavar': '<file>'},
+        "-output": {'type': str,
+                    'required': True,
+                    'help': 'path to the manifest to write',
+                    'metavar': '<file>'}
+    }
+
+    try:
+        switches = chip.create_cmdline(
+            progname,
+            switchlist=['-loglevel'],
+            description=description,
+            additional_args=manifest_arguments)
+    except Exception as e:
+        chip.logger.error(e)
+        return 1
+
+    if not os.path.isfile(switches['input']):
+        chip.logger.error(f'Unable to find manifest: {switches["input"]}')
+        return 1
+
+    # Keep the content as-is instead of merging it into the chip schema
+    try:
+        chip.schema = Schema(manifest=switches['input'], logger=chip.logger)
+    except Exception as e:
+        chip.logger.error(e)
+        return 1
+
+    try:
+        chip.write_manifest(switches['output'], prune=False)
+    except Exception as e:
+        chip.logger.error(e)
+        return 1
+
+    chip.logger.info(f'Wrote manifest to {switches["output"]}')
+    return 0
+
+
+#########################
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import errno
+import os
+import time
+
+# Period of cpu.max in microseconds.
+CPU_PERIOD = 100000
+# How long to wait for the processes of a cgroup to exit before removing it.
+REMOVE_TIMEOUT = 5
+
+
+class Cgroup:
+    '''
+    cgroup v2 holding the processes of the command of a node, to limit its
+    memory and CPU usage on Linux.
+
+    The cgroup is created in a parent cgroup, which has to be delegated to
+    the user running SiliconCompiler, and must not hold processes itself,
+    since controllers can only be enabled for the children of a cgroup
+    without processes.
+
+    Args:
+        parent (str): Directory of the parent cgroup.
+        name (str): Name of the cgroup.
+        memory (int): Memory limit (memory.max) in bytes, or None.
+        cores (float): Number of cores the processes can use at most
+            (cpu.max), or None.
+    '''
+
+    def __init__(self, parent, name, memory=None, cores=None):
+        self.parent = parent
+        self.path = os.path.join(parent, name)
+        self.memory = memory
+        self.cores = cores
+
+    def create(self):
+        '''
+        Creates the cgroup and sets its limits.
+
+        Raises:
+            OSError: If the cgroup cannot be created, ie. because the parent
+                is not a cgroup v2 delegated to the user.
+        '''
+        controllers = []
+        if self.memory:
+            controllers.append('memory')
+        if self.cores:
+            controllers.append('cpu')
+
+        available = _read(os.path.join(self.parent, 'cgroup.controllers')).split()
+        missing = [controller for controller in controllers if controller not in available]
+        if missing:
+            raise OSError(f'{", ".join(missing)} controllers are not available in {self.parent}')
+
+        enabled = _read(os.path.join(self.parent, 'cgroup.subtree_control')).split()
+        to_enable = [controller for controller in controllers if controller not in enabled]
+        if to_enable:
+            _write(os.path.join(self.parent, 'cgroup.subtree_control'),
+                   ' '.join(f'+{controller}' for controller in to_enable))
+
+        os.makedirs(self.path, exist_ok=True)
+        if self.memory:
+            _write(os.path.join(self.path, 'memory.max'), str(int(self.memory)))
+        if self.cores:
+            quota = max(1000, int(self.cores * CPU_PERIOD))
+            _write(os.path.join(self.path, 'cpu.max'), f'{quota} {CPU_PERIOD}')
+
+    def add_current_process(self):
+        '''
+        Moves the current process into the cgroup, ie. from the preexec_fn
+        of a command so that the command and all its children are in it.
+        '''
+        _write(os.path.join(self.path, 'cgroup.procs'), str(os.getpid()))
+
+    def get_oom_kills(self):
+        '''
+        Returns the number of processes of the cgroup killed for exceeding
+        its memory limit.
+        '''
+        try:
+            events = _read(os.path.join(self.path, 'memory.events'))
+        except OSError:
+            return 0
+        for line in events.splitlines():
+            key, _, value = line.partition(' ')
+            if key == 'oom_kill':
+                return int(value)
+        return 0
+
+    def remove(self):
+        '''
+        Removes the cgroup, after killing the processes left in it by the
+        command.
+        '''
+        if not os.path.isdir(self.path):
+            return
+
+        kill = os.path.join(self.path, 'cgroup.kill')
+        if os.path.exists(kill):
+            try:
+                _write(kill, '1')
+            except OSError:
+                pass
+
+        # The cgroup can only be removed once its processes exited
+        end = time.time() + REMOVE_TIMEOUT
+        while True:
+            try:
+                os.rmdir(self.path)
+                return
+            except OSError as e:
+                if e.errno != errno.EBUSY or time.time() > end:
+                    raise
+                time.sleep(0.05)
+
+
+def is_cgroup_v2(path):
+    '''Returns True if path is the directory of a cgroup v2.'''
+    return bool(path) and os.path.isfile(os.path.join(path, 'cgroup.controllers'))
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def _write(path, value):
+    with open(path, 'w') as f:
+        f.write(value)
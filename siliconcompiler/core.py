@@ -2,6 +2,7 @@
 
 import time
 import multiprocessing
+import multiprocessing.connection
 import tarfile
 import os
 import git
@@ -14,6 +15,7 @@ import logging
 import hashlib
 import shutil
 import copy
+import collections
 import importlib
 import inspect
 import textwrap
@@ -33,6 +35,13 @@ from datetime import datetime
 from siliconcompiler.remote import client
 from siliconcompiler.schema import Schema, SCHEMA_VERSION
 from siliconcompiler import scheduler
+from siliconcompiler.worker_pool import WorkerPool
+from siliconcompiler.flowgraph import FlowGraph
+from siliconcompiler import cgroup
+from siliconcompiler import log_scanner
+from siliconcompiler import output_stream
+from siliconcompiler import resource_sampler
+from siliconcompiler import task_cache
 from siliconcompiler import utils
 from siliconcompiler import units
 from siliconcompiler import _metadata
@@ -71,6 +80,8 @@ class Chip:
         # Local variables
         self.scroot = os.path.dirname(os.path.abspath(__file__))
         self._error = False
+        # Results of checking the log of the running tool, see _check_logfile()
+        self.__log_scanner = None
         try:
             self.cwd = os.getcwd()
         except FileNotFoundError:
@@ -108,6 +119,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # Cache of python packages loaded
         self._packages = {}
 
+        # Cache of the graphs of flows, see _get_flowgraph()
+        self.__flowgraphs = {}
+
         # Controls whether find_files returns an abspath or relative to this
         # this is primarily used when generating standalone testcases
         self.__relative_path = None
@@ -575,7 +589,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if 'package' not in cfg or 'source' not in cfg['package']:
             return
 
-        schema = Schema(cfg=cfg)
+        # Only load the package sources instead of the entire module schema
+        schema = Schema(cfg={'package': {'source': cfg['package']['source']}})
 
         for source in schema.getkeys('package', 'source'):
             if not schema.valid('package', 'source', source, 'path'):
@@ -611,6 +626,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         # Copy
         src_cfg[importname] = module.getdict(group, importname)
+        self.schema._clear_index()
         self.__import_data_sources(module.schema.cfg)
 
     ###########################################################################
@@ -728,7 +744,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             Returns the name of the foundry from the PDK.
 
         """
-        self.logger.debug(f"Reading from {keypath}. Field = '{field}'")
+        self.logger.debug("Reading from %s. Field = '%s'", keypath, field)
 
         try:
             strict = self.schema.get('option', 'strict')
@@ -836,6 +852,17 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.schema.set(*keypath, package, field='package',
                                 step=step, index=index, clobber=clobber)
 
+    def __check_set_package(self, keypath, value, package):
+        '''
+        Raises a ValueError if the package cannot be recorded for the value,
+        see __add_set_package().
+        '''
+        sc_type = self.schema.get(*keypath, field='type')
+        if ('file' in sc_type or 'dir' in sc_type) and \
+                isinstance(package, (list, tuple)) and not isinstance(value, (list, tuple)):
+            raise ValueError(f'Invalid package for {keypath}: a list of packages '
+                             'requires a list of values')
+
     ###########################################################################
     def set(self, *args, field='value', clobber=True, step=None, index=None, package=None):
         '''
@@ -870,7 +897,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         '''
         keypath = args[:-1]
         value = args[-1]
-        self.logger.debug(f'Setting {keypath} to {value}')
+        self.logger.debug('Setting %s to %s', keypath, value)
 
         # Special case to ensure loglevel is updated ASAP
         if keypath == ['option', 'loglevel'] and field == 'value' and \
@@ -886,6 +913,60 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         except (ValueError, TypeError) as e:
             self.error(e)
 
+    ###########################################################################
+    def set_many(self, values, field='value', clobber=True, step=None, index=None,
+                 package=None):
+        '''
+        Sets multiple schema parameter fields.
+
+        This is equivalent to calling :meth:`set()` for each entry of values,
+        but all values are checked before any parameter is modified. This makes
+        it faster to set up large numbers of parameters, ie. in PDK and library
+        setup functions.
+
+        Args:
+            values (list): List of parameter keypaths, each followed by the value
+                to set.
+            field (str): Parameter field to set.
+            clobber (bool): Existing values are overwritten if True.
+            step (str): Step name to set for parameters that may be specified
+                on a per-node basis.
+            index (str): Index name to set for parameters that may be specified
+                on a per-node basis.
+            package (str): Package that the files/dirs depend on. Available packages
+                are listed in the package source section of the schema.
+
+        Examples:
+            >>> chip.set_many([('design', 'top'), ('option', 'jobname', 'job1')])
+            Sets the name of the design to 'top' and the job name to 'job1'
+        '''
+        values = list(values)
+        self.logger.debug('Setting %d parameters', len(values))
+
+        try:
+            if field == 'value':
+                # Check the packages before any parameter is modified
+                for args in values:
+                    self.__check_set_package(tuple(args[:-1]), args[-1], package)
+
+            results = self.schema.set_many(values, field=field, clobber=clobber,
+                                           step=step, index=index)
+
+            # Special case to ensure loglevel is updated ASAP
+            for args, value_success in zip(values, results):
+                if value_success and tuple(args[:-1]) == ('option', 'loglevel') and \
+                        field == 'value' and step == self.get('arg', 'step') and \
+                        index == self.get('arg', 'index'):
+                    self.logger.setLevel(args[-1])
+
+            if field == 'value':
+                for args, value_success in zip(values, results):
+                    if value_success:
+                        self.__add_set_package(tuple(args[:-1]), args[-1], package,
+                                               step, index, True, False)
+        except (ValueError, TypeError) as e:
+            self.error(e)
+
     ###########################################################################
     def unset(self, *keypath, step=None, index=None):
         '''
@@ -912,7 +993,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             index (str): Index name to unset for parameters that may be specified
                 on a per-node basis.
         '''
-        self.logger.debug(f'Unsetting {keypath}')
+        self.logger.debug('Unsetting %s', keypath)
 
         if not self.schema.unset(*keypath, step=step, index=index):
             self.logger.debug(f'Failed to unset value for {keypath}: parameter is locked')
@@ -1368,14 +1449,15 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
     ###########################################################################
     def _merge_manifest(self, src, job=None, clobber=True, clear=True, check=False, partial=False):
         """
-        Merges a given manifest with the current compilation manifest.
+        Merges one or more manifests with the current compilation manifest.
 
         All value fields in the provided schema dictionary are merged into the
         current chip object. Dictionaries with non-existent keypath produces a
         logger error message and raises the Chip object error flag.
 
         Args:
-            src (Schema): Schema object to merge
+            src (Schema or list of Schema): Schema object(s) to merge, a list
+                is merged in a single pass, in order.
             job (str): Specifies non-default job to merge into
             clear (bool): If True, disables append operations for list type
             clobber (bool): If True, overwrites existing parameter value
@@ -1388,49 +1470,14 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         else:
             dest = self.schema
 
-        for keylist in src.allkeys():
-            if keylist[0] in ('history', 'library'):
-                continue
-            if partial and not self._key_may_be_updated(keylist):
-                continue
-            # only read in valid keypaths without 'default'
-            key_valid = True
-            if check:
-                key_valid = dest.valid(*keylist, default_valid=True)
-                if not key_valid:
-                    self.logger.warning(f'Keypath {keylist} is not valid')
-            if key_valid and 'default' not in keylist:
-                typestr = src.get(*keylist, field='type')
-                should_append = re.match(r'\[', typestr) and not clear
-                for val, step, index in src._getvals(*keylist, return_defvalue=False):
-                    # update value, handling scalars vs. lists
-                    if should_append:
-                        dest.add(*keylist, val, step=step, index=index)
-                    else:
-                        dest.set(*keylist, val, step=step, index=index, clobber=clobber)
-
-                    # update other pernode fields
-                    # TODO: only update these if clobber is successful
-                    step_key = Schema.GLOBAL_KEY if not step else step
-                    idx_key = Schema.GLOBAL_KEY if not index else index
-                    for field in src.getdict(*keylist)['node'][step_key][idx_key].keys():
-                        if field == 'value':
-                            continue
-                        v = src.get(*keylist, step=step, index=index, field=field)
-                        if should_append:
-                            dest.add(*keylist, v, step=step, index=index, field=field)
-                        else:
-                            dest.set(*keylist, v, step=step, index=index, field=field)
-
-                # update other fields that a user might modify
-                for field in src.getdict(*keylist).keys():
-                    if field in ('node', 'switch', 'type', 'require',
-                                 'shorthelp', 'example', 'help'):
-                        # skip these fields (node handled above, others are static)
-                        continue
-                    # TODO: should we be taking into consideration clobber for these fields?
-                    v = src.get(*keylist, field=field)
-                    dest.set(*keylist, v, field=field)
+        if isinstance(src, Schema):
+            src = [src]
+
+        key_filter = None
+        if partial:
+            key_filter = self._key_may_be_updated
+
+        dest._merge(src, clobber=clobber, clear=clear, check=check, key_filter=key_filter)
 
     ###########################################################################
     def check_filepaths(self):
@@ -1557,6 +1604,28 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if cur_step and cur_index and not self.get('option', 'skipall'):
             return self._check_manifest_dynamic(cur_step, cur_index)
 
+        flow = self.get('option', 'flow')
+
+        if not self._check_manifest_global():
+            error = True
+
+        # 5. Check per tool parameter requirements (when tool exists)
+        for (step, index) in self.nodes_to_execute():
+            if not self._check_node_setup(flow, step, index):
+                error = True
+
+        if not self._check_flowgraph_io():
+            error = True
+
+        return not error
+
+    def _check_manifest_global(self):
+        '''
+        Performs the checks of check_manifest() which do not depend on the
+        setup of the nodes.
+        '''
+        error = False
+
         design = self.get('design')
         flow = self.get('option', 'flow')
 
@@ -1627,8 +1696,6 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         # 4. Check if tool/task modules exists
         for (step, index) in nodes_to_execute:
-            tool = self.get('flowgraph', flow, step, index, 'tool')
-            task = self.get('flowgraph', flow, step, index, 'task')
             tool_name, task_name = self._get_tool_task(step, index, flow=flow)
 
             if not self._get_tool_module(step, index, flow=flow, error=False):
@@ -1641,39 +1708,41 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.logger.error(f"Task module {task_module} for {tool_name}/{task_name} "
                                   f"could not be found or loaded for {step}{index}.")
 
-        # 5. Check per tool parameter requirements (when tool exists)
-        for (step, index) in nodes_to_execute:
-            tool, task = self._get_tool_task(step, index, flow=flow)
-            task_module = self._get_task_module(step, index, flow=flow, error=False)
-            if self._is_builtin(tool, task):
-                continue
+        return not error
 
-            if tool not in self.getkeys('tool'):
-                error = True
-                self.logger.error(f'{tool} is not configured.')
-                continue
+    def _check_node_setup(self, flow, step, index):
+        '''
+        Checks that the tool of a node has been set up, and that the parameters
+        required by its task are set.
+        '''
+        error = False
 
-            if task not in self.getkeys('tool', tool, 'task'):
-                error = True
-                self.logger.error(f'{tool}/{task} is not configured.')
-                continue
+        tool, task = self._get_tool_task(step, index, flow=flow)
+        task_module = self._get_task_module(step, index, flow=flow, error=False)
+        if self._is_builtin(tool, task):
+            return True
 
-            if self.valid('tool', tool, 'task', task, 'require'):
-                all_required = self.get('tool', tool, 'task', task, 'require',
-                                        step=step, index=index)
-                for item in all_required:
-                    keypath = item.split(',')
-                    if self.schema._is_empty(*keypath):
-                        error = True
-                        self.logger.error(f"Value empty for {keypath} for {tool}.")
+        if tool not in self.getkeys('tool'):
+            self.logger.error(f'{tool} is not configured.')
+            return False
 
-            task_run = getattr(task_module, 'run', None)
-            if self.schema._is_empty('tool', tool, 'exe') and not task_run:
-                error = True
-                self.logger.error(f'No executable or run() function specified for {tool}/{task}')
+        if task not in self.getkeys('tool', tool, 'task'):
+            self.logger.error(f'{tool}/{task} is not configured.')
+            return False
 
-        if not self._check_flowgraph_io():
+        if self.valid('tool', tool, 'task', task, 'require'):
+            all_required = self.get('tool', tool, 'task', task, 'require',
+                                    step=step, index=index)
+            for item in all_required:
+                keypath = item.split(',')
+                if self.schema._is_empty(*keypath):
+                    error = True
+                    self.logger.error(f"Value empty for {keypath} for {tool}.")
+
+        task_run = getattr(task_module, 'run', None)
+        if self.schema._is_empty('tool', tool, 'exe') and not task_run:
             error = True
+            self.logger.error(f'No executable or run() function specified for {tool}/{task}')
 
         return not error
 
@@ -1767,86 +1836,106 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         flow = self.get('option', 'flow')
         flowgraph_nodes = self.nodes_to_execute()
         for (step, index) in flowgraph_nodes:
-            # For each task, check input requirements.
-            tool, task = self._get_tool_task(step, index, flow=flow)
+            if not self._check_node_io(flow, step, index, flowgraph_nodes):
+                return False
 
-            if self._is_builtin(tool, task):
-                # We can skip builtins since they don't have any particular
-                # input requirements -- they just pass through what they
-                # receive.
-                continue
+        return True
 
-            # Get files we receive from input nodes.
-            in_nodes = self._get_flowgraph_node_inputs(flow, (step, index))
-            all_inputs = set()
-            for in_step, in_index in in_nodes:
-                if (in_step, in_index) not in flowgraph_nodes:
-                    # If we're not running the input step, the required
-                    # inputs need to already be copied into the build
-                    # directory.
-                    in_job = self._get_in_job(step, index)
-                    workdir = self._getworkdir(jobname=in_job, step=in_step, index=in_index)
-                    in_step_out_dir = os.path.join(workdir, 'outputs')
+    def _check_node_io(self, flow, step, index, flowgraph_nodes):
+        '''
+        Checks that a node receives the files it requires from its inputs, and
+        that it does not receive the same file from multiple inputs.
+        '''
+        # For each task, check input requirements.
+        tool, task = self._get_tool_task(step, index, flow=flow)
 
-                    if not os.path.isdir(in_step_out_dir):
-                        # This means this step hasn't been run, but that
-                        # will be flagged by a different check. No error
-                        # message here since it would be redundant.
-                        inputs = []
-                        continue
+        if self._is_builtin(tool, task):
+            # We can skip builtins since they don't have any particular
+            # input requirements -- they just pass through what they
+            # receive.
+            return True
 
-                    design = self.get('design')
-                    manifest = f'{design}.pkg.json'
-                    inputs = [inp for inp in os.listdir(in_step_out_dir) if inp != manifest]
-                else:
-                    inputs = self._gather_outputs(in_step, in_index)
-
-                for inp in inputs:
-                    if inp in all_inputs:
-                        self.logger.error(f'Invalid flow: {step}{index} '
-                                          f'receives {inp} from multiple input tasks')
-                        return False
-                    all_inputs.add(inp)
-
-            requirements = self.get('tool', tool, 'task', task, 'input', step=step, index=index)
-            for requirement in requirements:
-                if requirement not in all_inputs:
-                    self.logger.error(f'Invalid flow: {step}{index} will '
-                                      f'not receive required input {requirement}.')
+        # Get files we receive from input nodes.
+        in_nodes = self._get_flowgraph_node_inputs(flow, (step, index))
+        all_inputs = set()
+        for in_step, in_index in in_nodes:
+            if (in_step, in_index) not in flowgraph_nodes:
+                # If we're not running the input step, the required
+                # inputs need to already be copied into the build
+                # directory.
+                in_job = self._get_in_job(step, index)
+                workdir = self._getworkdir(jobname=in_job, step=in_step, index=in_index)
+                in_step_out_dir = os.path.join(workdir, 'outputs')
+
+                if not os.path.isdir(in_step_out_dir):
+                    # This means this step hasn't been run, but that
+                    # will be flagged by a different check. No error
+                    # message here since it would be redundant.
+                    inputs = []
+                    continue
+
+                design = self.get('design')
+                manifests = (f'{design}.pkg.json', f'{design}.delta.pkg.json')
+                inputs = [inp for inp in os.listdir(in_step_out_dir)
+                          if inp not in manifests]
+            else:
+                inputs = self._gather_outputs(in_step, in_index)
+
+            for inp in inputs:
+                if inp in all_inputs:
+                    self.logger.error(f'Invalid flow: {step}{index} '
+                                      f'receives {inp} from multiple input tasks')
                     return False
+                all_inputs.add(inp)
+
+        requirements = self.get('tool', tool, 'task', task, 'input', step=step, index=index)
+        for requirement in requirements:
+            if requirement not in all_inputs:
+                self.logger.error(f'Invalid flow: {step}{index} will '
+                                  f'not receive required input {requirement}.')
+                return False
 
         return True
 
     ###########################################################################
-    def read_manifest(self, filename, job=None, clear=True, clobber=True):
+    def read_manifest(self, filename, job=None, clear=True, clobber=True, include=None):
         """
         Reads a manifest from disk and merges it with the current compilation manifest.
 
         The file format read is determined by the filename suffix. Currently
-        json (*.json) and yaml(*.yaml) formats are supported.
+        json (*.json), yaml (*.yaml) and msgpack (*.msgpack) formats are
+        supported.
 
         Args:
             filename (filepath): Path to a manifest file to be loaded.
             job (str): Specifies non-default job to merge into.
             clear (bool): If True, disables append operations for list type.
             clobber (bool): If True, overwrites existing parameter value.
+            include (list of keypaths): If provided, only keypaths starting
+                with one of these prefixes are read from the manifest.
 
         Examples:
             >>> chip.read_manifest('mychip.json')
             Loads the file mychip.json into the current Chip object.
+            >>> chip.read_manifest('mychip.json', include=[['metric'], ['record']])
+            Loads only the metrics and records from mychip.json.
         """
-        self._read_manifest(filename, job=job, clear=clear, clobber=clobber)
+        self._read_manifest(filename, job=job, clear=clear, clobber=clobber, include=include)
 
     ###########################################################################
-    def _read_manifest(self, filename, job=None, clear=True, clobber=True, partial=False):
+    def _read_manifest(self, filename, job=None, clear=True, clobber=True, partial=False,
+                       trusted=False, include=None):
         """
-        Internal read_manifest() implementation with `partial` arg.
+        Internal read_manifest() implementation with `partial` and `trusted` args.
 
         partial (bool): If True, perform a partial merge, only merging keypaths
         that may have been updated during run().
+        trusted (bool): If True, the manifest was written by this version of
+        SiliconCompiler (ie. by a node of the current run), so its values do
+        not need to be checked. See :class:`~siliconcompiler.schema.Schema`.
         """
         # Read from file into new schema object
-        schema = Schema(manifest=filename, logger=self.logger)
+        schema = Schema(manifest=filename, logger=self.logger, trusted=trusted, include=include)
 
         # Merge data in schema with Chip configuration
         self._merge_manifest(schema, job=job, clear=clear, clobber=clobber, partial=partial)
@@ -1873,8 +1962,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Writes the compilation manifest to a file.
 
         The write file format is determined by the filename suffix. Currently
-        json (*.json), yaml (*.yaml), tcl (*.tcl), and (*.csv) formats are
-        supported.
+        json (*.json), yaml (*.yaml), msgpack (*.msgpack), tcl (*.tcl), and
+        (*.csv) formats are supported. msgpack is a binary format that is
+        faster to read and write than json for large manifests.
 
         Args:
             filename (filepath): Output filepath
@@ -1898,16 +1988,22 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if abspath:
             schema = self._abspath()
         else:
-            schema = self.schema.copy()
+            schema = self.schema
 
         if prune:
             self.logger.debug('Pruning dictionary before writing file %s', filepath)
-            schema.prune()
+            schema = schema._pruned()
 
         is_csv = re.search(r'(\.csv)(\.gz)*$', filepath)
+        is_msgpack = re.search(r'(\.msgpack)(\.gz)*$', filepath)
 
         # format specific dumping
-        if filepath.endswith('.gz'):
+        if is_msgpack:
+            if filepath.endswith('.gz'):
+                fout = gzip.open(filepath, 'wb')
+            else:
+                fout = open(filepath, 'wb')
+        elif filepath.endswith('.gz'):
             fout = gzip.open(filepath, 'wt', encoding='UTF-8')
         elif is_csv:
             # Files written using csv library should be opened with newline=''
@@ -1933,8 +2029,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                                  template=utils.get_file_template('tcl/manifest.tcl.j2'))
             elif is_csv:
                 schema.write_csv(fout)
+            elif is_msgpack:
+                schema.write_msgpack(fout)
             else:
-                self.error('File format not recognized %s', filepath)
+                self.error(f'File format not recognized {filepath}')
         finally:
             fout.close()
 
@@ -2602,8 +2700,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Emulates the Unix grep command on a string.
 
         Emulates the behavior of the Unix grep command that is etched into
-        our muscle memory. Partially implemented, not all features supported.
-        The function returns None if no match is found.
+        our muscle memory. Partially implemented, the options supported are
+        -v, -i, -x, -w and -e. The function returns None if no match is found.
 
         Args:
             arg (string): Command line arguments for grep command
@@ -2618,44 +2716,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if line is None:
             return None
 
-        # Partial list of supported grep options
-        options = {
-            '-v': False,  # Invert the sense of matching
-            '-i': False,  # Ignore case distinctions in patterns and data
-            '-E': False,  # Interpret PATTERNS as extended regular expressions.
-            '-e': False,  # Safe interpretation of pattern starting with "-"
-            '-x': False,  # Select only matches that exactly match the whole line.
-            '-o': False,  # Print only the match parts of a matching line
-            '-w': False}  # Select only lines containing matches that form whole words.
-
-        # Split into repeating switches and everything else
-        match = re.match(r'\s*((?:\-\w\s)*)(.*)', args)
-
-        pattern = match.group(2)
-
-        # Split space separated switch string into list
-        switches = match.group(1).strip().split(' ')
-
-        # Find special -e switch update the pattern
-        for i in range(len(switches)):
-            if switches[i] == "-e":
-                if i != (len(switches)):
-                    pattern = ' '.join(switches[i + 1:]) + " " + pattern
-                    switches = switches[0:i + 1]
-                    break
-                options["-e"] = True
-            elif switches[i] in options.keys():
-                options[switches[i]] = True
-            elif switches[i] != '':
-                self.logger.error(switches[i])
-
-        # REGEX
-        # TODO: add all the other optinos
-        match = re.search(rf"({pattern})", line)
-        if bool(match) == bool(options["-v"]):
-            return None
-        else:
+        if log_scanner.get_grep_pattern(args, logger=self.logger).matches(line):
             return line
+        return None
 
     ###########################################################################
     def check_logfile(self, jobname=None, step=None, index='0',
@@ -2702,23 +2765,36 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             logfile = os.path.join(self._getworkdir(jobname=jobname, step=step, index=index),
                                    f'{step}.log')
 
+        checks = self.__get_log_checks(flow, step, index)
+
+        # The log is read once, and every line is checked for all suffixes
+        scanner = log_scanner.LogScanner(
+            checks,
+            {suffix: f"{step}.{suffix}" for suffix in checks},
+            logger=self.logger)
+        with scanner, sc_open(logfile) as f:
+            scanner.scan(f)
+        scanner.align_reports(callback=self.__display_log_match if display else None)
+
+        matches = scanner.matches
+        for suffix in checks:
+            self.logger.info(f'Number of {suffix}: {matches[suffix]}')
+
+        return matches
+
+    def __get_log_checks(self, flow, step, index):
+        '''
+        Returns the 'regex' patterns of the task of a node, ordered by
+        suffixes as follows: [..., 'warnings', 'errors']
+        '''
         tool, task = self._get_tool_task(step, index, flow=flow)
 
-        # Creating local dictionary (for speed)
-        # self.get is slow
         checks = {}
-        matches = {}
         for suffix in self.getkeys('tool', tool, 'task', task, 'regex'):
             regexes = self.get('tool', tool, 'task', task, 'regex', suffix, step=step, index=index)
-            if not regexes:
-                continue
+            if regexes:
+                checks[suffix] = regexes
 
-            checks[suffix] = {}
-            checks[suffix]['report'] = open(f"{step}.{suffix}", "w")
-            checks[suffix]['args'] = regexes
-            matches[suffix] = 0
-
-        # Order suffixes as follows: [..., 'warnings', 'errors']
         ordered_suffixes = list(filter(lambda key:
                                        key not in ['warnings', 'errors'], checks.keys()))
         if 'warnings' in checks:
@@ -2726,39 +2802,15 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if 'errors' in checks:
             ordered_suffixes.append('errors')
 
-        # Looping through patterns for each line
-        with sc_open(logfile) as f:
-            line_count = sum(1 for _ in f)
-            right_align = len(str(line_count))
-            for suffix in ordered_suffixes:
-                # Start at the beginning of file again
-                f.seek(0)
-                for num, line in enumerate(f, start=1):
-                    string = line
-                    for item in checks[suffix]['args']:
-                        if string is None:
-                            break
-                        else:
-                            string = self.grep(item, string)
-                    if string is not None:
-                        matches[suffix] += 1
-                        # always print to file
-                        line_with_num = f'{num: >{right_align}}: {string.strip()}'
-                        print(line_with_num, file=checks[suffix]['report'])
-                        # selectively print to display
-                        if display:
-                            if suffix == 'errors':
-                                self.logger.error(line_with_num)
-                            elif suffix == 'warnings':
-                                self.logger.warning(line_with_num)
-                            else:
-                                self.logger.info(f'{suffix}: {line_with_num}')
-
-        for suffix in ordered_suffixes:
-            self.logger.info(f'Number of {suffix}: {matches[suffix]}')
-            checks[suffix]['report'].close()
+        return {suffix: checks[suffix] for suffix in ordered_suffixes}
 
-        return matches
+    def __display_log_match(self, suffix, line_with_num):
+        if suffix == 'errors':
+            self.logger.error(line_with_num)
+        elif suffix == 'warnings':
+            self.logger.warning(line_with_num)
+        else:
+            self.logger.info(f'{suffix}: {line_with_num}')
 
     ###########################################################################
     def _dashboard(self, wait=True, port=None, graph_chips=None):
@@ -3063,18 +3115,20 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Merge manifests from all input dependencies
         '''
 
-        design = self.get('design')
         flow = self.get('option', 'flow')
         in_job = self._get_in_job(step, index)
 
         if not self.get('option', 'remote') and not replay:
+            manifests = []
             for in_step, in_index in self._get_flowgraph_node_inputs(flow, (step, index)):
                 in_node_status = status[(in_step, in_index)]
                 self.set('flowgraph', flow, in_step, in_index, 'status', in_node_status)
                 in_workdir = self._getworkdir(in_job, in_step, in_index)
-                cfgfile = f"{in_workdir}/outputs/{design}.pkg.json"
-                if os.path.isfile(cfgfile):
-                    self._read_manifest(cfgfile, clobber=False, partial=True)
+                cfgfile = self._get_node_manifest(in_workdir)
+                if cfgfile:
+                    manifests.append(Schema(manifest=cfgfile, logger=self.logger, trusted=True))
+            # Merge all inputs in one pass
+            self._merge_manifest(manifests, clobber=False, partial=True)
 
     def _select_inputs(self, step, index):
 
@@ -3121,7 +3175,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 in_workdir = self._getworkdir(in_job, in_step, in_index)
                 shutil.copytree(f"{in_workdir}/outputs", 'inputs/',
                                 dirs_exist_ok=True,
-                                ignore=shutil.ignore_patterns(f'{design}.pkg.json'),
+                                ignore=shutil.ignore_patterns(f'{design}.pkg.json',
+                                                              f'{design}.delta.pkg.json'),
                                 copy_function=utils.link_symlink_copy)
 
     def _pre_process(self, step, index):
@@ -3201,17 +3256,226 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self._haltstep(flow, step, index)
         return (exe, version)
 
-    def __read_std_streams(self, quiet, is_stdout_log, stdout_reader, is_stderr_log, stderr_reader):
+    def __start_log_scan(self, step, index, stdout_file, stderr_file, quiet):
         '''
-        Handle directing tool outputs to logger
+        Starts checking the log of a tool for its 'regex' patterns while the
+        tool runs, see check_logfile(). Matches are displayed as they are
+        found, unless quiet is set.
+
+        Returns:
+            The LogFollower of the log, or None if the tool does not write its
+            log or there is nothing to check.
         '''
-        if not quiet:
-            if is_stdout_log:
-                for line in stdout_reader.readlines():
-                    self.logger.info(line.rstrip())
-            if is_stderr_log:
-                for line in stderr_reader.readlines():
-                    self.logger.error(line.rstrip())
+        logfile = f'{step}.log'
+        if logfile not in (stdout_file, stderr_file):
+            return None
+
+        flow = self.get('option', 'flow')
+        checks = self.__get_log_checks(flow, step, index)
+        if not checks:
+            return None
+
+        # Make sure the log of a previous run is never read
+        open(logfile, 'w').close()
+
+        scanner = log_scanner.LogScanner(
+            checks,
+            {suffix: f"{step}.{suffix}" for suffix in checks},
+            logger=self.logger,
+            callback=None if quiet else self.__display_log_match)
+        scanner.open()
+        return log_scanner.LogFollower(logfile, scanner)
+
+    def __poll_log_scan(self, step, index, log_follower):
+        '''
+        Checks the lines added to the log of a running tool.
+
+        Returns:
+            True if the tool reached :keypath:`option,maxerrors` and must be
+            stopped.
+        '''
+        if not log_follower:
+            return False
+
+        log_follower.poll()
+
+        maxerrors = self.get('option', 'maxerrors', step=step, index=index)
+        if not maxerrors:
+            return False
+        return log_follower.scanner.matches.get('errors', 0) >= maxerrors
+
+    def __finish_log_scan(self, log_follower):
+        '''
+        Checks the rest of the log once the tool exited, the results are used
+        by _check_logfile().
+        '''
+        log_follower.finish()
+        log_follower.scanner.align_reports()
+        self.__log_scanner = log_follower.scanner
+
+    def __stop_on_errors(self, step, index, log_follower):
+        '''
+        Fails a node whose tool was stopped after reaching
+        :keypath:`option,maxerrors`.
+        '''
+        flow = self.get('option', 'flow')
+        tool, _ = self._get_tool_task(step, index, flow)
+
+        self.__finish_log_scan(log_follower)
+        errors = self.__log_scanner.matches['errors']
+        self.logger.error(f'Stopped {tool} after {errors} errors')
+        self._check_logfile(step, index)
+        self.set('record', 'failure', 'maxerrors', step=step, index=index)
+        self._haltstep(flow, step, index)
+
+    def __get_preexec_fn(self, step, index, node_cgroup=None):
+        '''
+        Returns the function called in the process of the command of a tool
+        before it is executed, or None.
+        '''
+        if not self.__is_posix():
+            return None
+
+        nice = self.get('option', 'nice', step=step, index=index)
+
+        def preexec():
+            if node_cgroup:
+                node_cgroup.add_current_process()
+            if nice:
+                os.nice(nice)
+
+        if nice or node_cgroup:
+            return preexec
+        return None
+
+    def __create_cgroup(self, step, index):
+        '''
+        Creates the cgroup the command of a tool runs in, if
+        :keypath:`option,scheduler,cgroup` is set.
+
+        Returns:
+            The Cgroup, or None if the command does not run in a cgroup.
+        '''
+        parent = self.get('option', 'scheduler', 'cgroup', step=step, index=index)
+        if not parent:
+            return None
+
+        if not cgroup.is_cgroup_v2(parent):
+            self.logger.warning(f'{parent} is not a cgroup v2, running without limits')
+            return None
+
+        flow = self.get('option', 'flow')
+        cores, memory = self._get_node_resources(flow, step, index)
+        if not cores:
+            tool, task = self._get_tool_task(step, index, flow)
+            cores = self.get('tool', tool, 'task', task, 'threads', step=step, index=index)
+
+        node_cgroup = cgroup.Cgroup(
+            parent,
+            f'sc_{os.getpid()}_{step}{index}',
+            memory=memory * 1024 * 1024 if memory else None,
+            cores=cores)
+        try:
+            node_cgroup.create()
+        except OSError as e:
+            self.logger.warning(f'Unable to create cgroup in {parent}, running without '
+                                f'limits: {e}')
+            return None
+
+        return node_cgroup
+
+    def __run_command(self, step, index, cmdlist, stdout_file, stderr_file,
+                      stdout_callback, stderr_callback, timeout, log_follower=None,
+                      node_cgroup=None):
+        '''
+        Runs the command of a tool. The outputs
+        of the command are copied from pipes to the log files by threads,
+        while the command is polled for its resource usage, timeout and log
+        errors (checked with log_follower). The command runs in node_cgroup
+        if set.
+
+        Returns:
+            Tuple of the return code of the command and the ResourceSampler
+            of its resource usage.
+        '''
+        flow = self.get('option', 'flow')
+        tool, _ = self._get_tool_task(step, index, flow)
+
+        # How long to wait for proc to quit on ctrl-c before force
+        # terminating.
+        TERMINATE_TIMEOUT = 5
+        POLL_INTERVAL = 0.1
+        # How long to wait for the output pipes to be closed once the command
+        # exited, in case a child process of the command still holds them open.
+        DRAIN_TIMEOUT = 1
+
+        sampler = resource_sampler.ResourceSampler(
+            cgroup=node_cgroup.path if node_cgroup else None)
+
+        files = []
+        try:
+            stdout, stdout_writer = output_stream.open_output(stdout_file, files)
+            if stderr_file == stdout_file:
+                # Use a single pipe if STDOUT and STDERR are redirected to the
+                # same file
+                stderr, stderr_writer = subprocess.STDOUT, None
+            else:
+                stderr, stderr_writer = output_stream.open_output(stderr_file, files)
+
+            cmd_start_time = time.time()
+            proc = subprocess.Popen(cmdlist,
+                                    stdout=stdout,
+                                    stderr=stderr,
+                                    preexec_fn=self.__get_preexec_fn(step, index,
+                                                                     node_cgroup))
+
+            readers = []
+            if stdout == subprocess.PIPE:
+                readers.append(output_stream.start_reader(proc.stdout, stdout_writer,
+                                                          stdout_callback))
+            if stderr == subprocess.PIPE:
+                readers.append(output_stream.start_reader(proc.stderr, stderr_writer,
+                                                          stderr_callback))
+
+            try:
+                while True:
+                    # Gather subprocess resource usage.
+                    sampler.sample(proc.pid)
+
+                    if self.__poll_log_scan(step, index, log_follower):
+                        utils.terminate_process(proc.pid)
+                        self.__stop_on_errors(step, index, log_follower)
+
+                    if timeout is not None and time.time() - cmd_start_time > timeout:
+                        self.logger.error(f'Step timed out after {timeout} seconds')
+                        utils.terminate_process(proc.pid)
+                        self.set('record', 'failure', 'timeout', step=step, index=index)
+                        self._haltstep(flow, step, index)
+
+                    # Returns as soon as the command exits
+                    try:
+                        proc.wait(timeout=POLL_INTERVAL)
+                        break
+                    except subprocess.TimeoutExpired:
+                        pass
+            except KeyboardInterrupt:
+                self.logger.info(f'Received ctrl-c, waiting for {tool} to exit...')
+                try:
+                    proc.wait(timeout=TERMINATE_TIMEOUT)
+                except subprocess.TimeoutExpired:
+                    self.logger.warning(f'{tool} did not exit within '
+                                        f'{TERMINATE_TIMEOUT} seconds. Terminating...')
+                    utils.terminate_process(proc.pid)
+                self._haltstep(flow, step, index, log=False)
+
+            for reader in readers:
+                reader.join(timeout=DRAIN_TIMEOUT)
+
+            sampler.finish()
+            return proc.returncode, sampler
+        finally:
+            for f in files:
+                f.close()
 
     def _run_executable_or_builtin(self, step, index, version, toolpath, workdir, run_func=None):
         '''
@@ -3227,8 +3491,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self.get('option', 'breakpoint', step=step, index=index)
         )
 
-        # TODO: Currently no memory usage tracking in breakpoints, builtins, or unexpected errors.
-        max_mem_bytes = 0
+        # TODO: Currently no resource usage tracking in breakpoints, builtins, or unexpected
+        # errors.
+        sampler = None
+        oom_kills = 0
 
         retcode = 0
         cmdlist = []
@@ -3301,88 +3567,45 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                                       ' Use [log|output|none].')
                     self._haltstep(flow, step, index)
 
-                with open(stdout_file, 'w') as stdout_writer, \
-                     open(stdout_file, 'r', errors='replace_with_warning') as stdout_reader, \
-                     open(stderr_file, 'w') as stderr_writer, \
-                     open(stderr_file, 'r', errors='replace_with_warning') as stderr_reader:
-                    # Use separate reader/writer file objects as hack to display
-                    # live output in non-blocking way, so we can monitor the
-                    # timeout. Based on https://stackoverflow.com/a/18422264.
-                    is_stdout_log = self.get('tool', tool, 'task', task, 'stdout', 'destination',
-                                             step=step, index=index) == 'log'
-                    is_stderr_log = stderr_destination == 'log' and stderr_file != stdout_file
-                    # if STDOUT and STDERR are to be redirected to the same file,
-                    # use a single writer
-                    if stderr_file == stdout_file:
-                        stderr_writer.close()
-                        stderr_reader.close()
-                        stderr_writer = subprocess.STDOUT
-
-                    preexec_fn = None
-                    nice = None
-                    if self.__is_posix():
-                        nice = self.get('option', 'nice', step=step, index=index)
-
-                        def set_nice():
-                            os.nice(nice)
-
-                        if nice:
-                            preexec_fn = set_nice
-
-                    cmd_start_time = time.time()
-                    proc = subprocess.Popen(cmdlist,
-                                            stdout=stdout_writer,
-                                            stderr=stderr_writer,
-                                            preexec_fn=preexec_fn)
-                    # How long to wait for proc to quit on ctrl-c before force
-                    # terminating.
-                    TERMINATE_TIMEOUT = 5
-                    POLL_INTERVAL = 0.1
-                    try:
-                        while proc.poll() is None:
-                            # Gather subprocess memory usage.
-                            try:
-                                pproc = psutil.Process(proc.pid)
-                                proc_mem_bytes = pproc.memory_full_info().uss
-                                for child in pproc.children(recursive=True):
-                                    proc_mem_bytes += child.memory_full_info().uss
-                                max_mem_bytes = max(max_mem_bytes, proc_mem_bytes)
-                            except psutil.Error:
-                                # Process may have already terminated or been killed.
-                                # Retain existing memory usage statistics in this case.
-                                pass
-                            except PermissionError:
-                                # OS is preventing access to this information so it cannot
-                                # be collected
-                                pass
-
-                            # Loop until process terminates
-                            self.__read_std_streams(quiet,
-                                                    is_stdout_log, stdout_reader,
-                                                    is_stderr_log, stderr_reader)
-
-                            if timeout is not None and time.time() - cmd_start_time > timeout:
-                                self.logger.error(f'Step timed out after {timeout} seconds')
-                                utils.terminate_process(proc.pid)
-                                self._haltstep(flow, step, index)
-                            time.sleep(POLL_INTERVAL)
-                    except KeyboardInterrupt:
-                        interrupt_time = time.time()
-                        self.logger.info(f'Received ctrl-c, waiting for {tool} to exit...')
-                        while proc.poll() is None and \
-                                (time.time() - interrupt_time) < TERMINATE_TIMEOUT:
-                            time.sleep(5 * POLL_INTERVAL)
-                        if proc.poll() is None:
-                            self.logger.warning(f'{tool} did not exit within {TERMINATE_TIMEOUT} '
-                                                'seconds. Terminating...')
-                            utils.terminate_process(proc.pid)
-                        self._haltstep(flow, step, index, log=False)
-
-                    # Read the remaining
-                    self.__read_std_streams(quiet,
-                                            is_stdout_log, stdout_reader,
-                                            is_stderr_log, stderr_reader)
-                    retcode = proc.returncode
+                log_follower = self.__start_log_scan(step, index, stdout_file, stderr_file, quiet)
+
+                stdout_echo = None
+                if stdout_destination == 'log' and not quiet:
+                    stdout_echo = output_stream.RateLimitedEcho(self.logger.info)
+                stderr_echo = None
+                if stderr_destination == 'log' and not quiet:
+                    stderr_echo = output_stream.RateLimitedEcho(self.logger.error)
+
+                node_cgroup = self.__create_cgroup(step, index)
+                try:
+                    retcode, sampler = self.__run_command(
+                        step, index, cmdlist, stdout_file, stderr_file,
+                        stdout_echo, stderr_echo, timeout,
+                        log_follower=log_follower,
+                        node_cgroup=node_cgroup)
+                    oom_kills = node_cgroup.get_oom_kills() if node_cgroup else 0
+                finally:
+                    if node_cgroup:
+                        try:
+                            node_cgroup.remove()
+                        except OSError as e:
+                            self.logger.warning(f'Unable to remove cgroup {node_cgroup.path}: {e}')
+
+                for echo in (stdout_echo, stderr_echo):
+                    if echo:
+                        echo.close()
+                if log_follower:
+                    self.__finish_log_scan(log_follower)
+
+        if oom_kills:
+            limit = self.get('option', 'scheduler', 'memory', step=step, index=index)
+            if retcode != 0:
+                self.logger.error(f'{tool} was killed for exceeding its memory limit of '
+                                  f'{limit}MB')
+                self.set('record', 'failure', 'oom', step=step, index=index)
+                self._haltstep(flow, step, index)
+            self.logger.warning(f'{oom_kills} processes of {tool} were killed for exceeding '
+                                f'the memory limit of {limit}MB')
 
         if retcode != 0:
             msg = f'Command failed with code {retcode}.'
@@ -3398,8 +3621,15 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self.logger.warning(msg)
             self._haltstep(flow, step, index)
 
-        # Capture memory usage
+        # Capture resource usage
+        max_mem_bytes = sampler.memory if sampler else 0
         self._record_metric(step, index, 'memory', max_mem_bytes, source=None, source_unit='B')
+        if sampler:
+            self._record_metric(step, index, 'cputime', sampler.cputime,
+                                source=None, source_unit='s')
+            self._record_metric(step, index, 'threads', sampler.threads, source=None)
+            self._record_metric(step, index, 'iobytes', sampler.iobytes,
+                                source=None, source_unit='B')
 
     def _post_process(self, step, index):
         flow = self.get('option', 'flow')
@@ -3418,10 +3648,17 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Check log file (must be after post-process)
         '''
         if (not self.get('option', 'skipall')) and (run_func is None):
-            log_file = os.path.join(self._getworkdir(step=step, index=index), f'{step}.log')
-            matches = self.check_logfile(step=step, index=index,
-                                         display=not quiet,
-                                         logfile=log_file)
+            scanner, self.__log_scanner = self.__log_scanner, None
+            if scanner:
+                # The log was already checked while the tool ran
+                matches = scanner.matches
+                for suffix in matches:
+                    self.logger.info(f'Number of {suffix}: {matches[suffix]}')
+            else:
+                log_file = os.path.join(self._getworkdir(step=step, index=index), f'{step}.log')
+                matches = self.check_logfile(step=step, index=index,
+                                             display=not quiet,
+                                             logfile=log_file)
             if 'errors' in matches:
                 errors = self.get('metric', 'errors', step=step, index=index)
                 if errors is None:
@@ -3485,6 +3722,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         self._init_logger(step, index, in_run=True)
 
+        # Record the parameters changed by this node, see _write_node_manifest()
+        self.schema._track_changes()
+
         # Make record of sc version and machine
         self.__record_version(step, index)
         # Record user information if enabled
@@ -3509,14 +3749,27 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if self.get('option', 'scheduler', 'name', step=step, index=index) and \
            self._get_flowgraph_node_inputs(flow, (step, index)):
             scheduler._defernode(self, step, index)
+            # The compute node recorded its changes against its own copy of
+            # the manifest, so only the full manifest can be merged back.
+            delta = os.path.join("outputs", f"{self.get('design')}.delta.pkg.json")
+            if os.path.exists(delta):
+                os.remove(delta)
         else:
-            self._executenode(step, index)
-            self._finalizenode(step, index, wall_start)
+            cache = self._executenode(step, index)
+            self._finalizenode(step, index, wall_start, cache=cache)
 
         # return to original directory
         os.chdir(cwd)
 
     def _executenode(self, step, index):
+        '''
+        Runs the task of a node.
+
+        Returns:
+            The key of the results of the task in the task cache and the
+            values the task recorded for the node, or None if the results
+            are not to be stored in the task cache.
+        '''
         workdir = self._getworkdir(step=step, index=index)
         flow = self.get('option', 'flow')
         tool, _ = self._get_tool_task(step, index, flow)
@@ -3530,6 +3783,17 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # Write manifest (tool interface) (Don't move this!)
         self.__write_task_manifest(tool)
 
+        # Only executables are cached, python tasks are fast to run
+        cache_key = None
+        if self.get('option', 'taskcache', step=step, index=index) and \
+                not run_func and not self.get('option', 'skipall'):
+            cache_key = task_cache.get_key(self, step, index, version)
+            # The results in the cache are already post-processed
+            if task_cache.restore(self, step, index, cache_key):
+                self.logger.info(f'Restored results of {tool} from the task cache')
+                return None
+            values = task_cache.get_node_values(self, step, index)
+
         # Start CPU Timer
         self.logger.debug("Starting executable")
         cpu_start = time.time()
@@ -3543,7 +3807,14 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         self._post_process(step, index)
 
-    def _finalizenode(self, step, index, wall_start):
+        if not cache_key:
+            return None
+        changed = {keypath: value
+                   for keypath, value in task_cache.get_node_values(self, step, index).items()
+                   if values.get(keypath) != value}
+        return cache_key, changed
+
+    def _finalizenode(self, step, index, wall_start, cache=None):
         flow = self.get('option', 'flow')
         tool, task = self._get_tool_task(step, index, flow)
         quiet = (
@@ -3565,7 +3836,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         # Save a successful manifest
         self.set('flowgraph', flow, step, index, 'status', NodeStatus.SUCCESS)
-        self.write_manifest(os.path.join("outputs", f"{self.get('design')}.pkg.json"))
+        self._write_node_manifest()
 
         # Stop if there are errors
         errors = self.get('metric', 'errors', step=step, index=index)
@@ -3574,6 +3845,10 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self.logger.error(f'{tool} reported {errors} errors during {step}{index}')
             self._haltstep(flow, step, index)
 
+        # Only successful results are cached
+        if cache:
+            task_cache.store(self, step, index, *cache)
+
         # Clean up non-essential files
         if self.get('option', 'clean'):
             self._eda_clean(tool, task, step, index)
@@ -3583,9 +3858,41 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if log:
             self.logger.error(f"Halting step '{step}' index '{index}' due to errors.")
         self.set('flowgraph', flow, step, index, 'status', NodeStatus.ERROR)
-        self.write_manifest(os.path.join("outputs", f"{self.get('design')}.pkg.json"))
+        self._write_node_manifest()
         sys.exit(1)
 
+    ###########################################################################
+    def _write_node_manifest(self):
+        '''
+        Writes the node manifests into the outputs directory of the current
+        working directory.
+
+        The full manifest is always written, in addition a delta manifest is
+        written with only the parameters changed by this node. The delta
+        manifest is much smaller and is preferred when merging the results
+        of a node, see _get_node_manifest().
+        '''
+        design = self.get('design')
+        self.write_manifest(os.path.join("outputs", f"{design}.pkg.json"))
+
+        changes = self.schema._changes()
+        if changes is not None:
+            with open(os.path.join("outputs", f"{design}.delta.pkg.json"), 'w') as f:
+                changes.write_json(f)
+
+    ###########################################################################
+    def _get_node_manifest(self, workdir):
+        '''
+        Returns the path to the manifest to merge from a node working directory,
+        preferring the delta manifest, or None if the node did not write one.
+        '''
+        design = self.get('design')
+        for manifest in (f"{design}.delta.pkg.json", f"{design}.pkg.json"):
+            path = os.path.join(workdir, 'outputs', manifest)
+            if os.path.isfile(path):
+                return path
+        return None
+
     ###########################################################################
     def _eda_clean(self, tool, task, step, index):
         '''Cleans up work directory of unnecessary files.
@@ -3682,11 +3989,16 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 if status:
                     stat_success = (status[(step, index)] == NodeStatus.SUCCESS)
                 elif os.path.isfile(lastcfg):
-                    schema = Schema(manifest=lastcfg)
-                    if schema.get('flowgraph', flow, step, index, 'status') == NodeStatus.SUCCESS:
+                    status_key = ('flowgraph', flow, step, index, 'status')
+                    schema = Schema(manifest=lastcfg, trusted=True, include=[status_key])
+                    if schema.get(*status_key) == NodeStatus.SUCCESS:
                         stat_success = True
-            if os.path.isfile(lastcfg):
-                self._read_manifest(lastcfg, clobber=False, partial=True)
+            if self.get('option', 'remote'):
+                mergecfg = lastcfg if os.path.isfile(lastcfg) else None
+            else:
+                mergecfg = self._get_node_manifest(lastdir)
+            if mergecfg:
+                self._read_manifest(mergecfg, clobber=False, partial=True, trusted=True)
 
             if stat_success:
                 # (Status doesn't get propagated w/ "clobber=False")
@@ -3743,7 +4055,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         # Reset flowgraph/records/metrics by probing build directory. We need
         # to set values to None for steps we may re-run so that merging
         # manifests from _runtask() actually updates values.
-        should_resume = self.get("option", 'resume')
+        should_resume = self.get("option", 'resume') or self.get('option', 'incremental')
         for (step, index) in self._get_flowgraph_nodes(flow):
             stepdir = self._getworkdir(step=step, index=index)
             cfg = f"{stepdir}/outputs/{self.get('design')}.pkg.json"
@@ -3753,15 +4065,11 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 # If stepdir doesn't exist, we need to re-run this task. If
                 # we're not running with -resume, we also re-run anything
                 # in the nodes to execute.
-                self.set('flowgraph', flow, step, index, 'status', None)
-
-                # Reset metrics and records
-                for metric in self.getkeys('metric'):
-                    self._clear_metric(step, index, metric)
-                for record in self.getkeys('record'):
-                    self._clear_record(step, index, record)
+                self._reset_node(flow, step, index)
             elif os.path.isfile(cfg):
-                node_status = Schema(manifest=cfg).get('flowgraph', flow, step, index, 'status')
+                status_key = ('flowgraph', flow, step, index, 'status')
+                schema = Schema(manifest=cfg, trusted=True, include=[status_key])
+                node_status = schema.get(*status_key)
                 self.set('flowgraph', flow, step, index, 'status', node_status)
             else:
                 self.set('flowgraph', flow, step, index, 'status', NodeStatus.ERROR)
@@ -3777,14 +4085,143 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 # had all indices fail.
                 for index in self.getkeys('flowgraph', flow, step):
                     if (step, index) in nodes_to_execute:
-                        self.set('flowgraph', flow, step, index, 'status', None)
-                        for metric in self.getkeys('metric'):
-                            self._clear_metric(step, index, metric)
-                        for record in self.getkeys('record'):
-                            self._clear_record(step, index, record)
+                        self._reset_node(flow, step, index)
+
+    def _reset_node(self, flow, step, index):
+        '''
+        Clears the status, metrics and records of a node that needs to run.
+        '''
+        self.set('flowgraph', flow, step, index, 'status', None)
+
+        # Reset metrics and records
+        for metric in self.getkeys('metric'):
+            self._clear_metric(step, index, metric)
+        for record in self.getkeys('record'):
+            self._clear_record(step, index, record)
+
+    def _get_task_keypaths(self, step, index):
+        '''
+        Returns the parameters the results of the task of a node depend on: the
+        configuration of its tool and task, and the parameters required by the
+        task. Each parameter is returned as a tuple of its keypath, and the step
+        and index to access its value for the node.
+        '''
+        tool, task = self._get_tool_task(step, index)
+
+        keypaths = []
+        for keypath in self.allkeys('tool', tool):
+            if 'default' in keypath or keypath[0] == 'task' and keypath[1] != task:
+                continue
+            keypaths.append(('tool', tool, *keypath))
+        for item in self.get('tool', tool, 'task', task, 'require', step=step, index=index):
+            keypaths.append(tuple(item.split(',')))
+
+        params = []
+        for keypath in keypaths:
+            if self.get(*keypath, field='pernode') == 'never':
+                params.append((keypath, None, None))
+            else:
+                params.append((keypath, step, index))
+        return params
+
+    def _get_dirty_reason(self, flow, step, index):
+        '''
+        Returns why a node that completed successfully needs to run again, or
+        None if its results are up to date.
+
+        The configuration of the node is compared to the one recorded in its
+        inputs manifest when it last ran, see _get_task_keypaths(). Files of
+        the node are considered changed if they were modified after it ran.
+        '''
+        manifest = os.path.join(self._getworkdir(step=step, index=index),
+                                'inputs', f'{self.design}.pkg.json')
+        if not os.path.isfile(manifest):
+            return 'no record of its previous configuration'
+        run_time = os.path.getmtime(manifest)
+
+        params = self._get_task_keypaths(step, index)
+        previous = Schema(manifest=manifest, logger=self.logger, trusted=True,
+                          include=[keypath for keypath, _, _ in params])
+
+        for keypath, value_step, value_index in params:
+            keypathstr = ','.join(keypath)
+            if not previous.valid(*keypath):
+                return f'[{keypathstr}] was added'
+            value = self.get(*keypath, step=value_step, index=value_index)
+            if value != previous.get(*keypath, step=value_step, index=value_index):
+                return f'[{keypathstr}] changed'
+
+            sctype = self.get(*keypath, field='type')
+            if 'file' in sctype or 'dir' in sctype:
+                paths = self._find_files(*keypath, missing_ok=True,
+                                         step=value_step, index=value_index)
+                if not isinstance(paths, list):
+                    paths = [paths]
+                for path in paths:
+                    if path and os.path.exists(path) and os.path.getmtime(path) > run_time:
+                        return f'{path} in [{keypathstr}] was modified'
+
+        return None
+
+    def _mark_dirty_nodes(self, flow, status):
+        '''
+        Marks the nodes to execute whose results are out of date as pending, along
+        with all the nodes that depend on them.
+
+        Returns:
+            Dictionary of the reason each pending node needs to run.
+        '''
+        reasons = {}
+        nodes_to_execute = self.nodes_to_execute(flow)
+        for layer_nodes in self._get_flowgraph_execution_order(flow):
+            for step, index in layer_nodes:
+                node = (step, index)
+                if node not in nodes_to_execute:
+                    continue
+
+                dirty_inputs = [f'{in_step}{in_index}' for in_step, in_index
+                                in self._get_pruned_node_inputs(flow, node)
+                                if (in_step, in_index) in reasons]
+                if status[node] != NodeStatus.SUCCESS:
+                    reason = 'it did not complete successfully'
+                elif dirty_inputs:
+                    reason = f'its inputs need to run: {", ".join(dirty_inputs)}'
+                else:
+                    reason = self._get_dirty_reason(flow, step, index)
+
+                if reason:
+                    reasons[node] = reason
+                    status[node] = NodeStatus.PENDING
+                    self._reset_node(flow, step, index)
+        return reasons
+
+    def _report_dry_run(self, flow, status, reasons):
+        '''
+        Logs which nodes would run, and why.
+        '''
+        to_run = []
+        up_to_date = []
+        failed = []
+        for step, index in self.nodes_to_execute(flow):
+            node = (step, index)
+            if status[node] == NodeStatus.PENDING:
+                to_run.append(f'{step}{index}: {reasons.get(node, "results are not reused")}')
+            elif status[node] == NodeStatus.SUCCESS:
+                up_to_date.append(f'{step}{index}')
+            else:
+                failed.append(f'{step}{index}')
+
+        self.logger.info(f'Dry run: {len(to_run)} node(s) would run')
+        for line in to_run:
+            self.logger.info(f'  {line}')
+        if up_to_date:
+            self.logger.info(f'Up to date: {", ".join(up_to_date)}')
+        if failed:
+            self.logger.info(f'Failed and not run again: {", ".join(failed)}')
 
     def clean_build_dir(self):
-        if not self.get('option', 'resume') and not self.get('arg', 'step') \
+        if not self.get('option', 'resume') and not self.get('option', 'incremental') \
+                and not self.get('arg', 'step') \
                 and not self.get('option', 'from') and not self.get('record', 'remoteid'):
             # If no step or nodes to start from were specified, the whole flow is being run
             # start-to-finish. Delete the build dir to clear stale results.
@@ -3792,13 +4229,18 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             if os.path.isdir(cur_job_dir):
                 shutil.rmtree(cur_job_dir)
 
-    def _prepare_nodes(self, nodes_to_run, processes, flow, status):
+    def _prepare_nodes(self, nodes_to_run, processes, flow, status, pool=None):
         '''
-        For each node to run, prepare a process and store its dependencies
+        For each node to run, prepare a process and store its dependencies.
+        If a worker pool is provided, nodes are run in its workers instead
+        of in a new process each.
         '''
         # Ensure we use spawn for multiprocessing so loggers initialized correctly
         jobname = self.get('option', 'jobname')
         multiprocessor = multiprocessing.get_context('spawn')
+        if pool:
+            pool.write_manifest(self)
+            multiprocessor = pool
         for (step, index) in self.nodes_to_execute(flow):
             node = (step, index)
             if status[node] != NodeStatus.PENDING:
@@ -3837,12 +4279,198 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 and self._is_builtin(tool, task) and not deps_was_successful.get(node):
             status[node] = NodeStatus.ERROR
 
-    def _launch_nodes(self, nodes_to_run, processes, status):
-        running_nodes = []
+    def _get_node_resources(self, flow, step, index):
+        '''
+        Returns the number of cores and the memory (in MB) a node needs on the
+        local machine.
+
+        Only the cores set in ['option', 'scheduler', 'cores'] are reserved.
+        Many tools set their threads to all the cores of the machine, so using
+        them as a reservation would run parallel branches one at a time.
+        '''
+        if self.get('option', 'scheduler', 'name', step=step, index=index) and \
+           self._get_flowgraph_node_inputs(flow, (step, index)):
+            # Node gets deferred to a compute node, see _runtask()
+            return 0, 0
+
+        cores = self.get('option', 'scheduler', 'cores', step=step, index=index)
+        memory = self.get('option', 'scheduler', 'memory', step=step, index=index)
+
+        return cores or 0, memory or 0
+
+    def _estimate_node_runtimes(self, flow):
+        '''
+        Returns the expected runtime in seconds of each node to execute, based on
+        the task runtimes recorded by previous runs. Nodes that have never been
+        run are omitted.
+
+        Runtimes are looked up in the job history first, then in the manifests
+        of the jobs in the build directory, most recent first.
+        '''
+        nodes = self.nodes_to_execute(flow)
+        runtimes = {}
+
+        def read_runtimes(schema):
+            for step, index in nodes:
+                if (step, index) in runtimes:
+                    continue
+                tasktime = schema.get('metric', 'tasktime', step=step, index=index)
+                if tasktime is not None:
+                    runtimes[(step, index)] = tasktime
+            return len(runtimes) == len(nodes)
+
+        for job in reversed(self.getkeys('history')):
+            if read_runtimes(self.schema.history(job)):
+                return runtimes
+
+        design_dir = os.path.dirname(self._getworkdir())
+        manifests = []
+        if os.path.isdir(design_dir):
+            for job in os.listdir(design_dir):
+                manifest = os.path.join(design_dir, job, f'{self.design}.pkg.json')
+                if os.path.isfile(manifest):
+                    manifests.append(manifest)
+        for manifest in sorted(manifests, key=os.path.getmtime, reverse=True):
+            schema = Schema(manifest=manifest, logger=self.logger, trusted=True,
+                            include=[('metric', 'tasktime')])
+            if read_runtimes(schema):
+                break
+
+        return runtimes
+
+    def _get_node_priorities(self, inputs, runtimes):
+        '''
+        Returns the expected runtime of the longest path from each node to the
+        end of the flowgraph, including the node itself.
+
+        Args:
+            inputs (dict): Input nodes of each node to run.
+            runtimes (dict): Expected runtime of nodes, see _estimate_node_runtimes().
+                Nodes without a runtime are assumed to take the average runtime.
+        '''
+        default_runtime = 1
+        if runtimes:
+            default_runtime = sum(runtimes.values()) / len(runtimes)
+
+        # Visit nodes after all the nodes that depend on them
+        order = []
+        outputs = {node: [] for node in inputs}
+        remaining_inputs = {}
+        for node, in_nodes in inputs.items():
+            in_nodes = [in_node for in_node in in_nodes if in_node in inputs]
+            remaining_inputs[node] = len(in_nodes)
+            for in_node in in_nodes:
+                outputs[in_node].append(node)
+        ready = [node for node, count in remaining_inputs.items() if count == 0]
+        while ready:
+            node = ready.pop()
+            order.append(node)
+            for out_node in outputs[node]:
+                remaining_inputs[out_node] -= 1
+                if remaining_inputs[out_node] == 0:
+                    ready.append(out_node)
+
+        priorities = {}
+        for node in reversed(order):
+            path = max((priorities[out_node] for out_node in outputs[node]), default=0)
+            priorities[node] = runtimes.get(node, default_runtime) + path
+        return priorities
+
+    def _report_schedule_efficiency(self, inputs, start_times, end_times):
+        '''
+        Logs how close the wall time of the nodes run was to the length of
+        their critical path, which is the shortest possible wall time.
+        '''
+        if not end_times:
+            return
+
+        walltime = max(end_times.values()) - min(start_times.values())
+
+        critical_path = {}
+        for node in sorted(end_times, key=lambda node: end_times[node]):
+            path = max((critical_path[in_node] for in_node in inputs[node]
+                        if in_node in critical_path), default=0)
+            critical_path[node] = path + end_times[node] - start_times[node]
+        critical_path = max(critical_path.values())
+
+        if walltime > 0:
+            self.logger.info(f'Schedule efficiency: {critical_path / walltime:.0%} '
+                             f'(critical path {critical_path:.2f}s, '
+                             f'wall time {walltime:.2f}s)')
+
+    def _launch_nodes(self, nodes_to_run, processes, status, runtimes=None, setup=None):
+        '''
+        Launches the node processes once their inputs are done and the
+        resources they need are available.
+
+        Args:
+            nodes_to_run (dict): Input nodes of each node to run.
+            processes (dict): Process of each node to run.
+            status (dict): Status of each node, which gets updated as nodes complete.
+            runtimes (dict): Expected runtimes of the nodes, see
+                _estimate_node_runtimes(). If provided, the nodes on the longest
+                remaining path are launched first.
+            setup (function): If provided, called with each node to set it up
+                before it gets launched, and returns False if the node cannot
+                run. Nodes are also set up in execution order while waiting
+                for the running nodes.
+        '''
+        flow = self.get('option', 'flow')
+
+        nodes_to_setup = []
+        if setup:
+            for layer_nodes in self._get_flowgraph_execution_order(flow):
+                nodes_to_setup.extend(node for node in layer_nodes if node in nodes_to_run)
+
+        # Nodes waiting on each node
+        dependents = {}
+        for node, deps in nodes_to_run.items():
+            for in_node in deps:
+                dependents.setdefault(in_node, []).append(node)
+
+        inputs = {node: list(deps) for node, deps in nodes_to_run.items()}
+        priorities = None
+        if runtimes is not None:
+            priorities = self._get_node_priorities(inputs, runtimes)
+        start_times = {}
+        end_times = {}
+
+        # Nodes are only started when the resources they need are available
+        maxnodes = self.get('option', 'scheduler', 'maxnodes')
+        max_cores = psutil.cpu_count() or 1
+        max_memory = psutil.virtual_memory().total // (1024 * 1024)
+        resources = {node: self._get_node_resources(flow, *node) for node in nodes_to_run
+                     if node not in nodes_to_setup}
+        used_cores = 0
+        used_memory = 0
+
+        running_nodes = {}
+        ready_nodes = []
         deps_was_successful = {}
-        while len(nodes_to_run) > 0 or len(running_nodes) > 0:
-            # Check for new nodes that can be launched.
-            for node, deps in list(nodes_to_run.items()):
+        # Nodes that need their dependencies checked, initially all of them.
+        # After that, only the nodes that depend on a node that just finished.
+        nodes_to_check = collections.deque(nodes_to_run)
+
+        def setup_node(node):
+            nodes_to_setup.remove(node)
+            if not setup(node):
+                status[node] = NodeStatus.ERROR
+                nodes_to_run.pop(node, None)
+                if node in ready_nodes:
+                    ready_nodes.remove(node)
+                nodes_to_check.extend(dependents.get(node, []))
+                return False
+            resources[node] = self._get_node_resources(flow, *node)
+            return True
+
+        while len(nodes_to_run) > 0 or len(ready_nodes) > 0 or len(running_nodes) > 0:
+            # Check for new nodes that are ready to be launched.
+            while nodes_to_check:
+                node = nodes_to_check.popleft()
+                if node not in nodes_to_run:
+                    continue
+                deps = nodes_to_run[node]
+
                 # TODO: breakpoint logic:
                 # if node is breakpoint, then don't launch while len(running_nodes) > 0
 
@@ -3850,15 +4478,41 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
                 if status[node] == NodeStatus.ERROR:
                     del nodes_to_run[node]
+                    nodes_to_check.extend(dependents.get(node, []))
                     continue
 
-                # If there are no dependencies left, launch this node and
+                # If there are no dependencies left, queue this node and
                 # remove from nodes_to_run.
                 if len(deps) == 0:
-                    processes[node].start()
-                    running_nodes.append(node)
+                    ready_nodes.append(node)
                     del nodes_to_run[node]
 
+            # Launch the queued nodes that fit in the available resources. A
+            # node is always launched if nothing else is running, even if it
+            # asks for more than the machine has.
+            if priorities:
+                ready_nodes.sort(key=lambda node: priorities[node], reverse=True)
+            for node in list(ready_nodes):
+                if node in nodes_to_setup and not setup_node(node):
+                    continue
+                cores, memory = resources[node]
+                if len(running_nodes) > 0:
+                    if maxnodes and len(running_nodes) >= maxnodes:
+                        break
+                    if used_cores + cores > max_cores or used_memory + memory > max_memory:
+                        continue
+
+                processes[node].start()
+                start_times[node] = time.time()
+                running_nodes[processes[node].sentinel] = node
+                ready_nodes.remove(node)
+                used_cores += cores
+                used_memory += memory
+
+            if nodes_to_check:
+                # Nodes failed to be set up, check the nodes that depend on them
+                continue
+
             # Check for situation where we have stuff left to run but don't
             # have any nodes running. This shouldn't happen, but we will get
             # stuck in an infinite loop if it does, so we want to break out
@@ -3867,19 +4521,29 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.error('Nodes left to run, but no '
                            'running nodes. From/to may be invalid.', fatal=True)
 
-            # Check for completed nodes.
-            # TODO: consider staying in this section of loop until a node
-            # actually completes.
-            for node in running_nodes.copy():
-                if not processes[node].is_alive():
-                    running_nodes.remove(node)
-                    if processes[node].exitcode > 0:
-                        status[node] = NodeStatus.ERROR
-                    else:
-                        status[node] = NodeStatus.SUCCESS
+            if len(running_nodes) == 0:
+                break
+
+            timeout = None
+            if nodes_to_setup:
+                # Set up the next node while the running nodes run
+                setup_node(nodes_to_setup[0])
+                timeout = 0
+
+            # Wait for at least one node to complete.
+            for sentinel in multiprocessing.connection.wait(list(running_nodes), timeout=timeout):
+                node = running_nodes.pop(sentinel)
+                processes[node].join()
+                end_times[node] = time.time()
+                used_cores -= resources[node][0]
+                used_memory -= resources[node][1]
+                if processes[node].exitcode > 0:
+                    status[node] = NodeStatus.ERROR
+                else:
+                    status[node] = NodeStatus.SUCCESS
+                nodes_to_check.extend(dependents.get(node, []))
 
-            # TODO: exponential back-off with max?
-            time.sleep(0.1)
+        self._report_schedule_efficiency(inputs, start_times, end_times)
 
     def _check_nodes_status(self, flow, status):
         def success(node):
@@ -3898,7 +4562,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             if status[node] != NodeStatus.PENDING:
                 self.set('flowgraph', flow, step, index, 'status', status[node])
 
-    def _local_process(self, flow, status):
+    def _local_process(self, flow, status, runtimes=None):
         # Populate status dict with any flowgraph status values that have already
         # been set.
         for (step, index) in self._get_flowgraph_nodes(flow):
@@ -3908,18 +4572,52 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             else:
                 status[(step, index)] = NodeStatus.PENDING
 
-        # Setup tools for all nodes to run.
         nodes_to_execute = self.nodes_to_execute(flow)
+
+        pool = None
+        if self.get('option', 'scheduler', 'pool') and not self.get('option', 'dryrun'):
+            # Start the workers first, so they get ready while nodes are set up
+            workers = self.get('option', 'scheduler', 'maxnodes') or psutil.cpu_count()
+            pool = WorkerPool(min(workers, len(nodes_to_execute)))
+
+        try:
+            self._local_process_nodes(flow, status, nodes_to_execute, runtimes, pool)
+        finally:
+            if pool:
+                pool.shutdown()
+
+        if not self.get('option', 'dryrun'):
+            self._check_nodes_status(flow, status)
+
+    def _local_process_nodes(self, flow, status, nodes_to_execute, runtimes, pool):
+        # With pipelining, the nodes to run are set up as they get launched,
+        # see _launch_nodes().
+        pipeline = self.get('option', 'scheduler', 'pipeline') and \
+            not self.get('option', 'incremental') and not self.get('option', 'dryrun')
+
+        # Setup tools for all nodes to run.
+        nodes_setup = []
         for layer_nodes in self._get_flowgraph_execution_order(flow):
             for step, index in layer_nodes:
-                if (step, index) in nodes_to_execute:
-                    self._setup_node(step, index)
+                node = (step, index)
+                if node not in nodes_to_execute:
+                    continue
+                if pipeline and status[node] == NodeStatus.PENDING:
+                    continue
+                self._setup_node(step, index)
+                nodes_setup.append(node)
 
         # Check validity of setup
         self.logger.info("Checking manifest before running.")
         check_ok = True
         if not self.get('option', 'skipcheck'):
-            check_ok = self.check_manifest()
+            if pipeline:
+                check_ok = self._check_manifest_global()
+                for step, index in nodes_setup:
+                    if not self._check_node_setup(flow, step, index):
+                        check_ok = False
+            else:
+                check_ok = self.check_manifest()
 
         # Check if there were errors before proceeding with run
         if not check_ok:
@@ -3927,11 +4625,50 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if self._error:
             self.error('Implementation errors encountered. See previous errors.', fatal=True)
 
+        reasons = {}
+        if self.get('option', 'incremental'):
+            reasons = self._mark_dirty_nodes(flow, status)
+        if self.get('option', 'dryrun'):
+            self._report_dry_run(flow, status, reasons)
+            return
+
         nodes_to_run = {}
         processes = {}
-        self._prepare_nodes(nodes_to_run, processes, flow, status)
-        self._launch_nodes(nodes_to_run, processes, status)
-        self._check_nodes_status(flow, status)
+        self._prepare_nodes(nodes_to_run, processes, flow, status, pool=pool)
+
+        setup = None
+        if pipeline:
+            def setup_pipelined_node(node):
+                return self._setup_pipelined_node(flow, node, nodes_to_execute, pool)
+            setup = setup_pipelined_node
+        self._launch_nodes(nodes_to_run, processes, status, runtimes=runtimes, setup=setup)
+
+    def _setup_pipelined_node(self, flow, node, nodes_to_execute, pool):
+        '''
+        Sets up and checks a node right before it is launched.
+
+        Returns:
+            False if the node cannot run.
+        '''
+        step, index = node
+        try:
+            self._setup_node(step, index)
+        except Exception as e:
+            self.logger.error(f'Failed to set up {step}{index}: {e}')
+            return False
+        if self._error:
+            # Only this node is affected
+            self._error = False
+            self.logger.error(f'Failed to set up {step}{index}. See previous errors.')
+            return False
+
+        if pool:
+            pool.schema_changed(self)
+
+        if self.get('option', 'skipcheck'):
+            return True
+        return self._check_node_setup(flow, step, index) and \
+            self._check_node_io(flow, step, index, nodes_to_execute)
 
     ###########################################################################
     def run(self):
@@ -3972,7 +4709,14 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 self.error(f"{key} must be set before calling run()",
                            fatal=True)
 
-        self._increment_job_name()
+        dryrun = self.get('option', 'dryrun')
+        if dryrun and self.get('option', 'remote'):
+            self.error("['option', 'dryrun'] is not supported with ['option', 'remote']",
+                       fatal=True)
+
+        # A dry run reports on the current job, so it does not start a new one
+        if not dryrun:
+            self._increment_job_name()
 
         # Re-init logger to include run info after setting up flowgraph.
         self._init_logger(in_run=True)
@@ -3983,7 +4727,13 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
             self.error(f"{flow} flowgraph contains errors and cannot be run.",
                        fatal=True)
 
-        self.clean_build_dir()
+        runtimes = None
+        if self.get('option', 'scheduler', 'policy') == 'criticalpath':
+            # Collect previous runtimes before the build directory gets cleaned
+            runtimes = self._estimate_node_runtimes(flow)
+
+        if not dryrun:
+            self.clean_build_dir()
         self._reset_flow_nodes(flow, self.nodes_to_execute(flow))
 
         # Save current environment
@@ -3997,7 +4747,12 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         if self.get('option', 'remote'):
             client.remote_process(self)
         else:
-            self._local_process(flow, status)
+            self._local_process(flow, status, runtimes=runtimes)
+
+        if dryrun:
+            os.environ.clear()
+            os.environ.update(environment)
+            return
 
         # Merge cfgs from last executed tasks, and write out a final manifest.
         self._finalize_run(set(self._get_execution_exit_nodes(flow)), environment, status)
@@ -4018,38 +4773,6 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 return False
         return True
 
-    def _nodes_to_execute(self, flow, from_nodes, to_nodes, prune_nodes):
-        '''
-        Assumes a flowgraph with valid edges for the inputs
-        '''
-        nodes_to_execute = []
-        for from_node in from_nodes:
-            for node in self._nodes_to_execute_recursive(flow, from_node, to_nodes, prune_nodes):
-                if node not in nodes_to_execute:
-                    nodes_to_execute.append(node)
-        return nodes_to_execute
-
-    def _nodes_to_execute_recursive(self, flow, from_node, to_nodes, prune_nodes, path=[]):
-        path = path.copy()
-        nodes_to_execute = []
-
-        if from_node in prune_nodes:
-            return []
-        if from_node in path:
-            raise SiliconCompilerError(f'Path {path} would form a circle with {from_node}')
-        path.append(from_node)
-
-        if from_node in to_nodes:
-            for node in path:
-                nodes_to_execute.append(node)
-        for output_node in self._get_flowgraph_node_outputs(flow, from_node):
-            for node in self._nodes_to_execute_recursive(flow, output_node, to_nodes,
-                                                         prune_nodes, path=path):
-                if node not in nodes_to_execute:
-                    nodes_to_execute.append(node)
-
-        return nodes_to_execute
-
     ###########################################################################
     def nodes_to_execute(self, flow=None):
         '''
@@ -4070,9 +4793,9 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         prune_nodes = self.get('option', 'prune')
         if from_nodes == to_nodes:
             return list(filter(lambda node: node not in prune_nodes, from_nodes))
-        return self._nodes_to_execute(flow, set(from_nodes), set(to_nodes), set(prune_nodes))
+        return self._get_flowgraph(flow).get_nodes_to_execute(from_nodes, to_nodes, prune_nodes)
 
-    def _unreachable_steps_to_execute(self, flow, cond=lambda _: True):
+    def _unreachable_steps_to_execute(self, flow, cond=None):
         from_nodes = set(self._get_execution_entry_nodes(flow))
         to_nodes = set(self._get_execution_exit_nodes(flow))
         prune_nodes = self.get('option', 'prune')
@@ -4085,27 +4808,12 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                 unreachable_steps.add(unreachable_node[0])
         return unreachable_steps
 
-    def _reachable_flowgraph_nodes(self, flow, from_nodes, cond=lambda _: True, prune_nodes=[]):
-        visited_nodes = set()
-        current_nodes = from_nodes.copy()
-        while current_nodes:
-            current_nodes_copy = current_nodes.copy()
-            for current_node in current_nodes_copy:
-                if current_node in prune_nodes:
-                    current_nodes.remove(current_node)
-                    continue
-                if cond(current_node):
-                    visited_nodes.add(current_node)
-                    current_nodes.remove(current_node)
-                    outputs = self._get_flowgraph_node_outputs(flow, current_node)
-                    current_nodes.update(outputs)
-            if current_nodes == current_nodes_copy:
-                break
-        return visited_nodes
+    def _reachable_flowgraph_nodes(self, flow, from_nodes, cond=None, prune_nodes=[]):
+        return self._get_flowgraph(flow).get_reachable_nodes(from_nodes, prune_nodes=prune_nodes,
+                                                             cond=cond)
 
     def _get_flowgraph_node_inputs(self, flow, node):
-        step, index = node
-        return self.get('flowgraph', flow, step, index, 'input')
+        return self._get_flowgraph(flow).get_inputs(node)
 
     def _get_pruned_flowgraph_nodes(self, flow, prune_nodes):
         # Ignore option from/to, we want reachable nodes of the whole flowgraph
@@ -4119,15 +4827,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
                            self._get_flowgraph_node_inputs(flow, node)))
 
     def _get_flowgraph_node_outputs(self, flow, node):
-        node_outputs = []
-
-        iter_nodes = self._get_flowgraph_nodes(flow)
-        for iter_node in iter_nodes:
-            iter_node_inputs = self._get_flowgraph_node_inputs(flow, iter_node)
-            if node in iter_node_inputs:
-                node_outputs.append(iter_node)
-
-        return node_outputs
+        return self._get_flowgraph(flow).get_outputs(node)
 
     ###########################################################################
     def show(self, filename=None, screenshot=False, extension=None):
@@ -4559,16 +5259,30 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         '''
         return tool == 'builtin'
 
-    def _get_flowgraph_nodes(self, flow, steps=None, indices=None):
+    def _get_flowgraph(self, flow):
+        '''
+        Returns the graph of the nodes of a flow. The graph is built once and
+        reused until the nodes or edges of the flowgraph are modified.
+        '''
+        version = self.schema._flowgraph_version()
+        if flow in self.__flowgraphs:
+            graph_version, graph = self.__flowgraphs[flow]
+            if graph_version == version:
+                return graph
+
         nodes = []
         for step in self.getkeys('flowgraph', flow):
-            if steps and step not in steps:
-                continue
             for index in self.getkeys('flowgraph', flow, step):
-                if indices and index not in indices:
-                    continue
                 nodes.append((step, index))
-        return nodes
+        inputs = {(step, index): self.get('flowgraph', flow, step, index, 'input')
+                  for step, index in nodes}
+
+        graph = FlowGraph(nodes, inputs)
+        self.__flowgraphs[flow] = (version, graph)
+        return graph
+
+    def _get_flowgraph_nodes(self, flow, steps=None, indices=None):
+        return self._get_flowgraph(flow).get_nodes(steps=steps, indices=indices)
 
     #######################################
     def _get_execution_entry_nodes(self, flow):
@@ -4587,11 +5301,7 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Collect all step/indices that represent the entry
         nodes for the flowgraph
         '''
-        nodes = []
-        for (step, index) in self._get_flowgraph_nodes(flow, steps=steps):
-            if not self._get_flowgraph_node_inputs(flow, (step, index)):
-                nodes.append((step, index))
-        return nodes
+        return self._get_flowgraph(flow).get_entry_nodes(steps=steps)
 
     def _get_execution_exit_nodes(self, flow):
         if self.get('arg', 'step') and self.get('arg', 'index'):
@@ -4610,58 +5320,14 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
         Collect all step/indices that represent the exit
         nodes for the flowgraph
         '''
-        inputnodes = []
-        for (step, index) in self._get_flowgraph_nodes(flow, steps=steps):
-            inputnodes.extend(self._get_flowgraph_node_inputs(flow, (step, index)))
-        nodes = []
-        for (step, index) in self._get_flowgraph_nodes(flow, steps=steps):
-            if (step, index) not in inputnodes:
-                nodes.append((step, index))
-        return nodes
+        return self._get_flowgraph(flow).get_exit_nodes(steps=steps)
 
     #######################################
     def _get_flowgraph_execution_order(self, flow, reverse=False):
         '''
         Generates a list of nodes in the order they will be executed.
         '''
-
-        # Generate execution edges lookup map
-        ex_map = {}
-        for step, index in self._get_flowgraph_nodes(flow):
-            for istep, iindex in self._get_flowgraph_node_inputs(flow, (step, index)):
-                if reverse:
-                    ex_map.setdefault((step, index), set()).add((istep, iindex))
-                else:
-                    ex_map.setdefault((istep, iindex), set()).add((step, index))
-
-        # Collect execution order of nodes
-        if reverse:
-            order = [set(self._get_flowgraph_exit_nodes(flow))]
-        else:
-            order = [set(self._get_flowgraph_entry_nodes(flow))]
-
-        while True:
-            next_level = set()
-            for step, index in order[-1]:
-                if (step, index) in ex_map:
-                    next_level.update(ex_map.pop((step, index)))
-
-            if not next_level:
-                break
-
-            order.append(next_level)
-
-        # Filter duplicates from flow
-        used_nodes = set()
-        exec_order = []
-        order.reverse()
-        for n, level_nodes in enumerate(order):
-            exec_order.append(list(level_nodes.difference(used_nodes)))
-            used_nodes.update(level_nodes)
-
-        exec_order.reverse()
-
-        return exec_order
+        return self._get_flowgraph(flow).get_execution_order(reverse=reverse)
 
     #######################################
     def _getcollectdir(self, jobname=None):
@@ -4934,6 +5600,8 @@ If you are sure that your working directory is valid, try running `cd $(pwd)`.""
 
         # Modules are not serializable, so save without cache
         attributes['modules'] = {}
+        attributes['_Chip__flowgraphs'] = {}
+        attributes['_Chip__log_scanner'] = None
 
         # We have to remove the chip's logger before serializing the object
         # since the logger object is not serializable.
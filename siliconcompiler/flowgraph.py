@@ -0,0 +1,185 @@
+from siliconcompiler._common import SiliconCompilerError
+
+
+class FlowGraph:
+    '''
+    Graph of the nodes of a flow, built once from the 'input' parameters of
+    the flowgraph so that successors, entry and exit nodes, and nodes that
+    can be reached from other nodes do not need to be computed from the
+    schema each time they are needed.
+
+    The graph is only valid as long as the nodes and edges of the flow are
+    not modified, see Chip._get_flowgraph().
+
+    Args:
+        nodes (list of tuple): (step, index) of the nodes of the flow.
+        inputs (dict): Maps each node to the list of its input nodes.
+    '''
+
+    def __init__(self, nodes, inputs):
+        self.__nodes = list(nodes)
+        self.__inputs = {node: list(inputs[node]) for node in self.__nodes}
+
+        self.__outputs = {}
+        for node in self.__nodes:
+            for input_node in self.__inputs[node]:
+                self.__outputs.setdefault(input_node, []).append(node)
+
+        self.__execution_order = {}
+        self.__reachable = {}
+
+    def get_nodes(self, steps=None, indices=None):
+        '''Returns the nodes of the flow, optionally limited to steps and indices.'''
+        return [(step, index) for step, index in self.__nodes
+                if (not steps or step in steps) and (not indices or index in indices)]
+
+    def get_inputs(self, node):
+        '''Returns the input nodes of a node.'''
+        return list(self.__inputs.get(node, []))
+
+    def get_outputs(self, node):
+        '''Returns the nodes that have node as input.'''
+        return list(self.__outputs.get(node, []))
+
+    def get_entry_nodes(self, steps=None):
+        '''Returns the nodes without inputs.'''
+        return [node for node in self.get_nodes(steps=steps) if not self.__inputs[node]]
+
+    def get_exit_nodes(self, steps=None):
+        '''Returns the nodes which are not an input of any other node of steps.'''
+        nodes = self.get_nodes(steps=steps)
+        input_nodes = set()
+        for node in nodes:
+            input_nodes.update(self.__inputs[node])
+        return [node for node in nodes if node not in input_nodes]
+
+    def get_execution_order(self, reverse=False):
+        '''
+        Returns the nodes grouped in levels, in the order they will be
+        executed. Each node is placed in the level after the last of its
+        inputs (or outputs if reverse is True).
+        '''
+        if reverse not in self.__execution_order:
+            self.__execution_order[reverse] = self.__compute_execution_order(reverse)
+        return [list(level_nodes) for level_nodes in self.__execution_order[reverse]]
+
+    def __compute_execution_order(self, reverse):
+        # Generate execution edges lookup map
+        ex_map = {}
+        for node in self.__nodes:
+            for input_node in self.__inputs[node]:
+                if reverse:
+                    ex_map.setdefault(node, set()).add(input_node)
+                else:
+                    ex_map.setdefault(input_node, set()).add(node)
+
+        # Collect execution order of nodes
+        if reverse:
+            order = [set(self.get_exit_nodes())]
+        else:
+            order = [set(self.get_entry_nodes())]
+
+        while True:
+            next_level = set()
+            for node in order[-1]:
+                if node in ex_map:
+                    next_level.update(ex_map.pop(node))
+
+            if not next_level:
+                break
+
+            order.append(next_level)
+
+        # Filter duplicates from flow
+        used_nodes = set()
+        exec_order = []
+        order.reverse()
+        for level_nodes in order:
+            exec_order.append(list(level_nodes.difference(used_nodes)))
+            used_nodes.update(level_nodes)
+
+        exec_order.reverse()
+
+        return exec_order
+
+    def get_reachable_nodes(self, from_nodes, prune_nodes=(), cond=None):
+        '''
+        Returns the set of nodes that can be reached from from_nodes without
+        going through prune_nodes, or through nodes for which cond returns
+        False. Results without cond are cached.
+        '''
+        key = None
+        if cond is None:
+            key = (frozenset(from_nodes), frozenset(prune_nodes))
+            if key in self.__reachable:
+                return set(self.__reachable[key])
+
+        reachable = self.__walk(from_nodes, self.__outputs, prune_nodes, cond)
+
+        if key is not None:
+            self.__reachable[key] = frozenset(reachable)
+        return reachable
+
+    def get_nodes_to_execute(self, from_nodes, to_nodes, prune_nodes=()):
+        '''
+        Returns the nodes that are on a path from one of from_nodes to one of
+        to_nodes which does not go through prune_nodes, ordered from the
+        inputs to the outputs.
+        '''
+        prune_nodes = set(prune_nodes)
+
+        # A node is on such a path if it can be reached from from_nodes and
+        # to_nodes can be reached from it.
+        downstream = self.__walk(from_nodes, self.__outputs, prune_nodes, None)
+        upstream = self.__walk(to_nodes, self.__inputs, prune_nodes, None)
+        selected = downstream.intersection(upstream)
+
+        self.__check_loops(selected)
+
+        # Depth first, so nodes are listed along the paths they are on
+        nodes_to_execute = []
+        visited = set()
+        for from_node in from_nodes:
+            stack = [from_node]
+            while stack:
+                node = stack.pop()
+                if node in visited or node not in selected:
+                    continue
+                visited.add(node)
+                nodes_to_execute.append(node)
+                stack.extend(reversed(self.__outputs.get(node, [])))
+        return nodes_to_execute
+
+    def __check_loops(self, nodes):
+        # Remove nodes without inputs in nodes until none are left, anything
+        # remaining is part of a loop.
+        remaining = {node: {input_node for input_node in self.__inputs.get(node, [])
+                            if input_node in nodes}
+                     for node in nodes}
+        ready = [node for node, node_inputs in remaining.items() if not node_inputs]
+        while ready:
+            node = ready.pop()
+            del remaining[node]
+            for output_node in self.__outputs.get(node, []):
+                if output_node in remaining and node in remaining[output_node]:
+                    remaining[output_node].remove(node)
+                    if not remaining[output_node]:
+                        ready.append(output_node)
+
+        if remaining:
+            loop = ', '.join(f'{step}{index}' for step, index in sorted(remaining))
+            raise SiliconCompilerError(f'Nodes {loop} would form a circle')
+
+    @staticmethod
+    def __walk(start_nodes, edges, prune_nodes, cond):
+        visited = set()
+        stack = list(start_nodes)
+        while stack:
+            node = stack.pop()
+            if node in visited or node in prune_nodes:
+                continue
+            if cond is not None and not cond(node):
+                continue
+            visited.add(node)
+            stack.extend(edges.get(node, []))
+        return visited
@@ -0,0 +1,266 @@
+import os
+import re
+
+# Grep options understood by GrepPattern.
+GREP_OPTIONS = ('-v', '-i', '-E', '-e', '-x', '-o', '-w')
+
+
+class GrepPattern:
+    '''
+    Grep-style pattern, parsed and compiled once.
+
+    The arguments are a pattern, optionally preceded by grep options. The
+    supported options are:
+
+    * -v: Select lines that do not match the pattern.
+    * -i: Ignore case distinctions.
+    * -x: Only match the whole line.
+    * -w: Only match whole words.
+    * -e: Use the rest of the arguments as the pattern, even if it starts
+      with '-'.
+    * -E: Extended regular expressions, which is always the case.
+    * -o: Accepted, but matching lines are returned as a whole.
+
+    Args:
+        args (str): Grep arguments, ie. '-v -i warning'.
+        logger (logging.Logger): Logger used to report unknown options.
+    '''
+
+    def __init__(self, args, logger=None):
+        options = set()
+
+        # Split into repeating switches and everything else
+        match = re.match(r'\s*((?:\-\w\s)*)(.*)', args)
+        pattern = match.group(2)
+        switches = match.group(1).split()
+
+        for i, switch in enumerate(switches):
+            if switch == '-e':
+                # Everything after -e is part of the pattern
+                pattern = ' '.join([*switches[i + 1:], pattern])
+                break
+            if switch in GREP_OPTIONS:
+                options.add(switch)
+            elif logger:
+                logger.error(switch)
+
+        self.invert = '-v' in options
+
+        if '-w' in options:
+            pattern = rf'(?<!\w)(?:{pattern})(?!\w)'
+        if '-x' in options:
+            pattern = rf'^(?:{pattern})$'
+        if '-i' in options:
+            pattern = rf'(?i:{pattern})'
+        else:
+            pattern = f'(?:{pattern})'
+
+        #: Regular expression with the options applied, which can be combined
+        #: with other patterns.
+        self.pattern = pattern
+        self.regex = re.compile(pattern)
+
+    def matches(self, line):
+        '''Returns True if the line is selected by the pattern.'''
+        return (self.regex.search(line) is None) == self.invert
+
+
+_GREP_PATTERNS = {}
+
+
+def get_grep_pattern(args, logger=None):
+    '''
+    Returns the GrepPattern of grep arguments, compiling it only the first
+    time the arguments are seen.
+    '''
+    try:
+        return _GREP_PATTERNS[args]
+    except KeyError:
+        pattern = GrepPattern(args, logger=logger)
+        _GREP_PATTERNS[args] = pattern
+        return pattern
+
+
+class LogScanner:
+    '''
+    Scans the lines of a log for several checks in a single pass.
+
+    Each check is a chain of grep arguments, see GrepPattern: a line matches
+    the check if it is selected by every grep of the chain. Matching lines are
+    written to the report of the check as they are found, prefixed with their
+    line number.
+
+    Most lines of a log match none of the checks, so the first non-inverted
+    pattern of every check is combined into a single regular expression: a
+    line that does not match it is skipped without evaluating each check.
+    Patterns with groups are not combined, since combining them would
+    renumber their groups and break their backreferences. The first
+    patterns are then searched one by one instead.
+
+    Args:
+        checks (dict): Maps the name of each check to its list of grep
+            arguments.
+        reports (dict): Maps the name of each check to the path of its report.
+        logger (logging.Logger): Logger used to report invalid grep options.
+        callback (function): Called with the name of the check and the line,
+            prefixed with its line number, each time a line matches a check.
+    '''
+
+    def __init__(self, checks, reports, logger=None, callback=None):
+        self.__chains = {name: [get_grep_pattern(args, logger=logger) for args in chain]
+                         for name, chain in checks.items()}
+        self.__reports = dict(reports)
+        self.__files = {}
+        self.__callback = callback
+        self.matches = {name: 0 for name in self.__chains}
+        self.lines = 0
+
+        self.__prefilter = None
+        required = []
+        for chain in self.__chains.values():
+            positive = [grep for grep in chain if not grep.invert]
+            if not positive:
+                # This check can match any line
+                required = None
+                break
+            required.append(positive[0])
+        if required:
+            if any(grep.regex.groups for grep in required):
+                regexes = [grep.regex for grep in required]
+
+                def prefilter(line):
+                    return any(regex.search(line) for regex in regexes)
+                self.__prefilter = prefilter
+            else:
+                try:
+                    self.__prefilter = re.compile(
+                        '|'.join(grep.pattern for grep in required)).search
+                except re.error:
+                    self.__prefilter = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        '''Opens the reports, which is done when entering the scanner.'''
+        for name in self.__chains:
+            self.__files[name] = open(self.__reports[name], 'w')
+
+    def close(self):
+        '''Closes the reports.'''
+        for f in self.__files.values():
+            f.close()
+        self.__files = {}
+
+    def scan_line(self, line):
+        '''
+        Checks the next line of the log.
+
+        Returns:
+            List of the names of the checks the line matched.
+        '''
+        self.lines += 1
+        if self.__prefilter and not self.__prefilter(line):
+            return []
+
+        matched = []
+        for name, chain in self.__chains.items():
+            for grep in chain:
+                if not grep.matches(line):
+                    break
+            else:
+                self.matches[name] += 1
+                matched.append(name)
+                line_with_num = f'{self.lines}: {line.strip()}'
+                print(line_with_num, file=self.__files[name])
+                if self.__callback:
+                    self.__callback(name, line_with_num)
+        return matched
+
+    def scan(self, f):
+        '''Checks all the lines of a file object.'''
+        scan_line = self.scan_line
+        for line in f:
+            scan_line(line)
+
+    def align_reports(self, callback=None):
+        '''
+        Right aligns the line numbers of the reports to the number of lines
+        scanned. Since the reports only hold the matching lines, this is cheap
+        compared to counting the lines of the log beforehand.
+
+        Args:
+            callback (function): Called with the name of the check and each
+                aligned line of its report, ie. to display the matches.
+        '''
+        self.close()
+
+        right_align = len(str(self.lines))
+        for name, path in self.__reports.items():
+            if not self.matches.get(name):
+                continue
+            unaligned = f'{path}.unaligned'
+            os.replace(path, unaligned)
+            with open(unaligned) as fin, open(path, 'w') as fout:
+                for line in fin:
+                    num, text = line.rstrip('\n').split(':', 1)
+                    line = f'{num: >{right_align}}:{text}'
+                    print(line, file=fout)
+                    if callback:
+                        callback(name, line)
+            os.remove(unaligned)
+
+
+class LogFollower:
+    '''
+    Checks a log with a LogScanner while it is being written, ie. by a tool
+    that is still running. Only complete lines are checked until finish()
+    is called.
+
+    Args:
+        path (str): Path of the log. It does not need to exist yet.
+        scanner (LogScanner): Scanner the lines of the log are fed to.
+    '''
+
+    # Maximum amount of the log read at once.
+    READ_SIZE = 1024 * 1024
+
+    def __init__(self, path, scanner):
+        self.__path = path
+        self.__file = None
+        self.__pending = ''
+        self.scanner = scanner
+
+    def poll(self):
+        '''Checks the lines written to the log since the last call.'''
+        if self.__file is None:
+            try:
+                self.__file = open(self.__path, errors='ignore_with_warning')
+            except FileNotFoundError:
+                return
+
+        while True:
+            data = self.__file.read(self.READ_SIZE)
+            if not data:
+                break
+            lines = (self.__pending + data).split('\n')
+            self.__pending = lines.pop()
+            for line in lines:
+                self.scanner.scan_line(line + '\n')
+
+    def finish(self):
+        '''
+        Checks the rest of the log, including a last line without a newline,
+        and closes the log. The reports of the scanner are left open.
+        '''
+        self.poll()
+        if self.__pending:
+            self.scanner.scan_line(self.__pending)
+            self.__pending = ''
+        if self.__file:
+            self.__file.close()
+            self.__file = None
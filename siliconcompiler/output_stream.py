@@ -0,0 +1,150 @@
+import locale
+import os
+import subprocess
+import threading
+import time
+
+# Size of the chunks read from the output pipes of a command.
+READ_SIZE = 64 * 1024
+# Longest line passed to the callbacks. Longer lines are split, so that the
+# output of a command that never writes a newline is not buffered forever.
+MAX_LINE_SIZE = 64 * 1024
+# Number of lines echoed to the console at most every ECHO_INTERVAL seconds.
+ECHO_LINES = 100
+ECHO_INTERVAL = 1
+
+
+def open_output(path, files):
+    '''
+    Returns the stream argument of a command for an output written to path,
+    and the file the output pipe is copied to. Opened files are added to
+    files.
+    '''
+    if path == os.devnull:
+        return subprocess.DEVNULL, None
+
+    writer = open(path, 'wb')
+    files.append(writer)
+    return subprocess.PIPE, writer
+
+
+class LineSplitter:
+    '''
+    Splits the data read from an output pipe into decoded lines.
+
+    Args:
+        callback (function): Called with each line, without its newline.
+    '''
+
+    def __init__(self, callback):
+        self.__callback = callback
+        self.__encoding = locale.getpreferredencoding(False)
+        self.__pending = b''
+
+    def feed(self, data):
+        '''Passes the complete lines of data to the callback.'''
+        lines = (self.__pending + data).split(b'\n')
+        self.__pending = lines.pop()
+        for line in lines:
+            self.__emit(line)
+
+        # Lines longer than MAX_LINE_SIZE are passed in parts
+        while len(self.__pending) > MAX_LINE_SIZE:
+            self.__emit(self.__pending[:MAX_LINE_SIZE])
+            self.__pending = self.__pending[MAX_LINE_SIZE:]
+
+    def close(self):
+        '''Passes the last line to the callback, if it has no newline.'''
+        if self.__pending:
+            self.__emit(self.__pending)
+            self.__pending = b''
+
+    def __emit(self, line):
+        for start in range(0, max(len(line), 1), MAX_LINE_SIZE):
+            part = line[start:start + MAX_LINE_SIZE]
+            self.__callback(part.decode(self.__encoding, errors='replace_with_warning').rstrip())
+
+
+class RateLimitedEcho:
+    '''
+    Echoes the lines of a command to the console, at most max_lines every
+    interval seconds, so that a chatty command does not spend its time
+    waiting on the console. Lines over the limit are only counted, the
+    count is echoed once lines are echoed again and when closed. The log
+    files always get the complete output.
+
+    Args:
+        callback (function): Called with each line echoed, ie. logger.info.
+        max_lines (int): Number of lines echoed at most every interval.
+        interval (float): Number of seconds of an interval.
+    '''
+
+    def __init__(self, callback, max_lines=ECHO_LINES, interval=ECHO_INTERVAL):
+        self.__callback = callback
+        self.__max_lines = max_lines
+        self.__interval = interval
+        self.__interval_start = time.monotonic()
+        self.__lines = 0
+        self.__skipped = 0
+
+    def __call__(self, line):
+        now = time.monotonic()
+        if now - self.__interval_start >= self.__interval:
+            self.__report_skipped()
+            self.__interval_start = now
+            self.__lines = 0
+
+        if self.__lines < self.__max_lines:
+            self.__lines += 1
+            self.__callback(line)
+        else:
+            self.__skipped += 1
+
+    def close(self):
+        '''Echoes the number of lines that were not echoed.'''
+        self.__report_skipped()
+
+    def __report_skipped(self):
+        if self.__skipped:
+            self.__callback(f'... {self.__skipped} lines not displayed, see the log file')
+            self.__skipped = 0
+
+
+def start_reader(pipe, writer, callback=None):
+    '''
+    Starts a thread that copies an output pipe of a command to a file as
+    data comes in.
+
+    Args:
+        pipe (file): Output pipe of the command.
+        writer (file): Binary file the output is written to.
+        callback (function): Called with each line of the output.
+
+    Returns:
+        The thread, which ends when the pipe or the file is closed.
+    '''
+    def read():
+        splitter = LineSplitter(callback) if callback else None
+        fd = pipe.fileno()
+        while True:
+            data = os.read(fd, READ_SIZE)
+            if not data:
+                break
+
+            try:
+                writer.write(data)
+                writer.flush()
+            except ValueError:
+                # The file was closed as the command exited, while a child
+                # process still writes to the pipe
+                return
+
+            if splitter:
+                splitter.feed(data)
+
+        if splitter:
+            splitter.close()
+
+    thread = threading.Thread(target=read, daemon=True)
+    thread.start()
+    return thread
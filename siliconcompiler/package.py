@@ -19,6 +19,23 @@ from github import Github
 import github.Auth
 
 
+def get_cache_path(chip):
+    '''
+    Returns the path of the cache directory, see :keypath:`option, cache`.
+    The directory is created if it does not exist.
+    '''
+    cache_path = chip.get('option', 'cache')
+    if cache_path:
+        cache_path = chip.find_files('option', 'cache', missing_ok=True)
+        if not cache_path:
+            cache_path = os.path.join(chip.cwd, chip.get('option', 'cache'))
+    if not cache_path:
+        cache_path = default_cache_dir()
+    if not os.path.exists(cache_path):
+        os.makedirs(cache_path, exist_ok=True)
+    return cache_path
+
+
 def _path(chip, package, download_handler):
     if package in chip._packages:
         return chip._packages[package]
@@ -48,15 +65,7 @@ def _path(chip, package, download_handler):
         return path
 
     # location of the python package
-    cache_path = chip.get('option', 'cache')
-    if cache_path:
-        cache_path = chip.find_files('option', 'cache', missing_ok=True)
-        if not cache_path:
-            cache_path = os.path.join(chip.cwd, chip.get('option', 'cache'))
-    if not cache_path:
-        cache_path = default_cache_dir()
-    if not os.path.exists(cache_path):
-        os.makedirs(cache_path, exist_ok=True)
+    cache_path = get_cache_path(chip)
     project_id = f'{package}-{data.get("ref")}'
     if url.scheme not in ['git', 'git+https', 'https', 'git+ssh', 'ssh'] or not project_id:
         chip.error(f'Could not find data path in package {package}: {data["path"]}', fatal=True)
@@ -106,11 +106,11 @@ def _collect_data(chip, flow=None, flowgraph_nodes=None, format_as_string=True):
 
 
 def _format_value(metric, value, metric_unit, metric_type, format_as_string):
-    if metric == 'memory':
+    if metric in ['memory', 'iobytes']:
         if format_as_string:
             return units.format_binary(value, metric_unit)
         value, metric = units.scale_binary(value, metric_unit)
-    elif metric in ['exetime', 'tasktime']:
+    elif metric in ['exetime', 'tasktime', 'cputime']:
         if format_as_string:
             return units.format_time(value)
     elif metric_type == 'int':
@@ -0,0 +1,254 @@
+import os
+import time
+
+import psutil
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+# Shortest and longest time between two samples, the interval grows with the
+# runtime of the command.
+MIN_INTERVAL = 0.1
+MAX_INTERVAL = 2
+# Fraction of the runtime of the command the samples may take at most.
+MAX_OVERHEAD = 0.02
+# Size of the blocks counted by getrusage().
+RUSAGE_BLOCK_SIZE = 512
+
+
+class ProcessTreeSource:
+    '''
+    Measures the memory of a command as the sum of the resident set sizes of
+    its processes, which psutil reads from /proc/<pid>/statm on Linux. This
+    is much cheaper than the unique set size, which requires reading
+    /proc/<pid>/smaps.
+    '''
+
+    per_process = True
+
+    def get_process_memory(self, proc):
+        '''Returns the memory used by a process of the command in bytes.'''
+        return proc.memory_info().rss
+
+    def get_current_memory(self):
+        return None
+
+    def get_peak_memory(self):
+        return None
+
+    def get_cputime(self):
+        return None
+
+
+class CgroupSource:
+    '''
+    Measures the memory and CPU time of a command from a cgroup v2 which only
+    holds the processes of the command. The kernel tracks the peak memory
+    and CPU time of the cgroup, so they are exact instead of sampled, even
+    for processes which left the process tree of the command.
+
+    Args:
+        path (str): Directory of the cgroup.
+    '''
+
+    per_process = False
+
+    def __init__(self, path):
+        self.__path = path
+
+    @staticmethod
+    def is_available(path):
+        '''Returns True if path is a cgroup v2 with the memory controller.'''
+        return bool(path) and os.path.isfile(os.path.join(path, 'memory.current'))
+
+    def get_process_memory(self, proc):
+        return 0
+
+    def get_current_memory(self):
+        '''Returns the current memory of the cgroup in bytes.'''
+        return self.__read('memory.current')
+
+    def get_peak_memory(self):
+        '''
+        Returns the peak memory of the cgroup in bytes, or None if it is not
+        tracked by the kernel (before Linux 5.19).
+        '''
+        return self.__read('memory.peak')
+
+    def get_cputime(self):
+        '''Returns the user and system CPU time of the cgroup in seconds.'''
+        try:
+            with open(os.path.join(self.__path, 'cpu.stat')) as f:
+                for line in f:
+                    key, _, value = line.partition(' ')
+                    if key == 'usage_usec':
+                        return int(value) / 1e6
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def __read(self, name):
+        try:
+            with open(os.path.join(self.__path, name)) as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+
+class ResourceSampler:
+    '''
+    Samples the resources used by a command and its child processes.
+
+    sample() can be called as often as convenient, ie. on every poll of the
+    command, the resources are only measured when the next sample is due.
+    The interval between samples grows with the runtime of the command, and
+    with the time the samples take.
+
+    Once the command exited and was waited for, finish() computes the CPU
+    time and I/O bytes of all the processes of the command from the resource
+    usage of the terminated children of the current process, which is exact
+    and free. Where it is not available, the sampled values are used.
+
+    Args:
+        cgroup (str): Directory of a cgroup v2 which only holds the command,
+            used to measure its memory and CPU time if available. Otherwise
+            the memory is the sum of the resident set sizes of its processes.
+    '''
+
+    def __init__(self, cgroup=None):
+        if CgroupSource.is_available(cgroup):
+            self.__source = CgroupSource(cgroup)
+        else:
+            self.__source = ProcessTreeSource()
+
+        self.__start = time.monotonic()
+        self.__next_sample = self.__start
+        self.__rusage = _get_children_rusage()
+
+        # Last CPU time and I/O bytes seen for each process
+        self.__cputimes = {}
+        self.__iobytes = {}
+
+        #: Peak memory of the command in bytes.
+        self.memory = 0
+        #: Peak number of threads of the command.
+        self.threads = 0
+        #: User and system CPU time of the command in seconds.
+        self.cputime = 0
+        #: Bytes read from and written to storage by the command.
+        self.iobytes = 0
+
+    def sample(self, pid):
+        '''
+        Measures the resources of the command if a sample is due.
+
+        Args:
+            pid (int): Process ID of the command.
+        '''
+        now = time.monotonic()
+        if now < self.__next_sample:
+            return
+
+        self.__sample(pid)
+
+        cost = time.monotonic() - now
+        interval = min(MAX_INTERVAL, max(MIN_INTERVAL, (now - self.__start) / 20))
+        self.__next_sample = now + max(interval, cost / MAX_OVERHEAD)
+
+    def __sample(self, pid):
+        try:
+            processes = _get_process_tree(pid)
+        except psutil.Error:
+            # Process already terminated
+            return
+
+        memory = 0
+        threads = 0
+        for proc in processes:
+            try:
+                with proc.oneshot():
+                    if self.__source.per_process:
+                        memory += self.__source.get_process_memory(proc)
+                    threads += proc.num_threads()
+                    cpu = proc.cpu_times()
+                    self.__cputimes[proc.pid] = cpu.user + cpu.system
+                    if hasattr(proc, 'io_counters'):
+                        io = proc.io_counters()
+                        self.__iobytes[proc.pid] = io.read_bytes + io.write_bytes
+            except (psutil.Error, PermissionError):
+                # Process may have terminated in the meantime, or the OS is
+                # preventing access to this information
+                continue
+
+        if not self.__source.per_process:
+            memory = self.__source.get_current_memory() or 0
+
+        self.memory = max(self.memory, memory)
+        self.threads = max(self.threads, threads)
+        self.cputime = sum(self.__cputimes.values())
+        self.iobytes = sum(self.__iobytes.values())
+
+    def finish(self):
+        '''
+        Completes the measurements, once the command exited and was waited
+        for.
+        '''
+        peak = self.__source.get_peak_memory()
+        if peak is not None:
+            self.memory = peak
+
+        rusage = _get_children_rusage()
+        if rusage and self.__rusage:
+            self.cputime = (rusage.ru_utime + rusage.ru_stime) - \
+                (self.__rusage.ru_utime + self.__rusage.ru_stime)
+            self.iobytes = RUSAGE_BLOCK_SIZE * (
+                (rusage.ru_inblock + rusage.ru_oublock) -
+                (self.__rusage.ru_inblock + self.__rusage.ru_oublock))
+
+        cputime = self.__source.get_cputime()
+        if cputime is not None:
+            self.cputime = cputime
+
+
+def _get_process_tree(pid):
+    '''
+    Returns the psutil processes of a process and all its (grand+)children.
+
+    On Linux, the children are read from /proc/<pid>/task/<tid>/children,
+    so only the processes of the tree are read instead of every process of
+    the machine.
+    '''
+    parent = psutil.Process(pid)
+    if not os.path.isfile(f'/proc/{pid}/task/{pid}/children'):
+        return [parent, *parent.children(recursive=True)]
+
+    processes = [parent]
+    to_visit = [pid]
+    while to_visit:
+        visit_pid = to_visit.pop()
+        try:
+            tids = os.listdir(f'/proc/{visit_pid}/task')
+        except OSError:
+            continue
+        for tid in tids:
+            try:
+                with open(f'/proc/{visit_pid}/task/{tid}/children') as f:
+                    child_pids = [int(child_pid) for child_pid in f.read().split()]
+            except (OSError, ValueError):
+                continue
+            for child_pid in child_pids:
+                try:
+                    processes.append(psutil.Process(child_pid))
+                except psutil.Error:
+                    continue
+                to_visit.append(child_pid)
+    return processes
+
+
+def _get_children_rusage():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_CHILDREN)
@@ -11,7 +11,7 @@ try:
 except ImportError:
     from siliconcompiler.schema.utils import trim
 
-SCHEMA_VERSION = '0.40.4'
+SCHEMA_VERSION = '0.40.16'
 
 #############################################################################
 # PARAM DEFINITION
@@ -2449,6 +2449,50 @@ def schema_metric(cfg, step='default', index='default'):
             Metric tracking total peak program memory footprint on a per
             step and index basis.""")
 
+    item = 'cputime'
+    scparam(cfg, ['metric', item],
+            sctype='float',
+            unit='s',
+            shorthelp=f"Metric: {item}",
+            switch=f"-metric_{item} 'step index <float>'",
+            example=[
+                f"cli: -metric_{item} 'dfm 0 10.0'",
+                f"api: chip.set('metric', '{item}', 10.0, step='dfm', index=0)"],
+            pernode='required',
+            schelp="""
+            Metric tracking the user and system CPU time used by the EDA
+            executable 'exe' and its child processes on a per step and index
+            basis. For multithreaded executables, it is larger than the time
+            spent by the executable.""")
+
+    item = 'threads'
+    scparam(cfg, ['metric', item],
+            sctype='int',
+            shorthelp=f"Metric: {item}",
+            switch=f"-metric_{item} 'step index <int>'",
+            example=[
+                f"cli: -metric_{item} 'dfm 0 8'",
+                f"api: chip.set('metric', '{item}', 8, step='dfm', index=0)"],
+            pernode='required',
+            schelp="""
+            Metric tracking the peak number of threads of the EDA executable
+            'exe' and its child processes on a per step and index basis.""")
+
+    item = 'iobytes'
+    scparam(cfg, ['metric', item],
+            sctype='float',
+            unit='B',
+            shorthelp=f"Metric: {item}",
+            switch=f"-metric_{item} 'step index <float>'",
+            example=[
+                f"cli: -metric_{item} 'dfm 0 10e9'",
+                f"api: chip.set('metric', '{item}', 10e9, step='dfm', index=0)"],
+            pernode='required',
+            schelp="""
+            Metric tracking the bytes read from and written to storage by the
+            EDA executable 'exe' and its child processes on a per step and
+            index basis.""")
+
     item = 'exetime'
     scparam(cfg, ['metric', item],
             sctype='float',
@@ -2568,7 +2612,16 @@ def schema_record(cfg, step='default', index='default'):
                'kernelversion': ['O/S kernel version',
                                  '5.11.0-34-generic',
                                  """Used for platforms that support a distinction
-                                 between os kernels and os distributions."""]}
+                                 between os kernels and os distributions."""],
+               'failure': ['failure reason',
+                           'oom',
+                           """Set when the tool was stopped by SiliconCompiler:
+
+                           * timeout: the task exceeded its timeout
+                           * maxerrors: the log reached :keypath:`option,maxerrors` errors
+                           * oom: the tool exceeded the memory limit of its cgroup,
+                             see :keypath:`option,scheduler,cgroup`
+                           """]}
 
     for item, val in records.items():
         helpext = trim(val[2])
@@ -2689,6 +2742,27 @@ def schema_option(cfg):
             cache parameter is empty, ".sc/cache" directory in the user's home
             directory will be used.""")
 
+    scparam(cfg, ['option', 'taskcache'],
+            sctype='bool',
+            scope='job',
+            pernode='optional',
+            shorthelp="Reuse results of unchanged tasks",
+            switch="-taskcache <bool>",
+            example=[
+                "cli: -taskcache",
+                "api: chip.set('option', 'taskcache', True)"],
+            schelp="""
+            Stores the results of successful tool executions in the 'tasks'
+            directory of :keypath:`option, cache`, and restores them instead of
+            running the tool again when a node is unchanged. A node is unchanged
+            when the configuration of its tool and task, the tool version, the
+            values and files of the parameters required by the task, and the
+            files received from its input nodes are all identical. The 'outputs'
+            and 'reports' directories and the tool logs are restored, along with
+            the metrics and records of the node from its post-processing, which
+            does not run again. Tasks implemented as a Python run() function are
+            not cached.""")
+
     scparam(cfg, ['option', 'nice'],
             sctype='int',
             scope='job',
@@ -3139,6 +3213,35 @@ def schema_option(cfg):
             flow that failed partway through.
             """)
 
+    scparam(cfg, ['option', 'incremental'],
+            sctype='bool',
+            scope='job',
+            shorthelp="Incremental build",
+            switch="-incremental <bool>",
+            example=["cli: -incremental",
+                     "api: chip.set('option', 'incremental', True)"],
+            schelp="""
+            If results exist for current job, only re-run the nodes whose results
+            are out of date, along with all the nodes that depend on them. A node
+            is out of date if it did not complete successfully, if the
+            configuration of its tool and task or the parameters required by its
+            task differ from the ones recorded when it last ran, or if any of the
+            files of these parameters were modified since then.
+            """)
+
+    scparam(cfg, ['option', 'dryrun'],
+            sctype='bool',
+            scope='job',
+            shorthelp="Dry run",
+            switch="-dryrun <bool>",
+            example=["cli: -dryrun",
+                     "api: chip.set('option', 'dryrun', True)"],
+            schelp="""
+            Sets up the flow and reports which nodes would be run and why,
+            without running them or modifying the build directory. Use with
+            :keypath:`option, incremental` to see which nodes are out of date.
+            """)
+
     scparam(cfg, ['option', 'track'],
             sctype='bool',
             pernode='optional',
@@ -3344,6 +3447,21 @@ def schema_option(cfg):
             metric is greater than 0. Note that the flow will always cease
             executing if the tool returns a nonzero status code. """)
 
+    scparam(cfg, ['option', 'maxerrors'],
+            sctype='int',
+            pernode='optional',
+            shorthelp="Stop tool after a number of errors",
+            switch='-maxerrors <int>',
+            example=["cli: -maxerrors 10",
+                     "api: chip.set('option', 'maxerrors', 10)"],
+            schelp="""
+            Stop a tool as soon as its log has reached this number of lines
+            matching its errors regex, instead of waiting for the tool to
+            finish. The log is checked for the regex patterns while the tool
+            runs, so the errors and warnings are reported as they are found.
+            The task then fails, even if :keypath:`option,flowcontinue` is
+            set. If not set, the tool is never stopped because of errors.""")
+
     scparam(cfg, ['option', 'continue'],
             sctype='bool',
             pernode='optional',
@@ -3415,7 +3533,9 @@ def schema_option(cfg):
             Specifies the number CPU cores required to run the job.
             For the slurm scheduler, this translates to the '-c'
             switch. For more information, see the job scheduler
-            documentation""")
+            documentation. For jobs run on the local machine, the job is
+            only started once this number of cores is available. Jobs
+            without this parameter do not reserve cores.""")
 
     scparam(cfg, ['option', 'scheduler', 'memory'],
             sctype='int',
@@ -3430,7 +3550,98 @@ def schema_option(cfg):
             Specifies the amount of memory required to run the job,
             specified in MB. For the slurm scheduler, this translates to
             the '--mem' switch. For more information, see the job
-            scheduler documentation""")
+            scheduler documentation. For jobs run on the local machine, the
+            job is only started once this amount of memory is available.""")
+
+    scparam(cfg, ['option', 'scheduler', 'cgroup'],
+            sctype='str',
+            scope='job',
+            pernode='optional',
+            shorthelp="Option: Scheduler cgroup",
+            switch="-cgroup <str>",
+            example=["cli: -cgroup /sys/fs/cgroup/user.slice/user-1000.slice/sc",
+                     "api: chip.set('option', 'scheduler', 'cgroup', "
+                     "'/sys/fs/cgroup/user.slice/user-1000.slice/sc')"],
+            schelp="""
+            Directory of a Linux cgroup v2 in which the tools of the jobs run
+            on the local machine are isolated. The tool of each job runs in its
+            own cgroup created in this directory, limited to
+            :keypath:`option, scheduler, memory` (memory.max) and to
+            :keypath:`option, scheduler, cores` or
+            :keypath:`tool, <tool>, task, <task>, threads` cores (cpu.max).
+            A job whose tool is killed for exceeding its memory limit fails
+            with :keypath:`record, failure` set to 'oom'. The memory and
+            cputime metrics are read from the cgroup.
+            The cgroup has to be delegated to the user, ie. with systemd's
+            Delegate=yes, and must not hold any process itself. If it cannot
+            be used, the tools run without limits.""")
+
+    scparam(cfg, ['option', 'scheduler', 'maxnodes'],
+            sctype='int',
+            scope='job',
+            shorthelp="Option: Maximum number of local parallel nodes",
+            switch="-maxnodes <int>",
+            example=["cli: -maxnodes 4",
+                     "api: chip.set('option', 'scheduler', 'maxnodes', 4)"],
+            schelp="""
+            Maximum number of nodes to run in parallel on the local machine.
+            Independently of this limit, a node is only started when the cores
+            and memory it requires are available, see
+            :keypath:`option, scheduler, cores` and
+            :keypath:`option, scheduler, memory`. If not set, the number of nodes
+            is only limited by the resources of the machine.""")
+
+    scparam(cfg, ['option', 'scheduler', 'policy'],
+            sctype='enum',
+            enum=["fifo", "criticalpath"],
+            defvalue='fifo',
+            scope='job',
+            shorthelp="Option: Local scheduling policy",
+            switch="-policy <str>",
+            example=["cli: -policy criticalpath",
+                     "api: chip.set('option', 'scheduler', 'policy', 'criticalpath')"],
+            schelp="""
+            Order in which nodes that are ready to run are started on the local
+            machine when they cannot all run at the same time, see
+            :keypath:`option, scheduler, maxnodes`. With 'fifo', nodes are started
+            in the order they become ready. With 'criticalpath', the nodes with
+            the longest remaining path through the flowgraph are started first.
+            Path lengths are estimated from the task runtimes
+            (:keypath:`metric, tasktime`) recorded by previous runs of the design,
+            which are read from the job history and the job manifests in the
+            build directory.""")
+
+    scparam(cfg, ['option', 'scheduler', 'pool'],
+            sctype='bool',
+            scope='job',
+            shorthelp="Option: Run local nodes in a worker pool",
+            switch="-pool <bool>",
+            example=["cli: -pool",
+                     "api: chip.set('option', 'scheduler', 'pool', True)"],
+            schelp="""
+            Runs the nodes executed on the local machine in a pool of long-lived
+            worker processes instead of starting a new process for each node.
+            Workers are started before the nodes are set up and are reused
+            across nodes, which removes most of the per-node process startup
+            cost in flows with many short tasks. The pool is sized by
+            :keypath:`option, scheduler, maxnodes`, or by the number of cores of
+            the machine if it is not set.""")
+
+    scparam(cfg, ['option', 'scheduler', 'pipeline'],
+            sctype='bool',
+            scope='job',
+            shorthelp="Option: Set up nodes while the flow runs",
+            switch="-pipeline <bool>",
+            example=["cli: -pipeline",
+                     "api: chip.set('option', 'scheduler', 'pipeline', True)"],
+            schelp="""
+            Sets up the nodes executed on the local machine just before they are
+            launched, or while the nodes launched before them run, instead of
+            setting up every node before the first one is launched. The checks
+            of the setup of each node are performed once it is set up, so a node
+            with an invalid setup fails without stopping the nodes that do not
+            depend on it. Ignored with :keypath:`option, incremental` and
+            :keypath:`option, dryrun`, which need every node to be set up.""")
 
     scparam(cfg, ['option', 'scheduler', 'queue'],
             sctype='str',
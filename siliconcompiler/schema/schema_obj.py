@@ -7,9 +7,11 @@
 import copy
 import csv
 import gzip
+import itertools
 import json
 import logging
 import os
+import pickle
 import re
 import pathlib
 import argparse
@@ -22,9 +24,44 @@ try:
 except ImportError:
     _has_yaml = False
 
-from .schema_cfg import schema_cfg
+try:
+    import orjson
+    _has_orjson = True
+except ImportError:
+    _has_orjson = False
+
+try:
+    import msgpack
+    _has_msgpack = True
+except ImportError:
+    _has_msgpack = False
+
+from .schema_cfg import schema_cfg, SCHEMA_VERSION
 from .utils import escape_val_tcl, PACKAGE_ROOT
 
+# Default configurations, keyed by the function used to build them. These are
+# only built once per process and are never modified afterwards: every Schema
+# object shares them and only copies the parts of the tree it writes to.
+_DEFAULT_CFGS = {}
+# id() of every dictionary that belongs to one of the default configurations.
+_DEFAULT_CFG_IDS = set()
+# Keypath of the dictionaries of each default configuration, keyed by id().
+# See Schema._write_pickle().
+_DEFAULT_CFG_PATHS = {}
+# Value normalization functions, keyed by type string. See Schema._get_normalizer().
+_NORMALIZERS = {}
+# Source of the flowgraph versions, unique across Schema objects.
+# See Schema._flowgraph_version().
+_FLOWGRAPH_VERSIONS = itertools.count()
+
+
+class _TypeMismatch(TypeError):
+    '''Raised by normalization functions for a value of the wrong type.'''
+
+
+class _EnumMismatch(ValueError):
+    '''Raised by normalization functions for a value that is not in the enum.'''
+
 
 class Schema:
     """Object for storing and accessing configuration values corresponding to
@@ -43,6 +80,12 @@ class Schema:
             the schema.
         manifest (str): Initial manifest.
         logger (logging.Logger): instance of the parent logger if available
+        trusted (bool): If True, the manifest is assumed to have been written
+            by this version of the schema, so its values are only checked and
+            normalized where JSON cannot represent them (ie. tuples). This is
+            ignored if the manifest records a different schema version.
+        include (list of keypaths): If provided, only the parts of the manifest
+            found under these keypath prefixes are loaded.
     """
 
     # Special key in node dict that represents a value corresponds to a
@@ -50,7 +93,7 @@ class Schema:
     GLOBAL_KEY = 'global'
     PERNODE_FIELDS = ('value', 'filehash', 'date', 'author', 'signature', 'package')
 
-    def __init__(self, cfg=None, manifest=None, logger=None):
+    def __init__(self, cfg=None, manifest=None, logger=None, trusted=False, include=None):
         if cfg is not None and manifest is not None:
             raise ValueError('You may not specify both cfg and manifest')
 
@@ -58,61 +101,266 @@ class Schema:
 
         if manifest is not None:
             # Normalize value to string in case we receive a pathlib.Path
+            # The manifest content is not referenced anywhere else, so it
+            # does not need to be copied.
             cfg = Schema.__read_manifest_file(str(manifest))
+        elif cfg is not None:
+            cfg = copy.deepcopy(cfg)
+            trusted = False
 
         if cfg is not None:
+            if trusted and Schema.__get_schemaversion(cfg) not in (None, SCHEMA_VERSION):
+                trusted = False
+
+            if include is not None:
+                cfg = Schema.__include_cfg(cfg, include)
+
             try:
-                self.cfg = Schema._dict_to_schema(copy.deepcopy(cfg))
+                self.cfg = Schema._dict_to_schema(cfg,
+                                                  defaults=self._default_cfg(),
+                                                  trusted=trusted)
             except (TypeError, ValueError) as e:
                 raise ValueError('Attempting to read manifest with '
                                  f'incompatible schema version: {e}') \
                     from e
         else:
-            self.cfg = self._init_schema_cfg()
+            self.cfg = self._new_schema_cfg()
+
+        self._clear_index()
+        self.__changes = None
 
     ###########################################################################
     def _init_schema_cfg(self):
         return schema_cfg()
 
+    ###########################################################################
+    def _new_schema_cfg(self):
+        '''
+        Returns a new configuration initialized to default values.
+
+        The returned dictionary shares all of its content with a default
+        configuration that is only built once per process. Shared parts of the
+        tree are copied the first time they are written to by _search().
+        '''
+        default_cfg = self._default_cfg()
+
+        # Top level categories are copied, since these get modified directly
+        # (ie. 'history' and 'library').
+        cfg = {}
+        for key, value in default_cfg.items():
+            if Schema._is_leaf(value):
+                cfg[key] = value
+            else:
+                cfg[key] = value.copy()
+        return cfg
+
+    ###########################################################################
+    def _default_cfg(self):
+        '''
+        Returns the default configuration of this schema, which must not be
+        modified.
+        '''
+        builder = type(self)._init_schema_cfg
+        if builder not in _DEFAULT_CFGS:
+            default_cfg = self._init_schema_cfg()
+            Schema._register_default_cfg(default_cfg)
+            _DEFAULT_CFGS[builder] = default_cfg
+        return _DEFAULT_CFGS[builder]
+
     ###########################################################################
     @staticmethod
-    def _dict_to_schema_set(cfg, *key):
+    def _register_default_cfg(cfg):
+        _DEFAULT_CFG_IDS.add(id(cfg))
         if Schema._is_leaf(cfg):
-            for field, value in cfg.items():
-                if field == 'node':
-                    for step in value:
-                        if step == 'default':
-                            continue
-                        for index in value[step]:
-                            if step == Schema.GLOBAL_KEY:
-                                sstep = None
-                            else:
-                                sstep = step
-                            if index == Schema.GLOBAL_KEY:
-                                sindex = None
-                            else:
-                                sindex = index
-                            for nodefield, nodevalue in value[step][index].items():
-                                Schema._set(*key, nodevalue,
-                                            cfg=cfg,
-                                            field=nodefield,
-                                            step=sstep, index=sindex)
-                else:
-                    Schema._set(*key, value, cfg=cfg, field=field)
+            # Leaves are copied as a whole, so their content does not need to
+            # be registered.
+            return
+        for value in cfg.values():
+            Schema._register_default_cfg(value)
+
+    ###########################################################################
+    @staticmethod
+    def _copy_cfg(cfg, share_defaults=False):
+        '''
+        Returns a deep copy of a configuration dictionary.
+
+        This is a faster alternative to copy.deepcopy(), since the schema only
+        contains dictionaries, lists and immutable values. Parameters are
+        copied with _copy_leaf(). If share_defaults is True, dictionaries
+        shared with a default configuration are not copied.
+        '''
+        if isinstance(cfg, dict):
+            if share_defaults and Schema._is_default_cfg(cfg):
+                return cfg
+            if Schema._is_leaf(cfg):
+                return Schema._copy_leaf(cfg)
+            return {key: Schema._copy_cfg(value, share_defaults=share_defaults)
+                    for key, value in cfg.items()}
+        if isinstance(cfg, list):
+            return [Schema._copy_cfg(value) for value in cfg]
+        return cfg
+
+    ###########################################################################
+    @staticmethod
+    def _copy_leaf(cfg):
+        '''
+        Returns a copy of a parameter.
+
+        Fields other than 'node' are only ever replaced, never modified in
+        place, so their values are shared with the original parameter. The
+        same is true of the default node values.
+        '''
+        leaf = cfg.copy()
+        leaf['node'] = {}
+        for step, indices in cfg['node'].items():
+            if step == 'default':
+                leaf['node'][step] = indices
+            else:
+                leaf['node'][step] = {index: Schema._copy_cfg(value)
+                                      for index, value in indices.items()}
+        return leaf
+
+    ###########################################################################
+    @staticmethod
+    def _is_default_cfg(cfg):
+        '''Returns whether cfg is shared with a default configuration.'''
+        return id(cfg) in _DEFAULT_CFG_IDS
+
+    ###########################################################################
+    @staticmethod
+    def _get_writable(cfg, key):
+        '''
+        Returns cfg[key], replacing it with a copy first if it is shared with
+        a default configuration.
+        '''
+        value = cfg[key]
+        if Schema._is_default_cfg(value):
+            if Schema._is_leaf(value):
+                value = Schema._copy_leaf(value)
+            else:
+                value = value.copy()
+            cfg[key] = value
+        return value
+
+    ###########################################################################
+    @staticmethod
+    def __get_schemaversion(cfg):
+        '''
+        Returns the schema version recorded in a manifest, or None if it
+        is not available (ie. in a pruned manifest).
+        '''
+        try:
+            node = cfg['schemaversion']['node']
+        except (KeyError, TypeError):
+            return None
+
+        for key in (Schema.GLOBAL_KEY, 'default'):
+            try:
+                return node[key][key]['value']
+            except (KeyError, TypeError):
+                pass
+        return None
+
+    ###########################################################################
+    @staticmethod
+    def __include_cfg(cfg, include):
+        '''
+        Returns a configuration that only contains the parts of cfg found
+        under the keypaths in include. Keypaths missing from cfg are ignored.
+        '''
+        included = {}
+        for keypath in include:
+            if not keypath:
+                return cfg
+            src = cfg
+            dst = included
+            for n, key in enumerate(keypath):
+                if not isinstance(src, dict) or key not in src:
+                    break
+                if n == len(keypath) - 1 or Schema._is_leaf(src[key]):
+                    dst[key] = src[key]
+                    break
+                src = src[key]
+                dst = dst.setdefault(key, {})
+        return included
+
+    ###########################################################################
+    @staticmethod
+    def _dict_to_schema_set(cfg, *key, defaults=None, trusted=False):
+        if Schema._is_leaf(cfg):
+            if trusted and '(' not in cfg['type']:
+                # JSON preserves all other types, so there is nothing to normalize
+                pass
+            else:
+                Schema.__dict_to_schema_param(cfg, *key)
+
+            if defaults is not None and Schema._is_leaf(defaults):
+                Schema.__share_fields(cfg, defaults)
         else:
             for nextkey in cfg.keys():
-                Schema._dict_to_schema_set(cfg[nextkey], *key, nextkey)
+                nextdefaults = None
+                if defaults is not None and not Schema._is_leaf(defaults):
+                    nextdefaults = defaults.get(nextkey, defaults.get('default'))
+                Schema._dict_to_schema_set(cfg[nextkey], *key, nextkey,
+                                           defaults=nextdefaults, trusted=trusted)
 
     ###########################################################################
     @staticmethod
-    def _dict_to_schema(cfg):
+    def __dict_to_schema_param(cfg, *key):
+        for field, value in cfg.items():
+            if field == 'node':
+                for step in value:
+                    if step == 'default':
+                        continue
+                    for index in value[step]:
+                        if step == Schema.GLOBAL_KEY:
+                            sstep = None
+                        else:
+                            sstep = step
+                        if index == Schema.GLOBAL_KEY:
+                            sindex = None
+                        else:
+                            sindex = index
+                        for nodefield, nodevalue in value[step][index].items():
+                            Schema._set(*key, nodevalue,
+                                        cfg=cfg,
+                                        field=nodefield,
+                                        step=sstep, index=sindex)
+            else:
+                Schema._set(*key, value, cfg=cfg, field=field)
+
+    ###########################################################################
+    @staticmethod
+    def __share_fields(cfg, defaults):
+        '''
+        Replaces fields of the parameter cfg with the ones from defaults when
+        they are equal, so that values read from a manifest (ie. help text)
+        are only stored once per process. See _copy_leaf() for which fields
+        can be shared.
+        '''
+        for field, value in cfg.items():
+            if field == 'node':
+                if 'default' in value and value['default'] == defaults['node']['default']:
+                    value['default'] = defaults['node']['default']
+            elif field in defaults and value == defaults[field]:
+                cfg[field] = defaults[field]
+
+    ###########################################################################
+    @staticmethod
+    def _dict_to_schema(cfg, defaults=None, trusted=False):
         for category in cfg.keys():
+            if defaults is not None:
+                category_defaults = defaults.get(category)
+            else:
+                category_defaults = None
+
             if category in ('history', 'library'):
                 # History and library are subschemas
                 for _, value in cfg[category].items():
-                    Schema._dict_to_schema(value)
+                    Schema._dict_to_schema(value, defaults=defaults, trusted=trusted)
             else:
-                Schema._dict_to_schema_set(cfg[category], category)
+                Schema._dict_to_schema_set(cfg[category], category,
+                                           defaults=category_defaults, trusted=trusted)
         return cfg
 
     ###########################################################################
@@ -166,18 +414,29 @@ class Schema:
         if not os.path.isfile(filepath):
             raise ValueError(f'Manifest file not found {filepath}')
 
+        is_msgpack = re.search(r'(\.msgpack)(\.gz)*$', filepath, flags=re.IGNORECASE)
+
         if os.path.splitext(filepath)[1].lower() == '.gz':
             fin = gzip.open(filepath, 'r')
+        elif is_msgpack:
+            fin = open(filepath, 'rb')
         else:
             fin = open(filepath, 'r')
 
         try:
             if re.search(r'(\.json|\.sup)(\.gz)*$', filepath, flags=re.IGNORECASE):
-                localcfg = json.load(fin)
+                if _has_orjson:
+                    localcfg = orjson.loads(fin.read())
+                else:
+                    localcfg = json.load(fin)
             elif re.search(r'(\.yaml|\.yml)(\.gz)*$', filepath, flags=re.IGNORECASE):
                 if not _has_yaml:
                     raise ImportError('yaml package required to read YAML manifest')
                 localcfg = yaml.load(fin, Loader=yaml.SafeLoader)
+            elif is_msgpack:
+                if not _has_msgpack:
+                    raise ImportError('msgpack package required to read msgpack manifest')
+                localcfg = msgpack.unpackb(fin.read())
             else:
                 raise ValueError(f'File format not recognized {filepath}')
         finally:
@@ -210,21 +469,27 @@ class Schema:
             index = str(index)
 
         if field in self.PERNODE_FIELDS:
-            try:
-                return cfg['node'][step][index][field]
-            except KeyError:
-                if cfg['pernode'] == 'required':
-                    return cfg['node']['default']['default'][field]
-
-            try:
-                return cfg['node'][step][self.GLOBAL_KEY][field]
-            except KeyError:
-                pass
-
-            try:
-                return cfg['node'][self.GLOBAL_KEY][self.GLOBAL_KEY][field]
-            except KeyError:
-                return cfg['node']['default']['default'][field]
+            # Missing entries are common here, so avoid raising KeyErrors
+            node = cfg['node']
+            step_cfg = node.get(step)
+            if step_cfg is not None:
+                index_cfg = step_cfg.get(index)
+                if index_cfg is not None and field in index_cfg:
+                    return index_cfg[field]
+
+            if cfg['pernode'] != 'required':
+                if step_cfg is not None:
+                    index_cfg = step_cfg.get(self.GLOBAL_KEY)
+                    if index_cfg is not None and field in index_cfg:
+                        return index_cfg[field]
+
+                step_cfg = node.get(self.GLOBAL_KEY)
+                if step_cfg is not None:
+                    index_cfg = step_cfg.get(self.GLOBAL_KEY)
+                    if index_cfg is not None and field in index_cfg:
+                        return index_cfg[field]
+
+            return node['default']['default'][field]
         elif field in cfg:
             return cfg[field]
         else:
@@ -241,8 +506,12 @@ class Schema:
         keypath = args[:-1]
         cfg = self._search(*keypath, insert_defaults=True)
 
-        return self._set(*args, logger=self.logger, cfg=cfg, field=field, clobber=clobber,
-                         step=step, index=index)
+        if not self._set(*args, logger=self.logger, cfg=cfg, field=field, clobber=clobber,
+                         step=step, index=index):
+            return False
+
+        self.__record_change(keypath)
+        return True
 
     ###########################################################################
     @staticmethod
@@ -255,6 +524,58 @@ class Schema:
         keypath = args[:-1]
         value = args[-1]
 
+        Schema.__check_set_args(keypath, cfg, field, step, index)
+
+        if isinstance(index, int):
+            index = str(index)
+
+        if not Schema.__can_set(keypath, cfg, field, clobber, step, index, logger):
+            return False
+
+        value = Schema._check_and_normalize(value, cfg['type'], field, keypath, cfg.get('enum'))
+
+        Schema.__store(cfg, value, field, step, index)
+        return True
+
+    ###########################################################################
+    def set_many(self, values, field='value', clobber=True, step=None, index=None):
+        '''
+        Sets multiple schema parameter fields.
+
+        Each entry of values holds the arguments to set(), ie. a keypath
+        followed by a value. All values are checked before any parameter is
+        modified, so if one of them is invalid none of them are set.
+
+        Returns a list with the result of set() for each entry.
+        '''
+        if isinstance(index, int):
+            index = str(index)
+
+        updates = []
+        for args in values:
+            keypath = tuple(args[:-1])
+            # Missing keys resolve to their 'default' dictionary here, they
+            # are only inserted once all values are valid
+            cfg = self._search(*keypath)
+            Schema.__check_set_args(keypath, cfg, field, step, index)
+            value = Schema._check_and_normalize(args[-1], cfg['type'], field, keypath,
+                                                cfg.get('enum'))
+            updates.append((keypath, value))
+
+        results = []
+        for keypath, value in updates:
+            cfg = self._search(*keypath, insert_defaults=True)
+            if Schema.__can_set(keypath, cfg, field, clobber, step, index, self.logger):
+                Schema.__store(cfg, value, field, step, index)
+                self.__record_change(keypath)
+                results.append(True)
+            else:
+                results.append(False)
+        return results
+
+    ###########################################################################
+    @staticmethod
+    def __check_set_args(keypath, cfg, field, step, index):
         if not Schema._is_leaf(cfg):
             raise ValueError(f'Invalid keypath {keypath}: set() '
                              'must be called on a complete keypath')
@@ -263,9 +584,9 @@ class Schema:
         if err:
             raise ValueError(f'Invalid args to set() of keypath {keypath}: {err}')
 
-        if isinstance(index, int):
-            index = str(index)
-
+    ###########################################################################
+    @staticmethod
+    def __can_set(keypath, cfg, field, clobber, step, index, logger):
         if cfg['lock'] and field != 'lock':
             if logger:
                 logger.debug(f'Failed to set value for {keypath}: parameter is locked')
@@ -277,12 +598,11 @@ class Schema:
                              'and parameter is set')
             return False
 
-        allowed_values = None
-        if 'enum' in cfg:
-            allowed_values = cfg['enum']
-
-        value = Schema._check_and_normalize(value, cfg['type'], field, keypath, allowed_values)
+        return True
 
+    ###########################################################################
+    @staticmethod
+    def __store(cfg, value, field, step, index):
         if field in Schema.PERNODE_FIELDS:
             step = step if step is not None else Schema.GLOBAL_KEY
             index = index if index is not None else Schema.GLOBAL_KEY
@@ -295,8 +615,6 @@ class Schema:
         else:
             cfg[field] = value
 
-        return True
-
     ###########################################################################
     def add(self, *args, field='value', step=None, index=None):
         '''
@@ -346,8 +664,10 @@ class Schema:
                     cfg['node']['default']['default'])
             cfg['node'][modified_step][modified_index][field].extend(value)
         else:
-            cfg[field].extend(value)
+            # Other fields may be shared between copies of the parameter
+            cfg[field] = cfg[field] + value
 
+        self.__record_change(keypath)
         return True
 
     ###########################################################################
@@ -362,7 +682,7 @@ class Schema:
             self.logger.error(f'Cannot remove default keypath: {keypath}')
             return
 
-        cfg = self._search(*search_path)
+        cfg = self._search(*search_path, writable=True)
         if 'default' not in cfg:
             self.logger.error(f'Cannot remove a non-default keypath: {keypath}')
             return
@@ -378,6 +698,7 @@ class Schema:
                 return
 
         del cfg[removal_key]
+        self._clear_index()
 
     ###########################################################################
     def unset(self, *keypath, step=None, index=None):
@@ -386,7 +707,7 @@ class Schema:
 
         See :meth:`~siliconcompiler.core.Chip.unset` for detailed documentation.
         '''
-        cfg = self._search(*keypath)
+        cfg = self._search(*keypath, writable=True)
 
         if not Schema._is_leaf(cfg):
             raise ValueError(f'Invalid keypath {keypath}: unset() '
@@ -414,8 +735,178 @@ class Schema:
             # If this key doesn't exist, silently continue - it was never set
             pass
 
+        self.__record_change(keypath)
         return True
 
+    ###########################################################################
+    def _track_changes(self):
+        '''
+        Starts recording the parameters modified by set(), add() and unset(),
+        see _changes().
+        '''
+        self.__changes = set()
+
+    ###########################################################################
+    def __record_change(self, keypath):
+        if self.__changes is not None:
+            self.__changes.add(tuple(keypath))
+
+    ###########################################################################
+    def _changes(self):
+        '''
+        Returns a pruned schema that only contains the parameters modified
+        since _track_changes() was called, or None if changes are not being
+        tracked.
+
+        The returned schema shares its values with this object, so it must
+        only be used for reading (ie. to write out a manifest).
+        '''
+        if self.__changes is None:
+            return None
+
+        schema = Schema(logger=self.logger)
+        schema.cfg = {}
+        for keypath in sorted(self.__changes):
+            try:
+                cfg = self._search(*keypath)
+            except (TypeError, ValueError):
+                # Parameter has been removed since
+                continue
+            if not Schema._is_leaf(cfg):
+                continue
+
+            dst = schema.cfg
+            for key in keypath[:-1]:
+                dst = dst.setdefault(key, {})
+            dst[keypath[-1]] = {field: value for field, value in cfg.items()
+                                if field not in ('help', 'example')}
+        return schema
+
+    ###########################################################################
+    def _merge(self, srcs, clobber=True, clear=True, check=False, key_filter=None):
+        '''
+        Merges the parameters of one or more schemas into this schema.
+
+        The result is the same as calling set() (or add() for lists if clear is
+        False) with every value and field of the sources, one source after the
+        other. The sources are walked together so each parameter is only looked
+        up once in this schema, and since their values are already normalized
+        they are copied as-is.
+
+        Args:
+            srcs (list of Schema): Schemas to merge, in order of precedence.
+            clobber (bool): If True, overwrites existing parameter values.
+            clear (bool): If True, disables append operations for list types.
+            check (bool): If True, keypaths that are not valid in this schema
+                are skipped with a warning instead of raising a ValueError.
+            key_filter (function): If provided, only keypaths for which it
+                returns True are merged.
+        '''
+        self.__merge_cfgs([src.cfg for src in srcs], (), clobber, clear, check, key_filter)
+
+    ###########################################################################
+    def __merge_cfgs(self, srcs, keypath, clobber, clear, check, key_filter):
+        keys = {}
+        for src in srcs:
+            keys.update(dict.fromkeys(src))
+
+        for key in keys:
+            if key == 'default':
+                continue
+            if not keypath and key in ('history', 'library'):
+                continue
+
+            subkeypath = (*keypath, key)
+            cfgs = [src[key] for src in srcs if key in src]
+            leaves = [cfg for cfg in cfgs if Schema._is_leaf(cfg)]
+            if leaves:
+                self.__merge_leaves(leaves, subkeypath, clobber, clear, check, key_filter)
+            if len(leaves) != len(cfgs):
+                self.__merge_cfgs([cfg for cfg in cfgs if not Schema._is_leaf(cfg)],
+                                  subkeypath, clobber, clear, check, key_filter)
+
+    ###########################################################################
+    def __merge_leaves(self, srcs, keypath, clobber, clear, check, key_filter):
+        if key_filter and not key_filter(keypath):
+            return
+        if check and not self.valid(*keypath, default_valid=True):
+            self.logger.warning(f'Keypath {list(keypath)} is not valid')
+            return
+
+        cfg = self._search(*keypath, insert_defaults=True)
+        modified = False
+        for src in srcs:
+            if Schema.__merge_leaf(cfg, src, keypath, clobber, clear):
+                modified = True
+
+        if modified:
+            self.__record_change(keypath)
+
+    ###########################################################################
+    @staticmethod
+    def __merge_leaf(cfg, src, keypath, clobber, clear):
+        '''
+        Merges the fields of parameter src into parameter cfg.
+
+        Returns whether cfg was modified.
+        '''
+        # Values only need to be normalized again if the parameter definitions
+        # differ, ie. when merging a manifest from another schema version.
+        normalize = cfg['type'] != src['type']
+        append = src['type'].startswith('[') and not clear
+
+        modified = False
+        for step, indices in src['node'].items():
+            if step == 'default':
+                continue
+
+            for index, fields in indices.items():
+                if 'value' not in fields or cfg['lock']:
+                    continue
+
+                step_arg = None if step == Schema.GLOBAL_KEY else step
+                index_arg = None if index == Schema.GLOBAL_KEY else index
+                skip_value = not append and not clobber and \
+                    Schema._is_set(cfg, step=step_arg, index=index_arg)
+
+                for field, value in fields.items():
+                    if field == 'value' and skip_value:
+                        continue
+
+                    if normalize:
+                        value = Schema._check_and_normalize(value, cfg['type'], field, keypath,
+                                                            cfg.get('enum'))
+                    else:
+                        value = copy.copy(value)
+
+                    if step not in cfg['node']:
+                        cfg['node'][step] = {}
+                    if index not in cfg['node'][step]:
+                        cfg['node'][step][index] = copy.deepcopy(cfg['node']['default']['default'])
+
+                    if append:
+                        cfg['node'][step][index][field].extend(value)
+                    else:
+                        cfg['node'][step][index][field] = value
+                    modified = True
+
+        for field, value in src.items():
+            if field in ('node', 'switch', 'type', 'require', 'shorthelp', 'example', 'help'):
+                # node is handled above, others are static
+                continue
+            if cfg['lock'] and field != 'lock':
+                continue
+
+            if normalize:
+                value = Schema._check_and_normalize(value, cfg['type'], field, keypath,
+                                                    cfg.get('enum'))
+            # Fields other than 'node' are only ever replaced, so they can be shared
+            cfg[field] = value
+            modified = True
+
+        return modified
+
+    ###########################################################################
     def _getvals(self, *keypath, return_defvalue=True):
         """
         Returns all values (global and pernode) associated with a particular parameter.
@@ -563,83 +1054,126 @@ class Schema:
             return value
 
         if field == 'value':
-            # Push down error_msg from the top since arguments get modified in recursive call
-            error_msg = f'Invalid value {value} for keypath {keypath}: expected type {sc_type}'
-            return Schema._normalize_value(value, sc_type, error_msg, allowed_values)
+            try:
+                return Schema._get_normalizer(sc_type)(value, allowed_values)
+            except (_TypeMismatch, _EnumMismatch) as e:
+                # Only build the error message once it is needed
+                error_msg = f'Invalid value {value} for keypath {keypath}: expected type {sc_type}'
+                Schema.__raise_normalize_error(e, error_msg)
         else:
             return Schema._normalize_field(value, sc_type, field, keypath)
 
     @staticmethod
     def _normalize_value(value, sc_type, error_msg, allowed_values):
+        try:
+            return Schema._get_normalizer(sc_type)(value, allowed_values)
+        except (_TypeMismatch, _EnumMismatch) as e:
+            Schema.__raise_normalize_error(e, error_msg)
+
+    @staticmethod
+    def __raise_normalize_error(e, error_msg):
+        if isinstance(e, _EnumMismatch):
+            raise ValueError(error_msg + f", and value of {e}") from None
+        raise TypeError(error_msg) from None
+
+    @staticmethod
+    def _get_normalizer(sc_type):
+        '''
+        Returns the function that normalizes values of type sc_type, see
+        _check_and_normalize() for the rules.
+
+        The function is called with the value and the allowed values of an
+        enum, and raises _TypeMismatch or _EnumMismatch if the value is
+        invalid. Type strings are only parsed once, the functions are cached.
+        '''
+        normalizer = _NORMALIZERS.get(sc_type)
+        if normalizer is None:
+            normalizer = Schema.__build_normalizer(sc_type)
+            _NORMALIZERS[sc_type] = normalizer
+        return normalizer
+
+    @staticmethod
+    def __build_normalizer(sc_type):
         if sc_type.startswith('['):
-            base_type = sc_type[1:-1]
+            normalize_item = Schema._get_normalizer(sc_type[1:-1])
 
-            # Need to try 2 different recursion strategies - if value is a list already, then we can
-            # recurse on it directly. However, if that doesn't work, then it might be a
-            # list-of-lists/tuples that needs to be wrapped in an outer list, so we try that.
-            if isinstance(value, list):
-                try:
-                    return [Schema._normalize_value(v, base_type, error_msg, allowed_values)
-                            for v in value]
-                except TypeError:
-                    pass
+            def normalize(value, allowed_values):
+                # Need to try 2 different recursion strategies - if value is a list already, then
+                # we can recurse on it directly. However, if that doesn't work, then it might be a
+                # list-of-lists/tuples that needs to be wrapped in an outer list, so we try that.
+                if isinstance(value, list):
+                    try:
+                        return [normalize_item(v, allowed_values) for v in value]
+                    except TypeError:
+                        pass
 
-            value = [value]
-            return [Schema._normalize_value(v, base_type, error_msg, allowed_values) for v in value]
+                return [normalize_item(value, allowed_values)]
+            return normalize
 
         if sc_type.startswith('('):
             # TODO: make parsing more robust to support tuples-of-tuples
-            if isinstance(value, str):
-                value = value[1:-1].split(',')
-            elif not (isinstance(value, tuple) or isinstance(value, list)):
-                raise TypeError(error_msg)
+            normalize_items = [Schema._get_normalizer(base_type)
+                               for base_type in sc_type[1:-1].split(',')]
+
+            def normalize(value, allowed_values):
+                if isinstance(value, str):
+                    value = value[1:-1].split(',')
+                elif not isinstance(value, (tuple, list)):
+                    raise _TypeMismatch()
 
-            base_types = sc_type[1:-1].split(',')
-            if len(value) != len(base_types):
-                raise TypeError(error_msg)
-            return tuple(Schema._normalize_value(v, base_type, error_msg, allowed_values)
-                         for v, base_type in zip(value, base_types))
+                if len(value) != len(normalize_items):
+                    raise _TypeMismatch()
+                return tuple(normalize_item(v, allowed_values)
+                             for v, normalize_item in zip(value, normalize_items))
+            return normalize
 
         if sc_type == 'bool':
-            if value == 'true':
-                return True
-            if value == 'false':
-                return False
-            if isinstance(value, bool):
-                return value
-            raise TypeError(error_msg)
+            def normalize(value, allowed_values):
+                if value == 'true':
+                    return True
+                if value == 'false':
+                    return False
+                if isinstance(value, bool):
+                    return value
+                raise _TypeMismatch()
+            return normalize
 
-        try:
-            if sc_type == 'int':
-                return int(value)
+        if sc_type in ('int', 'float'):
+            cast = int if sc_type == 'int' else float
 
-            if sc_type == 'float':
-                return float(value)
-        except TypeError:
-            raise TypeError(error_msg) from None
+            def normalize(value, allowed_values):
+                try:
+                    return cast(value)
+                except TypeError:
+                    raise _TypeMismatch() from None
+            return normalize
 
         if sc_type == 'str':
-            if isinstance(value, str):
-                return value
-            else:
-                raise TypeError(error_msg)
+            def normalize(value, allowed_values):
+                if isinstance(value, str):
+                    return value
+                raise _TypeMismatch()
+            return normalize
 
         if sc_type in ('file', 'dir'):
-            if isinstance(value, (str, pathlib.Path)):
-                return str(value)
-            else:
-                raise TypeError(error_msg)
+            def normalize(value, allowed_values):
+                if isinstance(value, (str, pathlib.Path)):
+                    return str(value)
+                raise _TypeMismatch()
+            return normalize
 
         if sc_type == 'enum':
-            if isinstance(value, str):
-                if value in allowed_values:
-                    return value
-                valid = ", ".join(allowed_values)
-                raise ValueError(error_msg + f", and value of {valid}")
-            else:
-                raise TypeError(error_msg)
+            def normalize(value, allowed_values):
+                if not isinstance(value, str):
+                    raise _TypeMismatch()
+                if value not in allowed_values:
+                    raise _EnumMismatch(", ".join(allowed_values))
+                return value
+            return normalize
 
-        raise ValueError(f'Invalid type specifier: {sc_type}')
+        def normalize(value, allowed_values):
+            raise ValueError(f'Invalid type specifier: {sc_type}')
+        return normalize
 
     @staticmethod
     def _normalize_field(value, sc_type, field, keypath):
@@ -783,12 +1317,42 @@ class Schema:
 
         return None
 
-    def _search(self, *keypath, insert_defaults=False, job=None):
+    def _search(self, *keypath, insert_defaults=False, job=None, writable=False):
+        '''
+        Returns the configuration dictionary found at keypath.
+
+        If insert_defaults is True, missing keys are created from the matching
+        'default' dictionary. If insert_defaults or writable is True, the
+        returned dictionary is safe to modify, otherwise it may be shared with
+        the default configuration. The exception is a keypath that only
+        matches a 'default' dictionary when insert_defaults is False: the
+        dictionary returned then is not part of the configuration and must
+        not be modified.
+
+        Results are stored in a flat index keyed by keypath, so repeated
+        lookups of the same keypath do not need to walk the tree.
+        '''
+        writable = writable or insert_defaults
+
+        if writable and Schema.__is_flowgraph_edge(keypath):
+            self.__flowgraph_version = next(_FLOWGRAPH_VERSIONS)
+
+        use_index = job is None and keypath and keypath[0] not in ('history', 'library')
+        if use_index:
+            if self.__index_cfg is not self.cfg:
+                self._clear_index()
+            index = self.__writable_index if writable else self.__index
+            try:
+                return index[keypath]
+            except (KeyError, TypeError):
+                pass
+
         if job is not None:
             cfg = self.cfg['history'][job]
         else:
             cfg = self.cfg
 
+        modified = False
         for key in keypath:
             if not isinstance(key, str):
                 raise TypeError(f'Invalid keypath {keypath}: key is not a string: {key}')
@@ -797,18 +1361,79 @@ class Schema:
                 raise ValueError(f'Invalid keypath {keypath}: unexpected key: {key}')
 
             if key in cfg:
-                cfg = cfg[key]
+                if writable and Schema._is_default_cfg(cfg[key]):
+                    cfg = Schema._get_writable(cfg, key)
+                    modified = True
+                else:
+                    cfg = cfg[key]
             elif 'default' in cfg:
                 if insert_defaults:
-                    cfg[key] = copy.deepcopy(cfg['default'])
-                    cfg = cfg[key]
+                    if Schema._is_default_cfg(cfg['default']):
+                        # Share the default until it gets copied below
+                        cfg[key] = cfg['default']
+                    else:
+                        cfg[key] = copy.deepcopy(cfg['default'])
+                    cfg = Schema._get_writable(cfg, key)
+                    modified = True
                 else:
+                    # The keypath is not part of the configuration, so there
+                    # is nothing to copy below this point.
                     cfg = cfg['default']
+                    writable = False
             else:
                 raise ValueError(f'Invalid keypath {keypath}: unexpected key: {key}')
 
+        if modified and keypath and keypath[0] == 'flowgraph':
+            # Nodes may have been added
+            self.__flowgraph_version = next(_FLOWGRAPH_VERSIONS)
+
+        if use_index:
+            if modified:
+                # Previous lookups may have resolved to a dictionary that has
+                # now been copied or to a 'default' that has been expanded.
+                self.__index.clear()
+            if writable:
+                self.__writable_index[keypath] = cfg
+            self.__index[keypath] = cfg
+
         return cfg
 
+    ###########################################################################
+    @staticmethod
+    def __is_flowgraph_edge(keypath):
+        # Keypaths of the 'input' parameters of the flowgraph, or above them
+        if not keypath:
+            return True
+        return keypath[0] == 'flowgraph' and (len(keypath) < 5 or keypath[4] == 'input')
+
+    ###########################################################################
+    def _flowgraph_version(self):
+        '''
+        Returns a number which changes each time nodes or edges of the
+        flowgraph may have been modified, so that structures computed from
+        the flowgraph can be reused until then. Versions are never reused,
+        even by other Schema objects.
+        '''
+        if self.__index_cfg is not self.cfg:
+            self._clear_index()
+        return self.__flowgraph_version
+
+    ###########################################################################
+    def _clear_index(self):
+        '''
+        Clears the keypath index used by _search().
+
+        This must be called whenever a part of the configuration is removed
+        or replaced without going through _search().
+        '''
+        # Lookups of any keypath
+        self.__index = {}
+        # Lookups that returned a dictionary which is safe to modify
+        self.__writable_index = {}
+        self.__index_cfg = self.cfg
+        # The configuration may have been replaced
+        self.__flowgraph_version = next(_FLOWGRAPH_VERSIONS)
+
     ###########################################################################
     def allkeys(self, *keypath_prefix):
         '''
@@ -857,14 +1482,58 @@ class Schema:
                 cfgdst[key] = {}
             self._copyparam(cfgsrc[key], cfgdst[key], keypath)
         else:
-            for key in cfgsrc.keys():
+            param = Schema._copy_leaf(cfgsrc)
+            for key in param.keys():
                 if key not in ('example', 'switch', 'help'):
-                    cfgdst[key] = copy.deepcopy(cfgsrc[key])
+                    cfgdst[key] = param[key]
 
     ###########################################################################
     def write_json(self, fout):
         fout.write(json.dumps(self.cfg, indent=4))
 
+    ###########################################################################
+    def write_msgpack(self, fout):
+        if not _has_msgpack:
+            raise ImportError('msgpack package required to write msgpack manifest')
+        fout.write(msgpack.packb(self.cfg))
+
+    ###########################################################################
+    def _write_pickle(self, fout):
+        '''
+        Writes the configuration in a binary format that can only be read by
+        _read_pickle() with the same version of siliconcompiler.
+
+        Parts of the configuration shared with the default configuration are
+        written as references, which get resolved against the default
+        configuration of the reading process. Only the parameters that have
+        been set are written out, so this is much faster to read than a
+        manifest.
+        '''
+        builder = type(self)._init_schema_cfg
+        if builder not in _DEFAULT_CFG_PATHS:
+            paths = {}
+
+            def register(cfg, path):
+                paths[id(cfg)] = path
+                if not Schema._is_leaf(cfg):
+                    for key, value in cfg.items():
+                        register(value, (*path, key))
+            register(self._default_cfg(), ())
+            _DEFAULT_CFG_PATHS[builder] = paths
+
+        _SchemaPickler(fout, _DEFAULT_CFG_PATHS[builder]).dump(self.cfg)
+
+    ###########################################################################
+    @classmethod
+    def _read_pickle(cls, fin, logger=None):
+        '''
+        Returns the schema written to fin by _write_pickle().
+        '''
+        schema = cls(logger=logger)
+        schema.cfg = _SchemaUnpickler(fin, schema._default_cfg()).load()
+        schema._clear_index()
+        return schema
+
     ###########################################################################
     def write_yaml(self, fout):
         if not _has_yaml:
@@ -944,7 +1613,11 @@ class Schema:
     ###########################################################################
     def copy(self):
         '''Returns deep copy of Schema object.'''
-        return Schema(cfg=self.cfg)
+        schema = Schema()
+        # Parts of the tree that are shared with the default configuration
+        # are never modified in place, so these do not need to be copied.
+        schema.cfg = Schema._copy_cfg(self.cfg, share_defaults=True)
+        return schema
 
     ###########################################################################
     def prune(self):
@@ -952,45 +1625,54 @@ class Schema:
 
         Also deletes 'help' and 'example' keys.
         '''
-        # When at top of tree loop maxdepth times to make sure all stale
-        # branches have been removed, not elegant, but stupid-simple
-        # "good enough"
-
-        # 10 should be enough for anyone...
-        maxdepth = 10
+        Schema.__prune(self.cfg)
+        self._clear_index()
 
-        for _ in range(maxdepth):
-            self._prune()
+    ###########################################################################
+    @staticmethod
+    def __prune(cfg):
+        for key in list(cfg.keys()):
+            if key == 'default':
+                # removing all default/template keys
+                del cfg[key]
+            elif Schema._is_leaf(cfg[key]):
+                leaf = Schema._get_writable(cfg, key)
+                leaf.pop('help', None)
+                leaf.pop('example', None)
+            else:
+                Schema.__prune(Schema._get_writable(cfg, key))
+                # removing stale branches
+                if not cfg[key]:
+                    del cfg[key]
 
     ###########################################################################
-    def _prune(self, *keypath):
+    def _pruned(self):
         '''
-        Internal recursive function that creates a local copy of the Chip
-        schema (cfg) with only essential non-empty parameters retained.
+        Returns a schema with the same content as a pruned copy of this
+        schema, without copying any parameter values.
 
+        The returned schema shares its values with this object, so it must
+        only be used for reading (ie. to write out a manifest).
         '''
-        cfg = self._search(*keypath)
+        schema = Schema(logger=self.logger)
+        schema.cfg = Schema.__pruned_cfg(self.cfg)
+        return schema
 
-        # Prune when the default & value are set to the following
-        # Loop through all keys starting at the top
-        for k in list(cfg.keys()):
-            # removing all default/template keys
-            # reached a default subgraph, delete it
-            if k == 'default':
-                del cfg[k]
-            # reached leaf-cell
-            elif 'help' in cfg[k].keys():
-                del cfg[k]['help']
-            elif 'example' in cfg[k].keys():
-                del cfg[k]['example']
-            elif Schema._is_leaf(cfg[k]):
-                pass
-            # removing stale branches
-            elif not cfg[k]:
-                cfg.pop(k)
-            # keep traversing tree
+    ###########################################################################
+    @staticmethod
+    def __pruned_cfg(cfg):
+        pruned = {}
+        for key, value in cfg.items():
+            if key == 'default':
+                continue
+            if Schema._is_leaf(value):
+                pruned[key] = {field: fieldvalue for field, fieldvalue in value.items()
+                               if field not in ('help', 'example')}
             else:
-                self._prune(*keypath, k)
+                value = Schema.__pruned_cfg(value)
+                if value:
+                    pruned[key] = value
+        return pruned
 
     ###########################################################################
     def _is_empty(self, *keypath):
@@ -1017,7 +1699,7 @@ class Schema:
             job (str): Name of historical job to return.
         '''
         if job not in self.cfg['history']:
-            self.cfg['history'][job] = self._init_schema_cfg()
+            self.cfg['history'][job] = self._new_schema_cfg()
 
         # Can't initialize Schema() by passing in cfg since it performs a deep
         # copy.
@@ -1043,6 +1725,11 @@ class Schema:
         # We have to remove the chip's logger before serializing the object
         # since the logger object is not serializable.
         del attributes['logger']
+
+        # The keypath index is rebuilt on demand.
+        del attributes['_Schema__index']
+        del attributes['_Schema__writable_index']
+        del attributes['_Schema__index_cfg']
         return attributes
 
     #######################################
@@ -1051,6 +1738,7 @@ class Schema:
 
         # Reinitialize logger on restore
         self._init_logger()
+        self._clear_index()
 
     #######################################
     def get_default(self, *keypath):
@@ -1441,7 +2129,8 @@ class Schema:
         Reads a manifest from disk and merges it with the current manifest.
 
         The file format read is determined by the filename suffix. Currently
-        json (*.json) and yaml(*.yaml) formats are supported.
+        json (*.json), yaml (*.yaml) and msgpack (*.msgpack) formats are
+        supported.
 
         Args:
             filename (filepath): Path to a manifest file to be loaded.
@@ -1516,3 +2205,30 @@ if _has_yaml:
     class YamlIndentDumper(yaml.Dumper):
         def increase_indent(self, flow=False, indentless=False):
             return super(YamlIndentDumper, self).increase_indent(flow, False)
+
+
+class _SchemaPickler(pickle.Pickler):
+    '''Pickler which references the parts of a default configuration.'''
+
+    def __init__(self, fout, default_paths):
+        super().__init__(fout, protocol=pickle.HIGHEST_PROTOCOL)
+        self.__default_paths = default_paths
+
+    def persistent_id(self, obj):
+        if type(obj) is dict:
+            return self.__default_paths.get(id(obj))
+        return None
+
+
+class _SchemaUnpickler(pickle.Unpickler):
+    '''Unpickler which resolves references written by _SchemaPickler.'''
+
+    def __init__(self, fin, default_cfg):
+        super().__init__(fin)
+        self.__default_cfg = default_cfg
+
+    def persistent_load(self, pid):
+        cfg = self.__default_cfg
+        for key in pid:
+            cfg = cfg[key]
+        return cfg
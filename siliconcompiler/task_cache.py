@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+
+from siliconcompiler import _metadata
+from siliconcompiler.package import get_cache_path
+
+# Directories of the node working directory that get stored in the cache,
+# in addition to the log files of the tool.
+CACHED_DIRS = ('outputs', 'reports')
+
+
+def get_key(chip, step, index, version):
+    '''
+    Returns the key of the results of a task in the cache.
+
+    The key is a hash of everything the results of a task are expected to
+    depend on: the configuration of the tool and task for the node, the tool
+    version, the values and file contents of the parameters required by the
+    task, and the files received from the input nodes.
+
+    Args:
+        chip (Chip): Chip of the node, after its inputs have been copied.
+        step (str): Step of the node.
+        index (str): Index of the node.
+        version (str): Version of the tool.
+    '''
+    flow = chip.get('option', 'flow')
+    tool, task = chip._get_tool_task(step, index, flow)
+
+    key = hashlib.sha256()
+
+    def update(*values):
+        key.update(json.dumps(values, sort_keys=True).encode())
+        key.update(b'\0')
+
+    update(_metadata.version, tool, task, step, index, version)
+
+    # Configuration of the tool and task, and parameters required by the
+    # task, ie. input files and libraries
+    for keypath, value_step, value_index in chip._get_task_keypaths(step, index):
+        update(keypath, chip.get(*keypath, step=value_step, index=value_index))
+
+        sctype = chip.get(*keypath, field='type')
+        if 'file' in sctype or 'dir' in sctype:
+            paths = chip._find_files(*keypath, missing_ok=True,
+                                     step=value_step, index=value_index)
+            if not isinstance(paths, list):
+                paths = [paths]
+            for path in paths:
+                update(path, _hash_path(path))
+
+    # Outputs of the input nodes
+    design = chip.get('design')
+    for path in _walk('inputs'):
+        if path != os.path.join('inputs', f'{design}.pkg.json'):
+            update(path, _hash_file(path))
+
+    return key.hexdigest()
+
+
+def get_node_values(chip, step, index):
+    '''
+    Returns the values of the parameters a task records for its node: the
+    metrics, the records and the parameters of its tool and task. Comparing
+    the values from before and after the task runs gives the values to
+    store in the cache.
+    '''
+    flow = chip.get('option', 'flow')
+    tool, task = chip._get_tool_task(step, index, flow)
+
+    values = {}
+    for prefix in (('metric',), ('record',), ('tool', tool, 'task', task)):
+        for keypath in chip.allkeys(*prefix):
+            keypath = (*prefix, *keypath)
+            if 'default' in keypath or chip.get(*keypath, field='pernode') == 'never':
+                continue
+            values[keypath] = chip.get(*keypath, step=step, index=index)
+    return values
+
+
+def restore(chip, step, index, key):
+    '''
+    Restores the results of a task from the cache: the files are copied
+    into the current working directory, and the values the task recorded
+    for its node (ie. metrics from its post-processing) are set again.
+
+    Returns:
+        True if the results were found in the cache.
+    '''
+    cache_dir = _get_cache_dir(chip)
+    try:
+        with open(_get_result_path(cache_dir, key)) as f:
+            result = json.load(f)
+        files = result['files']
+        values = result['values']
+    except (OSError, ValueError, KeyError):
+        return False
+
+    objects = {path: _get_object_path(cache_dir, digest) for path, digest in files.items()}
+    if not all(os.path.isfile(obj) for obj in objects.values()):
+        return False
+
+    for directory in CACHED_DIRS:
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory)
+    for path, obj in objects.items():
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.lexists(path):
+            os.remove(path)
+        # Copied instead of linked, so that the restored files can be
+        # modified without modifying the cache
+        shutil.copyfile(obj, path)
+
+    flow = chip.get('option', 'flow')
+    tool, task = chip._get_tool_task(step, index, flow)
+    for keypath, value in values:
+        keypath = tuple(keypath)
+        if value and keypath[:5] == ('tool', tool, 'task', task, 'report'):
+            # Only keep the reports of the working directory that were restored
+            value = [path for path in value
+                     if not _get_workdir_path(path) or _get_workdir_path(path) in files]
+        if value is None:
+            chip.unset(*keypath, step=step, index=index)
+        else:
+            chip.set(*keypath, value, step=step, index=index, clobber=True)
+    return True
+
+
+def store(chip, step, index, key, values):
+    '''
+    Stores the results of a task from the current working directory into
+    the cache. Files are stored once per content, and made read only.
+
+    Args:
+        values (dict): Values the task recorded for its node, by keypath,
+            see get_node_values().
+    '''
+    flow = chip.get('option', 'flow')
+    tool, task = chip._get_tool_task(step, index, flow)
+    design = chip.get('design')
+
+    paths = []
+    for directory in CACHED_DIRS:
+        for path in _walk(directory):
+            if path not in (os.path.join('outputs', f'{design}.pkg.json'),
+                            os.path.join('outputs', f'{design}.delta.pkg.json')):
+                paths.append(path)
+    for stream in ('stdout', 'stderr'):
+        suffix = chip.get('tool', tool, 'task', task, stream, 'suffix', step=step, index=index)
+        path = f'{step}.{suffix}'
+        if os.path.isfile(path) and path not in paths:
+            paths.append(path)
+    # Files of the working directory the reports recorded by the task point
+    # to, so that they are restored along with the values
+    for keypath, value in values.items():
+        if keypath[:5] != ('tool', tool, 'task', task, 'report'):
+            continue
+        for path in value:
+            path = _get_workdir_path(path)
+            if path and os.path.isfile(path) and path not in paths:
+                paths.append(path)
+
+    cache_dir = _get_cache_dir(chip)
+    files = {}
+    for path in paths:
+        digest = _hash_file(path)
+        files[path] = digest
+
+        obj = _get_object_path(cache_dir, digest)
+        if os.path.isfile(obj):
+            continue
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        _atomic_write(obj, lambda tmp: shutil.copy2(path, tmp))
+        os.chmod(obj, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+    result = _get_result_path(cache_dir, key)
+    os.makedirs(os.path.dirname(result), exist_ok=True)
+
+    def write_result(tmp):
+        with open(tmp, 'w') as f:
+            json.dump({'files': files,
+                       'values': [[list(keypath), value] for keypath, value in values.items()]},
+                      f, indent=2)
+    _atomic_write(result, write_result)
+
+
+def _get_workdir_path(path):
+    '''
+    Returns the normalized path of a file of the working directory, or None
+    if path is not relative to the working directory.
+    '''
+    if not path or os.path.isabs(path):
+        return None
+    path = os.path.normpath(path)
+    if path.startswith('..'):
+        return None
+    return path
+
+
+def _get_cache_dir(chip):
+    return os.path.join(get_cache_path(chip), 'tasks')
+
+
+def _get_result_path(cache_dir, key):
+    return os.path.join(cache_dir, 'results', key[:2], f'{key}.json')
+
+
+def _get_object_path(cache_dir, digest):
+    return os.path.join(cache_dir, 'objects', digest[:2], digest)
+
+
+def _atomic_write(path, write):
+    '''
+    Writes path with write(tmp_path), so that concurrent readers never see
+    a partial file.
+    '''
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _walk(directory):
+    '''Returns the files found under directory, sorted.'''
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def _hash_file(path):
+    hashobj = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            hashobj.update(block)
+    return hashobj.hexdigest()
+
+
+def _hash_path(path):
+    '''Returns the hash of a file, of the files in a directory, or None.'''
+    if not path:
+        return None
+    if os.path.isfile(path):
+        return _hash_file(path)
+    if os.path.isdir(path):
+        hashobj = hashlib.sha256()
+        for file in _walk(path):
+            hashobj.update(os.path.relpath(file, path).encode())
+            hashobj.update(_hash_file(file).encode())
+        return hashobj.hexdigest()
+    return None
@@ -0,0 +1,251 @@
+import itertools
+import mmap
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+
+from siliconcompiler.schema import Schema
+
+
+class WorkerPool:
+    '''
+    Pool of long-lived processes that run the nodes of a flowgraph.
+
+    Starting a new process for each node requires pickling the whole chip,
+    and importing siliconcompiler again in the new process. Instead, the
+    workers of a pool import siliconcompiler once and map the schema of the
+    chip once, see write_manifest(). Each node is then sent with only the
+    chip attributes that are not part of its schema.
+
+    Workers are started when the pool is created. If more nodes are started
+    than there are idle workers, new workers are added to the pool.
+
+    Args:
+        workers (int): Number of workers to start.
+    '''
+
+    def __init__(self, workers):
+        # Ensure we use spawn for multiprocessing so loggers initialized correctly
+        self.__multiprocessor = multiprocessing.get_context('spawn')
+        self.__idle = []
+        # Workers running a node
+        self.__busy = []
+        self.__manifest = None
+        # Number of running nodes using each manifest
+        self.__manifest_users = {}
+        # Chip whose schema changed since the manifest was written
+        self.__changed_chip = None
+        self.__manifest_ids = itertools.count()
+        self.__tmpdir = tempfile.mkdtemp(prefix='sc_pool_')
+
+        for _ in range(workers):
+            self.__idle.append(self.__start_worker())
+
+    def __start_worker(self):
+        conn, worker_conn = self.__multiprocessor.Pipe()
+        process = self.__multiprocessor.Process(target=_worker_main, args=(worker_conn,))
+        process.start()
+        worker_conn.close()
+        return process, conn
+
+    def write_manifest(self, chip):
+        '''
+        Writes the schema the workers build the chip of each node from.
+
+        The schema is written once in a binary file which only holds the
+        parameters that differ from the default configuration, see
+        Schema._write_pickle(). Workers map the file and build their schema
+        on top of their own copy of the default configuration.
+
+        This must be called before starting nodes, and again each time the
+        schema of the chip changes, see also schema_changed(). Previous
+        manifests are removed once no running node uses them.
+        '''
+        previous = self.__manifest
+        self.__changed_chip = None
+
+        # Use a new name, so workers know they need to read it again
+        self.__manifest = os.path.join(self.__tmpdir,
+                                       f'manifest_{next(self.__manifest_ids)}.pkl')
+        with open(self.__manifest, 'wb') as f:
+            chip.schema._write_pickle(f)
+
+        self.__remove_unused_manifest(previous)
+
+    def schema_changed(self, chip):
+        '''
+        Writes the manifest again once the next node starts, so that several
+        changes of the schema of the chip in a row only write it once.
+        '''
+        self.__changed_chip = chip
+
+    def Process(self, target, args=()):
+        '''
+        Returns a process-like object that runs a method of a chip in a
+        worker, once started.
+
+        Args:
+            target (method): Bound method of the chip to call.
+            args (tuple): Arguments of the method.
+        '''
+        return _WorkerTask(self, target, args)
+
+    def _acquire(self):
+        if self.__idle:
+            worker = self.__idle.pop()
+        else:
+            worker = self.__start_worker()
+        self.__busy.append(worker)
+        return worker
+
+    def _release(self, worker):
+        self.__busy.remove(worker)
+        self.__idle.append(worker)
+
+    def _discard(self, worker):
+        # The worker died, so it cannot be reused
+        self.__busy.remove(worker)
+        process, conn = worker
+        process.join()
+        conn.close()
+
+    def _get_manifest(self):
+        if not self.__manifest:
+            raise RuntimeError('write_manifest() must be called before starting nodes')
+        return self.__manifest
+
+    def _acquire_manifest(self):
+        if self.__changed_chip:
+            self.write_manifest(self.__changed_chip)
+        manifest = self._get_manifest()
+        self.__manifest_users[manifest] = self.__manifest_users.get(manifest, 0) + 1
+        return manifest
+
+    def _release_manifest(self, manifest):
+        self.__manifest_users[manifest] -= 1
+        self.__remove_unused_manifest(manifest)
+
+    def __remove_unused_manifest(self, manifest):
+        if manifest and manifest != self.__manifest and \
+                not self.__manifest_users.get(manifest):
+            self.__manifest_users.pop(manifest, None)
+            os.remove(manifest)
+
+    def shutdown(self):
+        '''
+        Stops the workers and removes the manifests. Workers still running a
+        node, ie. when the run was interrupted, are terminated, so that no
+        worker reads a manifest after it is removed.
+        '''
+        for process, conn in self.__idle:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, EOFError):
+                pass
+        for process, conn in self.__busy:
+            process.terminate()
+        for process, conn in self.__idle + self.__busy:
+            process.join()
+            conn.close()
+        self.__idle = []
+        self.__busy = []
+
+        shutil.rmtree(self.__tmpdir, ignore_errors=True)
+
+
+class _WorkerTask:
+    '''
+    Process-like object which runs its target in a worker of a pool. Its
+    sentinel can be used with multiprocessing.connection.wait().
+    '''
+
+    def __init__(self, pool, target, args):
+        self.__pool = pool
+        self.__chip = target.__self__
+        self.__method = target.__name__
+        self.__args = args
+        self.__worker = None
+        self.__manifest = None
+        self.exitcode = None
+
+    @property
+    def sentinel(self):
+        return self.__worker[1]
+
+    def start(self):
+        # The schema is read by the worker from the manifest of the pool,
+        # so only the other attributes of the chip need to be sent.
+        state = self.__chip.__getstate__()
+        del state['schema']
+
+        self.__manifest = self.__pool._acquire_manifest()
+        self.__worker = self.__pool._acquire()
+        self.__worker[1].send((type(self.__chip),
+                               state,
+                               self.__manifest,
+                               os.getcwd(),
+                               dict(os.environ),
+                               self.__method,
+                               self.__args))
+
+    def join(self):
+        process, conn = self.__worker
+        try:
+            self.exitcode = conn.recv()
+            self.__pool._release(self.__worker)
+        except EOFError:
+            self.__pool._discard(self.__worker)
+            self.exitcode = process.exitcode
+            if not self.exitcode or self.exitcode < 0:
+                self.exitcode = 1
+        self.__pool._release_manifest(self.__manifest)
+
+
+def _worker_main(conn):
+    schema = None
+    manifest = None
+
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        chip_class, state, task_manifest, cwd, environ, method, args = task
+
+        # Reading the schema is the expensive part of building the chip,
+        # so it is only done once per manifest.
+        if task_manifest != manifest:
+            with open(task_manifest, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                schema = Schema._read_pickle(data)
+            manifest = task_manifest
+
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(environ)
+
+        chip = chip_class.__new__(chip_class)
+        state['schema'] = schema.copy()
+        chip.__setstate__(state)
+
+        exitcode = 0
+        try:
+            getattr(chip, method)(*args)
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                exitcode = e.code
+            elif e.code is not None:
+                exitcode = 1
+        except Exception:
+            traceback.print_exc()
+            exitcode = 1
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        conn.send(exitcode)
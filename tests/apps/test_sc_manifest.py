@@ -0,0 +1,34 @@
+import json
+
+import siliconcompiler
+from siliconcompiler.apps import sc_manifest
+
+
+def test_sc_manifest(monkeypatch):
+    '''Test converting a manifest to msgpack and back'''
+    chip = siliconcompiler.Chip('test')
+    chip.input('test.v')
+    chip.set('constraint', 'outline', [(0, 0), (10, 10)])
+    chip.write_manifest('test.pkg.json')
+
+    monkeypatch.setattr('sys.argv', ['sc-manifest',
+                                     '-input', 'test.pkg.json',
+                                     '-output', 'test.pkg.msgpack'])
+    assert sc_manifest.main() == 0
+
+    monkeypatch.setattr('sys.argv', ['sc-manifest',
+                                     '-input', 'test.pkg.msgpack',
+                                     '-output', 'test_out.pkg.json'])
+    assert sc_manifest.main() == 0
+
+    with open('test.pkg.json') as f:
+        expected = json.load(f)
+    with open('test_out.pkg.json') as f:
+        assert json.load(f) == expected
+
+
+def test_sc_manifest_missing_input(monkeypatch):
+    monkeypatch.setattr('sys.argv', ['sc-manifest',
+                                     '-input', 'missing.pkg.json',
+                                     '-output', 'test.pkg.msgpack'])
+    assert sc_manifest.main() == 1
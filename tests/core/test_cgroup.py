@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+import siliconcompiler
+from siliconcompiler import cgroup
+from siliconcompiler._common import SiliconCompilerError
+
+import tests.core.tools.run.run as run
+
+
+def _make_parent(path, controllers='cpu memory'):
+    os.makedirs(path)
+    with open(os.path.join(path, 'cgroup.controllers'), 'w') as f:
+        f.write(f'{controllers}\n')
+    with open(os.path.join(path, 'cgroup.subtree_control'), 'w') as f:
+        f.write('\n')
+
+
+def _read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_cgroup_create():
+    _make_parent('parent')
+    assert cgroup.is_cgroup_v2('parent')
+
+    node_cgroup = cgroup.Cgroup('parent', 'node', memory=1024 * 1024, cores=2)
+    node_cgroup.create()
+
+    assert _read('parent/cgroup.subtree_control') == '+memory +cpu'
+    assert _read('parent/node/memory.max') == str(1024 * 1024)
+    assert _read('parent/node/cpu.max') == f'200000 {cgroup.CPU_PERIOD}'
+
+    assert node_cgroup.get_oom_kills() == 0
+    with open('parent/node/memory.events', 'w') as f:
+        f.write('low 0\nhigh 0\nmax 4\noom 1\noom_kill 1\n')
+    assert node_cgroup.get_oom_kills() == 1
+
+
+def test_cgroup_missing_controller():
+    _make_parent('parent', controllers='memory')
+
+    with pytest.raises(OSError):
+        cgroup.Cgroup('parent', 'node', cores=2).create()
+    assert not os.path.exists('parent/node')
+
+
+def test_cgroup_oom():
+    _make_parent('parent')
+
+    # The cgroup only holds plain files here, so the tool reports being killed
+    # for running out of memory itself
+    with open('tool.sh', 'w') as f:
+        f.write(f'for node in {os.path.abspath("parent")}/sc_*; do\n'
+                '  printf "oom_kill 1\\n" > $node/memory.events\n'
+                'done\n'
+                'exit 137\n')
+
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+    flow = siliconcompiler.Flow(chip, 'testflow')
+    flow.node('testflow', 'run', run)
+    chip.use(flow)
+    chip.set('option', 'flow', 'testflow')
+    chip.set('option', 'quiet', True)
+    chip.set('tool', 'run', 'task', 'run', 'option', os.path.abspath('tool.sh'))
+
+    chip.set('option', 'scheduler', 'cgroup', os.path.abspath('parent'))
+    chip.set('option', 'scheduler', 'memory', 100)
+    chip.set('option', 'scheduler', 'cores', 1)
+
+    with pytest.raises(SiliconCompilerError):
+        chip.run()
+
+    node_cgroups = [name for name in os.listdir('parent') if name.startswith('sc_')]
+    assert len(node_cgroups) == 1
+    node_cgroup = os.path.join('parent', node_cgroups[0])
+    assert _read(os.path.join(node_cgroup, 'memory.max')) == str(100 * 1024 * 1024)
+    assert _read(os.path.join(node_cgroup, 'cpu.max')) == f'100000 {cgroup.CPU_PERIOD}'
+    # The tool was moved into the cgroup before it was executed
+    assert _read(os.path.join(node_cgroup, 'cgroup.procs')).isdigit()
+
+    workdir = chip._getworkdir(step='run', index='0')
+    node = siliconcompiler.Chip('test')
+    node.read_manifest(os.path.join(workdir, 'outputs', 'test.pkg.json'))
+    assert node.get('record', 'failure', step='run', index='0') == 'oom'
@@ -38,6 +38,54 @@ def test_check_logfile(datadir, caplog):
         assert warning_with_line_number in file.read()
 
 
+def test_check_logfile_suffixes():
+    chip = siliconcompiler.Chip('gcd')
+    chip.load_target('freepdk45_demo')
+
+    for suffix, regex in (('errors', 'ERROR'),
+                          ('warnings', '-i warning'),
+                          ('warnings', '-v -w DPL'),
+                          ('other', '-v WARNING')):
+        chip.add('tool', 'openroad', 'task', 'place', 'regex', suffix, regex,
+                 step='place', index='0')
+
+    with open('place.log', 'w') as f:
+        for n in range(1, 13):
+            f.write(f'line {n}\n')
+        f.write('[WARNING DPL-0001] dpl\n')
+        f.write('[warning GRT-0002] grt\n')
+        f.write('[ERROR GRT-0003] error\n')
+
+    matches = chip.check_logfile(step='place', logfile='place.log', display=False)
+    assert matches == {'other': 14, 'warnings': 1, 'errors': 1}
+
+    with open('place.warnings') as f:
+        assert f.read() == '14: [warning GRT-0002] grt\n'
+    with open('place.errors') as f:
+        assert f.read() == '15: [ERROR GRT-0003] error\n'
+    with open('place.other') as f:
+        assert f.readline() == ' 1: line 1\n'
+
+
+def test_check_logfile_backreference():
+    chip = siliconcompiler.Chip('gcd')
+    chip.load_target('freepdk45_demo')
+
+    # Backreferences must still match when the patterns are prefiltered together
+    chip.set('tool', 'openroad', 'task', 'place', 'regex', 'errors', r'(foo)\1',
+             step='place', index='0')
+    chip.set('tool', 'openroad', 'task', 'place', 'regex', 'warnings', r'(bar)\1',
+             step='place', index='0')
+
+    with open('place.log', 'w') as f:
+        f.write('foobar\n')
+        f.write('barbar\n')
+        f.write('foofoo\n')
+
+    matches = chip.check_logfile(step='place', logfile='place.log', display=False)
+    assert matches == {'errors': 1, 'warnings': 1}
+
+
 #########################
 if __name__ == "__main__":
     from tests.fixtures import datadir
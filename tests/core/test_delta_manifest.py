@@ -0,0 +1,42 @@
+import os
+
+import siliconcompiler
+from siliconcompiler import NodeStatus
+from siliconcompiler.schema import Schema
+from siliconcompiler.tools.builtin import nop
+
+
+def test_delta_manifest():
+    chip = siliconcompiler.Chip('test')
+    chip.load_target('freepdk45_demo')
+    chip.input('fake.v')
+    with open('fake.v', 'w') as f:
+        f.write('// fake')
+
+    flow = 'test'
+    chip.set('option', 'flow', flow)
+    chip.node(flow, 'import', nop)
+    chip.node(flow, 'nop1', nop)
+    chip.node(flow, 'nop2', nop)
+    chip.edge(flow, 'import', 'nop1')
+    chip.edge(flow, 'nop1', 'nop2')
+    chip.set('option', 'quiet', True)
+
+    chip.run()
+
+    workdir = chip._getworkdir(step='nop2', index='0')
+    delta = os.path.join(workdir, 'outputs', 'test.delta.pkg.json')
+    assert os.path.isfile(delta)
+    assert os.path.isfile(os.path.join(workdir, 'outputs', 'test.pkg.json'))
+    assert not os.path.exists(os.path.join(workdir, 'inputs', 'test.delta.pkg.json'))
+
+    # Delta manifest carries the results of the previous nodes
+    schema = Schema(manifest=delta)
+    assert 'input' not in schema.getkeys()
+    assert schema.get('flowgraph', flow, 'nop1', '0', 'status') == NodeStatus.SUCCESS
+    assert schema.get('metric', 'tasktime', step='import', index='0') is not None
+
+    # Results are merged back into the chip
+    for step in ('import', 'nop1', 'nop2'):
+        assert chip.get('flowgraph', flow, step, '0', 'status') == NodeStatus.SUCCESS
+        assert chip.get('metric', 'tasktime', step=step, index='0') is not None
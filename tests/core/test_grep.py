@@ -0,0 +1,21 @@
+import pytest
+
+import siliconcompiler
+
+
+@pytest.mark.parametrize('args,line,selected', [
+    ('WARNING', '[WARNING GRT-0043] No vias', True),
+    ('-v WARNING', '[WARNING GRT-0043] No vias', False),
+    ('warning', '[WARNING GRT-0043] No vias', False),
+    ('-i warning', '[WARNING GRT-0043] No vias', True),
+    ('-v -i warning', '[WARNING GRT-0043] No vias', False),
+    ('-x WARNING', '[WARNING GRT-0043] No vias', False),
+    ('-x \\[WARNING.*', '[WARNING GRT-0043] No vias\n', True),
+    ('-w WARN', '[WARNING GRT-0043] No vias', False),
+    ('-w WARNING', '[WARNING GRT-0043] No vias', True),
+    ('-e -0043', '[WARNING GRT-0043] No vias', True),
+    ('-e -v', '[WARNING GRT-0043] No vias', False),
+])
+def test_grep(args, line, selected):
+    chip = siliconcompiler.Chip('test')
+    assert chip.grep(args, line) == (line if selected else None)
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+import siliconcompiler
+from siliconcompiler._common import SiliconCompilerError
+
+import tests.core.tools.run.run as run
+
+
+def _run(counter, values, dryrun=False, jobincr=False):
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+    chip.set('option', 'incremental', True)
+    chip.set('option', 'dryrun', dryrun)
+    chip.set('option', 'jobincr', jobincr)
+    chip.set('option', 'quiet', True)
+
+    with open('tool.sh', 'w') as f:
+        f.write(f'echo "$2" >> {counter}\n')
+        f.write('echo "$1" > outputs/test.txt\n')
+
+    flow = 'test'
+    for step in ('first', 'second'):
+        chip.node(flow, step, run)
+        chip.set('tool', 'run', 'task', 'run', 'option',
+                 [os.path.abspath('tool.sh'), values[step], step],
+                 step=step, index='0')
+    chip.edge(flow, 'first', 'second')
+    chip.set('option', 'flow', flow)
+    chip.run()
+    return chip
+
+
+def test_incremental():
+    counter = os.path.abspath('counter.txt')
+
+    def runs():
+        if not os.path.isfile(counter):
+            return []
+        with open(counter) as f:
+            return f.read().splitlines()
+
+    _run(counter, {'first': 'a', 'second': 'a'})
+    assert runs() == ['first', 'second']
+
+    # Nothing changed, nothing runs
+    chip = _run(counter, {'first': 'a', 'second': 'a'})
+    assert runs() == ['first', 'second']
+    assert chip.get('flowgraph', 'test', 'second', '0', 'status') == \
+        siliconcompiler.NodeStatus.SUCCESS
+
+    # Only the changed node runs
+    _run(counter, {'first': 'a', 'second': 'b'})
+    assert runs() == ['first', 'second', 'second']
+
+    # Changes propagate to the nodes that depend on the changed node
+    _run(counter, {'first': 'b', 'second': 'b'})
+    assert runs() == ['first', 'second', 'second', 'first', 'second']
+
+
+def test_incremental_dryrun(capfd):
+    counter = os.path.abspath('counter.txt')
+
+    _run(counter, {'first': 'a', 'second': 'a'})
+    capfd.readouterr()
+
+    _run(counter, {'first': 'a', 'second': 'b'}, dryrun=True)
+    with open(counter) as f:
+        assert f.read().splitlines() == ['first', 'second']
+
+    out, _ = capfd.readouterr()
+    assert 'Dry run: 1 node(s) would run' in out
+    assert 'second0: [tool,run,task,run,option] changed' in out
+    assert 'Up to date: first0' in out
+
+
+def test_incremental_dryrun_jobincr(capfd):
+    counter = os.path.abspath('counter.txt')
+
+    _run(counter, {'first': 'a', 'second': 'a'}, jobincr=True)
+    capfd.readouterr()
+
+    # The dry run reports on the last job instead of starting a new one
+    chip = _run(counter, {'first': 'a', 'second': 'a'}, dryrun=True, jobincr=True)
+    assert chip.get('option', 'jobname') == 'job0'
+
+    out, _ = capfd.readouterr()
+    assert 'Up to date: first0, second0' in out
+
+
+def test_dryrun_remote():
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+    chip.set('option', 'dryrun', True)
+    chip.set('option', 'remote', True)
+    chip.node('test', 'first', run)
+    chip.set('option', 'flow', 'test')
+
+    with pytest.raises(SiliconCompilerError, match='dryrun'):
+        chip.run()
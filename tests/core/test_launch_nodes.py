@@ -0,0 +1,215 @@
+import multiprocessing
+import os
+import time
+
+import psutil
+import pytest
+
+import siliconcompiler
+from siliconcompiler import NodeStatus
+from siliconcompiler.tools.builtin import nop
+
+import tests.core.tools.run.run as run
+
+
+@pytest.mark.parametrize('pool,pipeline', [(False, False), (True, False), (True, True)])
+def test_launch_nodes_failure(datadir, pool, pipeline):
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+    chip.set('option', 'scheduler', 'pool', pool)
+    chip.set('option', 'scheduler', 'pipeline', pipeline)
+
+    flow = 'test'
+    chip.node(flow, 'import', nop)
+    chip.node(flow, 'fail', run)
+    chip.node(flow, 'after', run)
+    chip.node(flow, 'ok', nop)
+    chip.node(flow, 'done', nop)
+    chip.edge(flow, 'import', 'fail')
+    chip.edge(flow, 'fail', 'after')
+    chip.edge(flow, 'import', 'ok')
+    chip.edge(flow, 'ok', 'done')
+    chip.set('option', 'flow', flow)
+    chip.set('option', 'quiet', True)
+
+    chip.set('tool', 'run', 'task', 'run', 'option', os.path.join(datadir, 'failing_tool.sh'))
+
+    with pytest.raises(siliconcompiler.SiliconCompilerError,
+                       match=r"final steps could not be reached: \['after'\]"):
+        chip.run()
+
+    # Nodes after the failure are never launched, the other branch completes
+    assert not os.path.exists(chip._getworkdir(step='after', index='0'))
+    for step in ('import', 'ok', 'done'):
+        assert os.path.isfile(os.path.join(chip._getworkdir(step=step, index='0'),
+                                           'outputs', 'test.pkg.json'))
+
+
+def test_launch_nodes_pipeline_setup_failure():
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+    chip.set('option', 'scheduler', 'pipeline', True)
+
+    flow = 'test'
+    chip.node(flow, 'import', nop)
+    chip.node(flow, 'fail', run)
+    chip.node(flow, 'after', nop)
+    chip.node(flow, 'ok', nop)
+    chip.edge(flow, 'import', 'fail')
+    chip.edge(flow, 'fail', 'after')
+    chip.edge(flow, 'import', 'ok')
+    chip.set('option', 'flow', flow)
+    chip.set('option', 'quiet', True)
+
+    # Only the setup of the failing node is invalid
+    chip.set('tool', 'run', 'task', 'run', 'require', 'option,define', step='fail', index='0')
+
+    with pytest.raises(siliconcompiler.SiliconCompilerError,
+                       match=r"final steps could not be reached: \['after'\]"):
+        chip.run()
+
+    # The failing node is never launched, the other branch completes
+    assert not os.path.exists(chip._getworkdir(step='fail', index='0'))
+    for step in ('import', 'ok'):
+        assert os.path.isfile(os.path.join(chip._getworkdir(step=step, index='0'),
+                                           'outputs', 'test.pkg.json'))
+
+
+class _Process:
+    '''Process that records how many processes run at the same time'''
+
+    running = 0
+    max_running = 0
+    started = []
+
+    def __init__(self, node=None):
+        self.node = node
+        self.process = multiprocessing.get_context('spawn').Process(target=time.sleep,
+                                                                    args=(0.1,))
+
+    @property
+    def sentinel(self):
+        return self.process.sentinel
+
+    @property
+    def exitcode(self):
+        return self.process.exitcode
+
+    def start(self):
+        _Process.running += 1
+        _Process.max_running = max(_Process.max_running, _Process.running)
+        _Process.started.append(self.node)
+        self.process.start()
+
+    def join(self):
+        self.process.join()
+        _Process.running -= 1
+
+
+def _launch_parallel_nodes(chip, n):
+    flow = 'test'
+    chip.node(flow, 'import', nop)
+    for i in range(n):
+        chip.node(flow, 'run', nop, index=i)
+        chip.edge(flow, 'import', 'run', head_index=i)
+    chip.set('option', 'flow', flow)
+
+    nodes = [('import', '0')] + [('run', str(i)) for i in range(n)]
+    nodes_to_run = {node: [] if node[0] == 'import' else [('import', '0')] for node in nodes}
+    processes = {node: _Process() for node in nodes}
+    status = {node: NodeStatus.PENDING for node in nodes}
+
+    _Process.running = 0
+    _Process.max_running = 0
+    chip._launch_nodes(nodes_to_run, processes, status)
+
+    assert all(node_status == NodeStatus.SUCCESS for node_status in status.values())
+    return _Process.max_running
+
+
+def test_launch_nodes_maxnodes(monkeypatch):
+    monkeypatch.setattr(psutil, 'cpu_count', lambda: 16)
+
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'scheduler', 'maxnodes', 2)
+    assert _launch_parallel_nodes(chip, 4) == 2
+
+
+def test_launch_nodes_resources():
+    chip = siliconcompiler.Chip('test')
+    # Each node needs all the cores
+    chip.set('option', 'scheduler', 'cores', psutil.cpu_count(), step='run')
+    assert _launch_parallel_nodes(chip, 3) == 1
+
+    chip = siliconcompiler.Chip('test')
+    # Node needs more memory than available, but still runs by itself
+    memory = psutil.virtual_memory().total // (1024 * 1024)
+    chip.set('option', 'scheduler', 'memory', memory + 1, step='run')
+    assert _launch_parallel_nodes(chip, 2) == 1
+
+
+def test_launch_nodes_tool_threads():
+    chip = siliconcompiler.Chip('test')
+    # Tool threads are not a reservation, nodes using all the cores still
+    # run in parallel
+    chip.set('tool', 'builtin', 'task', 'nop', 'threads', psutil.cpu_count())
+    assert _launch_parallel_nodes(chip, 3) == 3
+
+
+def test_launch_nodes_criticalpath():
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'scheduler', 'maxnodes', 1)
+
+    # 'long' and 'tail' form the critical path, even though 'short' is queued first
+    nodes_to_run = {
+        ('import', '0'): [],
+        ('short', '0'): [('import', '0')],
+        ('long', '0'): [('import', '0')],
+        ('tail', '0'): [('long', '0')]
+    }
+    runtimes = {
+        ('import', '0'): 1,
+        ('short', '0'): 3,
+        ('long', '0'): 2,
+        ('tail', '0'): 4
+    }
+    assert chip._get_node_priorities(nodes_to_run, runtimes) == {
+        ('import', '0'): 7,
+        ('short', '0'): 3,
+        ('long', '0'): 6,
+        ('tail', '0'): 4
+    }
+
+    flow = 'test'
+    for step, _ in nodes_to_run:
+        chip.node(flow, step, nop)
+    chip.set('option', 'flow', flow)
+
+    processes = {node: _Process(node) for node in nodes_to_run}
+    status = {node: NodeStatus.PENDING for node in nodes_to_run}
+    _Process.started = []
+    chip._launch_nodes(nodes_to_run, processes, status, runtimes=runtimes)
+    assert _Process.started == [('import', '0'), ('long', '0'), ('tail', '0'), ('short', '0')]
+
+
+def test_estimate_node_runtimes():
+    chip = siliconcompiler.Chip('test')
+    flow = 'test'
+    chip.node(flow, 'import', nop)
+    chip.node(flow, 'syn', nop)
+    chip.edge(flow, 'import', 'syn')
+    chip.set('option', 'flow', flow)
+
+    chip.set('metric', 'tasktime', 3.0, step='import', index='0')
+    chip.set('metric', 'tasktime', 1.0, step='syn', index='0')
+    chip.schema.record_history()
+    chip.set('option', 'jobname', 'job1')
+    chip.unset('metric', 'tasktime', step='import', index='0')
+    chip.set('metric', 'tasktime', 5.0, step='syn', index='0')
+    chip.schema.record_history()
+
+    # Most recent job first, falling back to earlier jobs
+    assert chip._estimate_node_runtimes(flow) == {
+        ('import', '0'): 3.0,
+        ('syn', '0'): 5.0
+    }
@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+import siliconcompiler
+from siliconcompiler._common import SiliconCompilerError
+
+import tests.core.tools.run.run as run
+
+
+def _make_chip(script):
+    with open('tool.sh', 'w') as f:
+        f.write(script)
+
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+
+    flow = siliconcompiler.Flow(chip, 'testflow')
+    flow.node('testflow', 'run', run)
+    chip.use(flow)
+    chip.set('option', 'flow', 'testflow')
+    chip.set('option', 'quiet', True)
+
+    chip.set('tool', 'run', 'task', 'run', 'option', os.path.abspath('tool.sh'))
+    chip.set('tool', 'run', 'task', 'run', 'regex', 'errors', 'ERROR')
+    chip.set('tool', 'run', 'task', 'run', 'regex', 'warnings', 'WARNING')
+    return chip
+
+
+def _read_node_manifest(chip):
+    workdir = chip._getworkdir(step='run', index='0')
+    node = siliconcompiler.Chip('test')
+    node.read_manifest(os.path.join(workdir, 'outputs', 'test.pkg.json'))
+    return workdir, node
+
+
+def test_maxerrors():
+    chip = _make_chip('echo WARNING 1\n'
+                      'echo ERROR 1\n'
+                      'echo ERROR 2\n'
+                      'sleep 600\n')
+    chip.set('option', 'maxerrors', 2)
+
+    start = time.time()
+    with pytest.raises(SiliconCompilerError):
+        chip.run()
+    assert time.time() - start < 300
+
+    workdir, node = _read_node_manifest(chip)
+    assert node.get('flowgraph', 'testflow', 'run', '0', 'status') == \
+        siliconcompiler.NodeStatus.ERROR
+    assert node.get('metric', 'errors', step='run', index='0') == 2
+    assert node.get('metric', 'warnings', step='run', index='0') == 1
+
+    with open(os.path.join(workdir, 'run.errors')) as f:
+        assert f.read().splitlines() == ['2: ERROR 1', '3: ERROR 2']
+
+
+def test_live_log_check():
+    # Log checked while the tool runs is reported as if checked afterwards
+    chip = _make_chip(''.join(f'echo line {n}\n' for n in range(9)) +
+                      'echo ERROR 1\n'
+                      'printf "WARNING 1"\n')
+    chip.set('option', 'flowcontinue', True)
+
+    chip.run()
+
+    workdir, node = _read_node_manifest(chip)
+    assert node.get('metric', 'errors', step='run', index='0') == 1
+    assert node.get('metric', 'warnings', step='run', index='0') == 1
+
+    with open(os.path.join(workdir, 'run.errors')) as f:
+        assert f.read().splitlines() == ['10: ERROR 1']
+    with open(os.path.join(workdir, 'run.warnings')) as f:
+        assert f.read().splitlines() == ['11: WARNING 1']
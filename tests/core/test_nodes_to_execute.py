@@ -360,3 +360,55 @@ def test_nodes_to_execute_different_flow_from_to():
         ('G', '0'),
         ('H', '0')
     ]
+
+
+def test_nodes_to_execute_diamonds():
+    '''
+    Check that chained diamonds do not make the number of paths explode
+    start -- left0 -- join0 -- left1 -- join1 ...
+        |           |     |           |
+        -- right0 ---     -- right1 ---
+    '''
+    chip = siliconcompiler.Chip('test')
+    flow = 'test'
+
+    prev = 'start'
+    chip.node(flow, prev, nop)
+    for n in range(40):
+        for side in ('left', 'right'):
+            chip.node(flow, f'{side}{n}', nop)
+            chip.edge(flow, prev, f'{side}{n}')
+        chip.node(flow, f'join{n}', join)
+        chip.edge(flow, f'left{n}', f'join{n}')
+        chip.edge(flow, f'right{n}', f'join{n}')
+        prev = f'join{n}'
+
+    chip.set('option', 'flow', flow)
+
+    nodes = chip.nodes_to_execute()
+    assert len(nodes) == 1 + 3 * 40
+    assert nodes[:4] == [('start', '0'), ('left0', '0'), ('join0', '0'), ('left1', '0')]
+
+
+def test_nodes_to_execute_flowgraph_changes():
+    '''
+    Check that the flowgraph is not cached across edits
+    A -- B    C
+    '''
+    chip = siliconcompiler.Chip('test')
+    flow = 'test'
+
+    chip.node(flow, 'A', nop)
+    chip.node(flow, 'B', nop)
+    chip.edge(flow, 'A', 'B')
+    chip.set('option', 'flow', flow)
+    chip.set('option', 'from', 'A')
+
+    assert chip.nodes_to_execute() == [('A', '0'), ('B', '0')]
+
+    chip.node(flow, 'C', nop)
+    chip.edge(flow, 'B', 'C')
+    assert chip.nodes_to_execute() == [('A', '0'), ('B', '0'), ('C', '0')]
+
+    chip.set('flowgraph', flow, 'C', '0', 'input', [])
+    assert chip.nodes_to_execute() == [('A', '0'), ('B', '0')]
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import siliconcompiler
+from siliconcompiler import output_stream
+
+
+def test_start_reader():
+    siliconcompiler.Chip('test')  # registers the codec error handlers
+
+    lines = []
+    proc = subprocess.Popen([sys.executable, '-c',
+                             'import sys; print("out1"); print("x" * 100000); '
+                             'sys.stdout.write("out2")'],
+                            stdout=subprocess.PIPE)
+    with open('run.log', 'wb') as writer:
+        reader = output_stream.start_reader(proc.stdout, writer, lines.append)
+        proc.wait()
+        reader.join()
+
+    # Long lines are split to bound buffering
+    assert lines[0] == 'out1'
+    assert lines[1:-1] == ['x' * output_stream.MAX_LINE_SIZE,
+                           'x' * (100000 - output_stream.MAX_LINE_SIZE)]
+    assert lines[-1] == 'out2'
+    with open('run.log') as f:
+        assert f.read() == f'out1\n{"x" * 100000}\nout2'
+
+
+def test_rate_limited_echo():
+    lines = []
+    echo = output_stream.RateLimitedEcho(lines.append, max_lines=3, interval=3600)
+    for n in range(10):
+        echo(f'line {n}')
+    echo.close()
+
+    assert lines == ['line 0', 'line 1', 'line 2',
+                     '... 7 lines not displayed, see the log file']
@@ -78,6 +78,19 @@ def test_read_job():
     assert chip2.get('input', 'rtl', 'verilog', job='job1', step='import', index=0) == ['foo.v']
 
 
+def test_read_include():
+    '''Make sure that only the requested keypaths get read'''
+    chip = siliconcompiler.Chip('foo')
+    chip.input('foo.v')
+    chip.set('option', 'jobname', 'test')
+    chip.write_manifest('tmp.json')
+
+    chip2 = siliconcompiler.Chip('foo')
+    chip2.read_manifest('tmp.json', include=[['input', 'rtl']])
+    assert chip2.get('input', 'rtl', 'verilog', step='import', index=0) == ['foo.v']
+    assert chip2.get('option', 'jobname') == 'job0'
+
+
 #########################
 if __name__ == "__main__":
     from tests.fixtures import datadir
@@ -0,0 +1,98 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from siliconcompiler import resource_sampler
+
+
+def test_resource_sampler():
+    sampler = resource_sampler.ResourceSampler()
+
+    proc = subprocess.Popen([sys.executable, '-c', '''
+import os
+import threading
+import time
+data = b'x' * (64 * 1024 * 1024)
+event = threading.Event()
+threads = [threading.Thread(target=event.wait) for _ in range(4)]
+for thread in threads:
+    thread.start()
+end = time.process_time() + 0.5
+while time.process_time() < end:
+    pass
+event.set()
+'''])
+    while proc.poll() is None:
+        sampler.sample(proc.pid)
+        time.sleep(0.05)
+    sampler.finish()
+
+    assert sampler.memory > 64 * 1024 * 1024
+    assert sampler.threads >= 5
+    assert sampler.cputime >= 0.5
+
+
+def test_resource_sampler_iobytes():
+    if resource_sampler.resource is None:
+        pytest.skip('getrusage() is not available')
+    blocks = resource_sampler.resource.getrusage(
+        resource_sampler.resource.RUSAGE_CHILDREN).ru_oublock
+
+    sampler = resource_sampler.ResourceSampler()
+    proc = subprocess.Popen([sys.executable, '-c', '''
+import os
+with open('data.bin', 'wb') as f:
+    f.write(os.urandom(1024 * 1024))
+    f.flush()
+    os.fsync(f.fileno())
+'''])
+    while proc.poll() is None:
+        sampler.sample(proc.pid)
+        time.sleep(0.05)
+    sampler.finish()
+
+    if resource_sampler.resource.getrusage(
+            resource_sampler.resource.RUSAGE_CHILDREN).ru_oublock == blocks:
+        pytest.skip('Blocks written are not reported by this file system')
+    assert sampler.iobytes >= 1024 * 1024
+
+
+def test_resource_sampler_interval():
+    sampler = resource_sampler.ResourceSampler()
+
+    proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    try:
+        sampler.sample(proc.pid)
+        threads = sampler.threads
+        assert threads >= 1
+
+        # The next sample is not due yet
+        sampler.threads = 0
+        sampler.sample(proc.pid)
+        assert sampler.threads == 0
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def test_cgroup_source():
+    with open('memory.current', 'w') as f:
+        f.write('1000\n')
+    with open('memory.peak', 'w') as f:
+        f.write('5000\n')
+    with open('cpu.stat', 'w') as f:
+        f.write('usage_usec 2500000\nuser_usec 2000000\nsystem_usec 500000\n')
+
+    assert resource_sampler.CgroupSource.is_available('.')
+    sampler = resource_sampler.ResourceSampler(cgroup='.')
+
+    proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+    sampler.sample(proc.pid)
+    proc.wait()
+    assert sampler.memory in (0, 1000)
+
+    sampler.finish()
+    assert sampler.memory == 5000
+    assert sampler.cputime == 2.5
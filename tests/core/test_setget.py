@@ -275,6 +275,46 @@ def test_set_package_multiple_files():
         [None, None, 'dep']
 
 
+def test_set_many():
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'jobname', True, field='lock')
+    chip.set_many([('input', 'rtl', 'verilog', 'abcd'),
+                   ('option', 'jobname', 'job1'),
+                   ('option', 'quiet', 'true')],
+                  package='dep')
+
+    assert chip.get('input', 'rtl', 'verilog', step='syn', index=0) == ['abcd']
+    assert chip.get('input', 'rtl', 'verilog', step='syn', index=0, field='package') == ['dep']
+    assert chip.get('option', 'jobname') == 'job0'
+    assert chip.get('option', 'quiet', step='syn', index=0) is True
+
+    # Nothing gets set if one of the values is invalid
+    with pytest.raises(siliconcompiler.SiliconCompilerError):
+        chip.set_many([('option', 'quiet', False),
+                       ('option', 'remote', 'xyz')])
+    assert chip.get('option', 'quiet', step='syn', index=0) is True
+
+    # New keys are not inserted either
+    with pytest.raises(siliconcompiler.SiliconCompilerError):
+        chip.set_many([('tool', 'newtool', 'exe', 'newtool'),
+                       ('option', 'remote', 'xyz')])
+    assert 'newtool' not in chip.getkeys('tool')
+
+    # Nor if a package is invalid
+    with pytest.raises(siliconcompiler.SiliconCompilerError):
+        chip.set_many([('option', 'quiet', False),
+                       ('option', 'builddir', 'newbuild')],
+                      package=['dep'])
+    assert chip.get('option', 'quiet', step='syn', index=0) is True
+    assert chip.get('option', 'builddir') == 'build'
+
+
+def test_set_many_loglevel():
+    chip = siliconcompiler.Chip('test')
+    chip.set_many([('option', 'loglevel', 'DEBUG')])
+    assert chip.logger.level == logging.DEBUG
+
+
 def test_empty_file_path():
     '''
     Set global value without clobber and then copy, this should not crash
@@ -0,0 +1,83 @@
+import os
+import stat
+
+import siliconcompiler
+
+import tests.core.tools.run.parse as parse
+import tests.core.tools.run.run as run
+
+
+def _run(counter, value, task=run):
+    chip = siliconcompiler.Chip('test')
+    chip.set('option', 'mode', 'asic')
+    chip.set('option', 'cache', os.path.abspath('cache'))
+    chip.set('option', 'taskcache', True)
+    chip.set('option', 'quiet', True)
+
+    flow = 'test'
+    chip.node(flow, 'run', task)
+    chip.set('option', 'flow', flow)
+
+    with open('tool.sh', 'w') as f:
+        f.write(f'echo run >> {counter}\n')
+        f.write('echo "$1" > outputs/test.txt\n')
+        f.write('echo "$1" > lines.txt\n')
+        f.write('echo "$1" >> lines.txt\n')
+    task_name = task.__name__.split('.')[-1]
+    chip.set('tool', 'run', 'task', task_name, 'option', [os.path.abspath('tool.sh'), value])
+    chip.run()
+
+    with open(os.path.join(chip._getworkdir(step='run', index='0'), 'outputs', 'test.txt')) as f:
+        assert f.read() == f'{value}\n'
+    return chip
+
+
+def test_task_cache():
+    counter = os.path.abspath('counter.txt')
+
+    def runs():
+        with open(counter) as f:
+            return len(f.readlines())
+
+    _run(counter, 'a')
+    assert runs() == 1
+
+    # Unchanged node is restored from the cache
+    chip = _run(counter, 'a')
+    assert runs() == 1
+    assert os.path.isfile(os.path.join(chip._getworkdir(step='run', index='0'), 'run.log'))
+    assert chip.get('flowgraph', 'test', 'run', '0', 'status') == siliconcompiler.NodeStatus.SUCCESS
+
+    # Changed tool options run the tool again
+    _run(counter, 'b')
+    assert runs() == 2
+    _run(counter, 'a')
+    assert runs() == 2
+
+
+def test_task_cache_post_process():
+    counter = os.path.abspath('counter.txt')
+
+    _run(counter, 'a', task=parse)
+
+    # The results restored are already post-processed, so the post-processing
+    # does not run again
+    chip = _run(counter, 'a', task=parse)
+    with open(counter) as f:
+        assert len(f.readlines()) == 1
+
+    workdir = chip._getworkdir(step='run', index='0')
+    assert chip.get('metric', 'cells', step='run', index='0') == 2
+    assert chip.get('tool', 'run', 'task', 'parse', 'report', 'cells',
+                    step='run', index='0') == ['lines.txt']
+    # The report is restored along with the metric
+    with open(os.path.join(workdir, 'lines.txt')) as f:
+        assert f.read() == 'a\na\n'
+    assert chip.get('record', 'toolpath', step='run', index='0')
+    assert chip.get('record', 'toolargs', step='run', index='0')
+    assert chip.get('metric', 'exetime', step='run', index='0') is not None
+
+    # Restored files are copies which can be modified
+    output = os.path.join(workdir, 'outputs', 'test.txt')
+    assert os.stat(output).st_nlink == 1
+    assert os.stat(output).st_mode & stat.S_IWUSR
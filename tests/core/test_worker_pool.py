@@ -0,0 +1,94 @@
+import os
+import sys
+import time
+
+import siliconcompiler
+from siliconcompiler.worker_pool import WorkerPool
+
+
+class _Chip(siliconcompiler.Chip):
+    def record(self, path):
+        with open(path, 'a') as f:
+            f.write(f'{os.getpid()} {self.get("option", "jobname")}\n')
+
+    def fail(self):
+        sys.exit(2)
+
+    def hang(self):
+        time.sleep(600)
+
+
+def _run(pool, target, *args):
+    task = pool.Process(target=target, args=args)
+    task.start()
+    task.join()
+    return task.exitcode
+
+
+def test_worker_pool(tmp_path):
+    chip = _Chip('test')
+    chip.set('option', 'jobname', 'pooljob')
+
+    pool = WorkerPool(1)
+    try:
+        pool.write_manifest(chip)
+        path = str(tmp_path / 'record.txt')
+        assert _run(pool, chip.record, path) == 0
+        assert _run(pool, chip.fail) == 2
+        assert _run(pool, chip.record, path) == 0
+    finally:
+        pool.shutdown()
+
+    # Both nodes ran in the same worker, with the schema of the chip
+    with open(path) as f:
+        records = f.read().splitlines()
+    assert len(records) == 2
+    assert records[0] == records[1]
+    assert records[0].endswith(' pooljob')
+    assert records[0].split()[0] != str(os.getpid())
+
+
+def test_worker_pool_shutdown_busy():
+    chip = _Chip('test')
+
+    pool = WorkerPool(1)
+    pool.write_manifest(chip)
+    task = pool.Process(target=chip.hang)
+    task.start()
+    process = task.sentinel
+
+    # Interrupted run, the worker running the node is stopped too
+    start = time.time()
+    pool.shutdown()
+    assert time.time() - start < 60
+    assert process.closed
+    assert not os.path.exists(os.path.dirname(pool._get_manifest()))
+
+
+def test_worker_pool_manifests(tmp_path):
+    chip = _Chip('test')
+
+    pool = WorkerPool(1)
+    try:
+        pool.write_manifest(chip)
+        tmpdir = os.path.dirname(pool._get_manifest())
+
+        # Several changes in a row only write the manifest once
+        chip.set('option', 'jobname', 'job1')
+        pool.schema_changed(chip)
+        chip.set('option', 'jobname', 'job2')
+        pool.schema_changed(chip)
+        task = pool.Process(target=chip.record, args=(str(tmp_path / 'record.txt'),))
+        task.start()
+        assert len(os.listdir(tmpdir)) == 1
+
+        # The manifest of the running node is kept until it completes
+        pool.write_manifest(chip)
+        assert len(os.listdir(tmpdir)) == 2
+        task.join()
+        assert os.listdir(tmpdir) == [os.path.basename(pool._get_manifest())]
+    finally:
+        pool.shutdown()
+
+    with open(tmp_path / 'record.txt') as f:
+        assert f.read().split()[1] == 'job2'
@@ -1,5 +1,6 @@
 # Copyright 2020 Silicon Compiler Authors. All Rights Reserved.
 import csv
+import json
 import os
 
 import pytest
@@ -16,8 +17,8 @@ def test_write_manifest():
     chip.input('b.v')
     chip.input('c.v')
 
-    for ext in ('pkg.json', 'tcl', 'csv', 'yaml',
-                'pkg.json.gz', 'tcl.gz', 'csv.gz', 'yaml.gz'):
+    for ext in ('pkg.json', 'tcl', 'csv', 'yaml', 'pkg.msgpack',
+                'pkg.json.gz', 'tcl.gz', 'csv.gz', 'yaml.gz', 'pkg.msgpack.gz'):
         manifest_path = f'top.{ext}'
         chip.write_manifest(manifest_path)
         assert os.path.exists(manifest_path)
@@ -40,6 +41,47 @@ def test_write_manifest_prune():
     assert 'example' not in schema.cfg['schemaversion']
 
 
+def test_write_manifest_prune_matches_copy():
+    chip = siliconcompiler.Chip('top')
+    chip.input('top.v')
+    chip.set('tool', 'yosys', 'task', 'syn_asic', 'var', 'test', 'a', step='syn', index='0')
+    chip.schema.record_history()
+
+    chip.write_manifest('top.json', prune=True)
+
+    schema = chip.schema.copy()
+    schema.prune()
+    with open('top.json') as f:
+        assert f.read() == json.dumps(schema.cfg, indent=4)
+
+    # Writing the manifest must not modify the chip
+    assert 'default' in chip.getdict('tool')
+    assert 'help' in chip.getdict('tool', 'yosys', 'task', 'syn_asic', 'var', 'test')
+
+
+@pytest.mark.parametrize('prune', [True, False])
+def test_write_manifest_msgpack(prune):
+    '''Make sure msgpack manifests round trip to the same schema as json'''
+    chip = siliconcompiler.Chip('top')
+    chip.load_target('freepdk45_demo')
+    chip.input('top.v')
+    chip.set('constraint', 'outline', [(0, 0), (10, 10)])
+
+    chip.write_manifest('top.pkg.json', prune=prune)
+    chip.write_manifest('top.pkg.msgpack', prune=prune)
+    chip.write_manifest('top.pkg.msgpack.gz', prune=prune)
+
+    json_schema = siliconcompiler.Schema(manifest='top.pkg.json')
+    msgpack_schema = siliconcompiler.Schema(manifest='top.pkg.msgpack')
+    assert msgpack_schema.cfg == json_schema.cfg
+    assert msgpack_schema.get('constraint', 'outline') == [(0, 0), (10, 10)]
+    assert siliconcompiler.Schema(manifest='top.pkg.msgpack.gz').cfg == json_schema.cfg
+
+    chip2 = siliconcompiler.Chip('top')
+    chip2.read_manifest('top.pkg.msgpack')
+    assert chip2.get('input', 'rtl', 'verilog', step='import', index=0) == ['top.v']
+
+
 def test_advanced_tcl(monkeypatch):
     # Tkinter module is part of Python standard library, but may not be
     # available depending on if the system has the python3-tk package installed.
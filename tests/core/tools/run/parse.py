@@ -0,0 +1,18 @@
+from tests.core.tools.run import run as run_tool
+
+
+def setup(chip):
+    run_tool.setup(chip)
+
+
+def post_process(chip):
+    '''
+    Records the number of lines the tool wrote to a file of its working
+    directory, which is not one of its outputs.
+    '''
+    step = chip.get('arg', 'step')
+    index = chip.get('arg', 'index')
+
+    with open('lines.txt') as f:
+        lines = len(f.readlines())
+    chip._record_metric(step, index, 'cells', lines, 'lines.txt')
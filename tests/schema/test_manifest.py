@@ -1,3 +1,4 @@
+import json
 import pathlib
 import pytest
 
@@ -42,3 +43,94 @@ def test_read_manifest_with_disallow_missing_keys():
     schema2 = Schema()
     with pytest.raises(ValueError):
         schema2.read_manifest('tmp.json', allow_missing_keys=False)
+
+
+def test_manifest_trusted():
+    schema = Schema()
+
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema.set('constraint', 'outline', [(0, 0), (10, 10)])
+    with open('tmp.json', 'w') as f:
+        schema.write_json(f)
+
+    schema2 = Schema(manifest='tmp.json', trusted=True)
+    assert schema2.get('input', 'rtl', 'verilog') == ['foo.v']
+    assert schema2.get('constraint', 'outline') == [(0, 0), (10, 10)]
+    assert schema2.cfg == Schema(manifest='tmp.json').cfg
+
+
+def test_manifest_trusted_version_mismatch():
+    schema = Schema()
+
+    schema.set('option', 'jobname', 'test')
+    cfg = schema.getdict()
+    cfg['schemaversion']['node']['default']['default']['value'] = '0.0.0'
+    cfg['option']['jobname']['node']['global']['global']['value'] = 1
+    with open('tmp.json', 'w') as f:
+        json.dump(cfg, f)
+
+    with pytest.raises(ValueError):
+        Schema(manifest='tmp.json', trusted=True)
+
+
+def test_manifest_include():
+    schema = Schema()
+
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema.set('option', 'jobname', 'test')
+    with open('tmp.json', 'w') as f:
+        schema.write_json(f)
+
+    schema2 = Schema(manifest='tmp.json', include=[('input', 'rtl', 'verilog'), ('missing',)])
+    assert schema2.getkeys() == ['input']
+    assert schema2.getkeys('input') == ['rtl']
+    assert schema2.get('input', 'rtl', 'verilog') == ['foo.v']
+    with pytest.raises(ValueError):
+        schema2.get('option', 'jobname')
+
+
+def test_manifest_changes():
+    schema = Schema()
+    assert schema._changes() is None
+
+    schema.set('option', 'jobname', 'test')
+    schema._track_changes()
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema.add('option', 'define', 'A')
+    schema.set('metric', 'errors', 0, step='syn', index='0')
+    schema.set('option', 'jobname', 'test2', clobber=False)
+
+    changes = schema._changes()
+    assert changes.getkeys() == ['input', 'metric', 'option']
+    assert changes.getkeys('option') == ['define']
+    assert changes.get('input', 'rtl', 'verilog') == ['foo.v']
+    assert changes.get('option', 'define') == ['A']
+    assert changes.get('metric', 'errors', step='syn', index='0') == 0
+
+    with open('tmp.json', 'w') as f:
+        changes.write_json(f)
+    with open('tmp.json') as f:
+        assert set(json.load(f).keys()) == {'input', 'metric', 'option'}
+
+
+def test_manifest_pickle():
+    schema = Schema()
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema.set('metric', 'errors', 0, step='syn', index='0')
+    schema.record_history()
+
+    with open('tmp.pkl', 'wb') as f:
+        schema._write_pickle(f)
+    with open('tmp.pkl', 'rb') as f:
+        schema2 = Schema._read_pickle(f)
+
+    assert schema2.cfg == schema.cfg
+    assert schema2.get('input', 'rtl', 'verilog') == ['foo.v']
+    assert schema2.get('metric', 'errors', step='syn', index='0') == 0
+    assert schema2.history('job0').get('input', 'rtl', 'verilog') == ['foo.v']
+
+    # Parameters that were not set are shared with the default configuration
+    assert schema2.cfg['option']['scheduler']['name'] is schema2._default_cfg()['option'][
+        'scheduler']['name']
+    schema2.set('option', 'scheduler', 'name', 'slurm')
+    assert Schema().get('option', 'scheduler', 'name') is None
@@ -0,0 +1,65 @@
+from siliconcompiler.schema import Schema
+
+
+def test_merge():
+    src0 = Schema()
+    src0.set('metric', 'errors', 1, step='syn', index='0')
+    src0.set('input', 'rtl', 'verilog', 'foo.v')
+    src0.set('option', 'jobname', 'job1')
+
+    src1 = Schema()
+    src1.set('metric', 'errors', 2, step='syn', index='1')
+    src1.set('metric', 'errors', 3, step='syn', index='0')
+    src1.set('input', 'rtl', 'verilog', 'bar.v')
+    src1.set('input', 'rtl', 'verilog', 'abc123', field='filehash')
+
+    schema = Schema()
+    schema.set('option', 'jobname', 'job0')
+    schema._merge([src0, src1], clobber=False)
+
+    # First source wins when clobber is False
+    assert schema.get('metric', 'errors', step='syn', index='0') == 1
+    assert schema.get('metric', 'errors', step='syn', index='1') == 2
+    assert schema.get('input', 'rtl', 'verilog') == ['foo.v']
+    assert schema.get('input', 'rtl', 'verilog', field='filehash') == ['abc123']
+    assert schema.get('option', 'jobname') == 'job0'
+
+    schema._merge([src0, src1])
+    assert schema.get('metric', 'errors', step='syn', index='0') == 3
+    assert schema.get('input', 'rtl', 'verilog') == ['bar.v']
+    assert schema.get('option', 'jobname') == 'job1'
+
+    # Values are not shared with the sources
+    schema.add('input', 'rtl', 'verilog', 'baz.v')
+    assert src1.get('input', 'rtl', 'verilog') == ['bar.v']
+
+
+def test_merge_append():
+    src = Schema()
+    src.set('input', 'rtl', 'verilog', 'bar.v')
+
+    schema = Schema()
+    schema.set('input', 'rtl', 'verilog', 'foo.v')
+    schema._merge([src, src], clear=False)
+    assert schema.get('input', 'rtl', 'verilog') == ['foo.v', 'bar.v', 'bar.v']
+
+
+def test_merge_lock():
+    src = Schema()
+    src.set('option', 'jobname', 'job1')
+
+    schema = Schema()
+    schema.set('option', 'jobname', True, field='lock')
+    schema._merge([src])
+    assert schema.get('option', 'jobname') == 'job0'
+
+
+def test_merge_filter():
+    src = Schema()
+    src.set('option', 'jobname', 'job1')
+    src.set('metric', 'errors', 1, step='syn', index='0')
+
+    schema = Schema()
+    schema._merge([src], key_filter=lambda keypath: keypath[0] == 'metric')
+    assert schema.get('option', 'jobname') == 'job0'
+    assert schema.get('metric', 'errors', step='syn', index='0') == 1
@@ -1,9 +1,10 @@
 import pathlib
+import pickle
 
 import pytest
 
 from siliconcompiler.schema import Schema
-from siliconcompiler.schema.schema_cfg import scparam
+from siliconcompiler.schema.schema_cfg import scparam, schema_cfg
 from siliconcompiler import Chip
 
 
@@ -134,3 +135,89 @@ def test_merge_with_init_with_lib():
     chip.schema._merge_with_init_schema()
 
     assert 'sky130hd' in chip.getkeys('library')
+
+
+def test_default_cfg_not_shared():
+    schema = Schema()
+    schema.set('tool', 'yosys', 'exe', 'yosys')
+    schema.set('option', 'jobname', 'test')
+    schema.add('option', 'define', 'TEST')
+    schema.unset('option', 'jobname')
+    schema.unset('tool', 'openroad', 'task', 'place', 'report', 'cellarea',
+                 step='place', index='0')
+    schema.prune()
+
+    new_schema = Schema()
+    assert new_schema.getkeys('tool') == []
+    assert new_schema.get('option', 'jobname') == 'job0'
+    assert new_schema.get('option', 'define') == []
+    assert new_schema.get('option', 'jobname', field='help')
+    assert new_schema.cfg == schema_cfg()
+
+
+def test_default_cfg_history():
+    schema = Schema()
+    schema.history('job1').set('option', 'define', 'TEST')
+
+    assert schema.get('option', 'define', job='job1') == ['TEST']
+    assert schema.get('option', 'define') == []
+    assert Schema().history('job1').get('option', 'define') == []
+
+
+def test_copy():
+    schema = Schema()
+    schema.set('option', 'define', 'TEST')
+
+    schema_copy = schema.copy()
+    assert schema_copy.cfg == schema.cfg
+
+    schema_copy.add('option', 'define', 'TEST2')
+    schema_copy.set('tool', 'yosys', 'exe', 'yosys')
+    assert schema.get('option', 'define') == ['TEST']
+    assert schema.getkeys('tool') == []
+
+
+def test_keypath_index():
+    schema = Schema()
+    assert schema.get('tool', 'yosys', 'exe') is None
+
+    schema.set('tool', 'yosys', 'exe', 'yosys')
+    assert schema.get('tool', 'yosys', 'exe') == 'yosys'
+    assert schema.get('tool', 'openroad', 'exe') is None
+
+    schema.unset('tool', 'yosys', 'exe')
+    assert schema.get('tool', 'yosys', 'exe') is None
+
+    schema.set('tool', 'yosys', 'exe', 'yosys')
+    schema._remove('tool', 'yosys')
+    assert schema.getkeys('tool') == []
+    assert schema.get('tool', 'yosys', 'exe') is None
+
+    schema.set('tool', 'yosys', 'exe', 'yosys')
+    schema.cfg = Schema().cfg
+    assert schema.get('tool', 'yosys', 'exe') is None
+
+    schema.set('tool', 'yosys', 'exe', 'yosys')
+    schema = pickle.loads(pickle.dumps(schema))
+    schema.set('tool', 'yosys', 'version', '0.1')
+    assert schema.get('tool', 'yosys', 'exe') == 'yosys'
+    assert schema.get('tool', 'yosys', 'version') == ['0.1']
+
+
+def test_shared_fields():
+    schema = Schema()
+    schema.set('option', 'define', 'TEST')
+    schema.add('option', 'define', 'TEST', field='example')
+
+    schema_copy = schema.copy()
+    schema_copy.add('option', 'define', 'TEST2', field='example')
+    assert schema.get('option', 'define', field='example')[-1] == 'TEST'
+    assert schema_copy.get('option', 'define', field='example')[-1] == 'TEST2'
+    assert Schema().get('option', 'define', field='example') == \
+        schema.get('option', 'define', field='example')[:-1]
+
+    # Fields read from a manifest are shared with the default schema
+    new_schema = Schema(cfg=schema.cfg)
+    assert new_schema.cfg == schema.cfg
+    assert new_schema.cfg['option']['define']['help'] is \
+        Schema().cfg['option']['define']['help']